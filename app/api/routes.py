@@ -1,13 +1,49 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
-from fastapi.responses import RedirectResponse
+import asyncio
+from typing import Literal
 
-from app.models.schemas import ReviewRequest, ReviewResponse
-from app.services.reviewer import review_prd
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, RedirectResponse
+from pydantic import BaseModel
+
+from app.api.static_responses import StaticJSON
+from app.api.streaming import (
+    batch_events,
+    hedged_events,
+    negotiate_format,
+    review_events,
+    stream_response,
+)
+from app.core.settings import settings
+from app.models.schemas import (
+    BatchReviewRequest,
+    BatchReviewResponse,
+    HedgedReview,
+    ProfiledReview,
+    ReviewJob,
+    ReviewJobList,
+    ReviewRequest,
+    ReviewResponse,
+)
+from app.services.batch import plan_batch, review_batch
+from app.services.hedged import HedgedEntry, hedged_store, start_hedged_review, wait_for_result
+from app.services.jobs import ensure_workers, get_job_store, job_stats
+from app.services.metrics import registry, stage
+from app.services.profiling import profile_review
+from app.services.reviewer import _should_use_mock, review_cache, review_flights, review_prd_async
+from app.services.scheduler import llm_scheduler
+from app.services.warmup import warmup_state
 
 router = APIRouter()
 
+# Hot metadata endpoints are encoded once at import time and served as bytes.
+HEALTH = StaticJSON({"status": "ok"}, cache_control="no-cache")
+SCHEMA = StaticJSON(
+    ReviewResponse.model_json_schema(),
+    cache_control=f"public, max-age={settings.schema_cache_max_age_seconds}",
+)
+
 
 @router.get("/", include_in_schema=False)
 def root():
@@ -15,15 +51,166 @@ def root():
 
 
 @router.get("/health")
-def health() -> dict[str, str]:
-    return {"status": "ok"}
+async def health(request: Request) -> Response:
+    return HEALTH.response(request)
+
+
+@router.get("/ready")
+async def ready() -> JSONResponse:
+    # Liveness stays on /health; point load balancers and rollouts here.
+    if warmup_state.ready:
+        return JSONResponse(warmup_state.snapshot())
+    return JSONResponse(warmup_state.snapshot(), status_code=503, headers={"Retry-After": "1"})
+
+
+def _json_response(model: BaseModel) -> Response:
+    # Reviews are validated once in the service layer; returning bytes directly
+    # skips FastAPI's response_model re-validation and jsonable_encoder pass.
+    # response_model stays on the routes for the OpenAPI schema only.
+    with stage("serialize"):
+        content = model.model_dump_json()
+    return Response(content=content, media_type="application/json")
+
+
+async def _profiled(request: ReviewRequest, fmt: str) -> Response:
+    if not settings.debug:
+        raise HTTPException(status_code=403, detail="Profiling requires DEBUG=true")
+    review, report, collapsed = await asyncio.to_thread(profile_review, request)
+    if fmt == "collapsed":
+        return Response(content=collapsed, media_type="text/plain; charset=utf-8")
+    return _json_response(ProfiledReview(review=review, profile=report))
 
 
 @router.post("/review", response_model=ReviewResponse)
-def review(request: ReviewRequest) -> ReviewResponse:
-    return review_prd(request)
+async def review(
+    request: ReviewRequest,
+    profile: Literal["summary", "collapsed"] | None = Query(
+        default=None, description="DEBUG only: profile this review (JSON summary or collapsed stacks)"
+    ),
+) -> Response:
+    if profile is not None:
+        return await _profiled(request, profile)
+    slo = settings.review_response_slo_seconds
+    if slo > 0 and not _should_use_mock(request):
+        # Hard latency bound: past the SLO the mock review is returned and the
+        # LLM result can still be fetched via the hedged review ID.
+        state = await wait_for_result(await start_hedged_review(request), slo)
+        response = _json_response(state.review)
+        response.headers["X-Review-Id"] = state.id
+        return response
+    return _json_response(await review_prd_async(request))
+
+
+@router.post("/review/hedged", response_model=HedgedReview)
+async def review_hedged(request: ReviewRequest) -> Response:
+    return _json_response((await start_hedged_review(request)).state)
+
+
+def _hedged_entry(review_id: str) -> HedgedEntry:
+    entry = hedged_store.get(review_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired review id")
+    return entry
+
+
+@router.get("/review/hedged/{review_id}", response_model=HedgedReview)
+async def get_hedged(review_id: str) -> Response:
+    return _json_response(_hedged_entry(review_id).state)
+
+
+@router.get("/review/hedged/{review_id}/stream")
+async def stream_hedged(review_id: str, http_request: Request):
+    entry = _hedged_entry(review_id)
+    fmt = negotiate_format(http_request)
+    return stream_response(hedged_events(entry, fmt), fmt)
+
+
+@router.post("/review/stream")
+async def review_stream(request: ReviewRequest, http_request: Request):
+    fmt = negotiate_format(http_request)
+    return stream_response(review_events(request, fmt), fmt)
+
+
+def _check_batch_size(batch: BatchReviewRequest) -> None:
+    if len(batch.items) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(batch.items)} items exceeds the limit of {settings.batch_max_items}",
+        )
+
+
+@router.post("/review/batch", response_model=BatchReviewResponse)
+async def review_many(batch: BatchReviewRequest) -> Response:
+    _check_batch_size(batch)
+    return _json_response(await review_batch(batch.items))
+
+
+@router.post("/review/batch/stream")
+async def review_many_stream(batch: BatchReviewRequest, http_request: Request):
+    _check_batch_size(batch)
+    fmt = negotiate_format(http_request)
+    return stream_response(batch_events(plan_batch(batch.items), len(batch.items), fmt), fmt)
+
+
+# ── Review jobs ──────────────────────────────────────────────────────────────
+
+
+@router.post("/reviews", response_model=ReviewJob, status_code=202)
+async def enqueue_review(
+    request: ReviewRequest, idempotency_key: str | None = Header(default=None, max_length=200)
+) -> Response:
+    store = get_job_store()
+    job, created = await asyncio.to_thread(store.enqueue, request, idempotency_key)
+    workers = ensure_workers()
+    if workers is not None:
+        workers.notify()
+    response = _json_response(job)
+    response.status_code = 202 if created else 200
+    response.headers["Location"] = f"/reviews/{job.id}"
+    return response
+
+
+@router.get("/reviews/{job_id}", response_model=ReviewJob)
+async def get_review_job(job_id: str) -> Response:
+    job = await asyncio.to_thread(get_job_store().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown review job")
+    return _json_response(job)
+
+
+@router.get("/reviews", response_model=ReviewJobList)
+async def list_review_jobs(
+    status: Literal["queued", "batched", "running", "succeeded", "failed"] | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    before: str | None = Query(default=None, description="The previous page's next_before cursor"),
+) -> Response:
+    cursor = None
+    if before is not None:
+        created_at, _, job_id = before.partition(":")
+        try:
+            cursor = (float(created_at), job_id)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Malformed page cursor") from None
+    jobs = await asyncio.to_thread(get_job_store().list_jobs, status, limit, cursor)
+    next_before = f"{jobs[-1].created_at!r}:{jobs[-1].id}" if len(jobs) == limit else None
+    return _json_response(ReviewJobList(jobs=jobs, next_before=next_before))
+
+
+@router.get("/stats")
+async def stats() -> dict:
+    return {
+        "llm_scheduler": llm_scheduler.stats(),
+        "review_cache": review_cache.stats(),
+        "review_flights": review_flights.stats(),
+        "review_jobs": job_stats(),
+    }
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @router.get("/schema")
-def schema() -> dict:
-    return ReviewResponse.model_json_schema()
+async def schema(request: Request) -> Response:
+    return SCHEMA.response(request)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 §13.1.2): ignore any W/ prefix on either side.
+    if header.strip() == "*":
+        return True
+    strong = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == strong for candidate in header.split(","))
+
+
+class StaticJSON:
+    """A JSON payload encoded once, served with a strong ETag and 304 revalidation."""
+
+    def __init__(self, payload: Any, cache_control: str) -> None:
+        self.body = json.dumps(payload, separators=(",", ":")).encode()
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def response(self, request: Request) -> Response:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
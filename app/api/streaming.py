@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.settings import settings
+from app.models.schemas import BatchReviewItem, ReviewRequest
+from app.services.batch import BatchPlan, _error_message, iter_batch_reviews
+from app.services.hedged import HedgedEntry
+from app.services.reviewer import review_prd_events
+
+StreamFormat = Literal["ndjson", "sse"]
+
+_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def negotiate_format(request: Request) -> StreamFormat:
+    return "sse" if "text/event-stream" in request.headers.get("accept", "") else "ndjson"
+
+
+def encode_event(event: str, data_json: str, fmt: StreamFormat) -> str:
+    """Frame one event; ``data_json`` is an already-serialized JSON value."""
+    if fmt == "sse":
+        return f"event: {event}\ndata: {data_json}\n\n"
+    return f'{{"event":"{event}","data":{data_json}}}\n'
+
+
+def encode_json_event(event: str, data: dict[str, Any], fmt: StreamFormat) -> str:
+    return encode_event(event, json.dumps(data, separators=(",", ":")), fmt)
+
+
+async def with_heartbeats(
+    events: AsyncIterator[str], fmt: StreamFormat, interval: float | None = None
+) -> AsyncIterator[str]:
+    """Interleave heartbeat events whenever ``events`` is silent for ``interval`` seconds."""
+    interval = settings.stream_heartbeat_seconds if interval is None else interval
+    iterator = events.__aiter__()
+    pending: asyncio.Future[str] | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield encode_event("heartbeat", "{}", fmt)
+                continue
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                return
+            pending = None
+            yield chunk
+    finally:
+        if pending is not None:
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration, Exception):
+                await pending
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+# ── Review event sources ─────────────────────────────────────────────────────
+
+
+async def review_events(request: ReviewRequest, fmt: StreamFormat) -> AsyncIterator[str]:
+    yield encode_json_event("progress", {"completed": 0, "total": 1}, fmt)
+    try:
+        async for kind, value in review_prd_events(request):
+            if kind == "rubric":
+                yield encode_json_event("rubric", value, fmt)
+            else:
+                item = BatchReviewItem(index=0, status="ok", review=value)
+    except Exception as exc:
+        item = BatchReviewItem(index=0, status="error", error=_error_message(exc))
+    yield encode_event("result", item.model_dump_json(), fmt)
+    yield encode_json_event("done", {"completed": 1, "total": 1}, fmt)
+
+
+async def batch_events(plan: BatchPlan, total: int, fmt: StreamFormat) -> AsyncIterator[str]:
+    completed = 0
+    yield encode_json_event(
+        "progress", {"completed": 0, "total": total, "unique_items": plan.unique_items}, fmt
+    )
+    async for items in iter_batch_reviews(plan):
+        for item in items:
+            yield encode_event("result", item.model_dump_json(), fmt)
+        completed += len(items)
+        yield encode_json_event("progress", {"completed": completed, "total": total}, fmt)
+    yield encode_json_event("done", {"completed": completed, "total": total}, fmt)
+
+
+async def hedged_events(entry: HedgedEntry, fmt: StreamFormat) -> AsyncIterator[str]:
+    """The current state at once, then the settled state when the upgrade finishes."""
+    yield encode_event("review", entry.state.model_dump_json(), fmt)
+    if not entry.done.is_set():
+        await entry.done.wait()
+        yield encode_event("review", entry.state.model_dump_json(), fmt)
+    yield encode_json_event("done", {"status": entry.state.status}, fmt)
+
+
+def stream_response(events: AsyncIterator[str], fmt: StreamFormat) -> StreamingResponse:
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(
+        with_heartbeats(events, fmt), media_type=_MEDIA_TYPES[fmt], headers=headers
+    )
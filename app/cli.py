@@ -0,0 +1,277 @@
+"""Command-line entry point.
+
+    python -m app.cli score docs/                  # every *.md under docs/
+    python -m app.cli score "prds/**/*.md" -o out.jsonl
+    cat requests.jsonl | python -m app.cli score - --workers 32
+    python -m app.cli worker --concurrency 8       # drain the POST /reviews job queue
+    python -m app.cli batch docs/                  # review via the provider's offline Batch API
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, TextIO
+
+# (source id, file path or None, raw JSONL line or None)
+Item = tuple[str, str | None, str | None]
+
+
+# ── Input ────────────────────────────────────────────────────────────────────
+
+
+def _iter_stdin(stream: TextIO) -> Iterator[Item]:
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if line:
+            # Parsed in the worker, so malformed lines become per-item errors.
+            yield f"stdin:{line_no}", None, line
+
+
+def iter_inputs(sources: list[str], pattern: str, stdin: TextIO) -> Iterator[Item]:
+    for source in sources:
+        if source == "-":
+            yield from _iter_stdin(stdin)
+            continue
+        path = Path(source)
+        if path.is_dir():
+            for match in sorted(path.rglob(pattern)):
+                if match.is_file():
+                    yield str(match), str(match), None
+        elif path.is_file():
+            yield str(path), str(path), None
+        else:
+            for match in sorted(glob.iglob(source, recursive=True)):
+                if Path(match).is_file():
+                    yield match, match, None
+
+
+def _chunks(items: Iterator[Item], size: int) -> Iterator[list[Item]]:
+    chunk: list[Item] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ── Worker side ──────────────────────────────────────────────────────────────
+
+
+_worker_mode = "mock"
+
+
+def _init_worker(mode: str) -> None:
+    global _worker_mode
+    from app.core.settings import settings
+
+    # Each document is seen once, so a per-process cache only costs memory.
+    settings.review_cache_enabled = False
+    _worker_mode = mode
+
+
+def _score_chunk(chunk: list[Item]) -> list[tuple[bool, str]]:
+    """Review a chunk and return ``(ok, jsonl_line)`` pairs, serialized in the worker."""
+    from app.models.schemas import ReviewRequest
+    from app.services.reviewer import review_prd
+
+    lines: list[tuple[bool, str]] = []
+    for source_id, path, raw in chunk:
+        try:
+            if path is not None:
+                payload: dict[str, Any] = {"prd_markdown": Path(path).read_text(encoding="utf-8")}
+            else:
+                payload = json.loads(raw or "")
+                source_id = str(payload.pop("id", source_id))
+            request = ReviewRequest.model_validate({"mode": _worker_mode, **payload})
+            review = review_prd(request)
+            lines.append((True, f'{{"id":{json.dumps(source_id)},"review":{review.model_dump_json()}}}'))
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            lines.append((False, json.dumps({"id": source_id, "error": error}, separators=(",", ":"))))
+    return lines
+
+
+# ── score command ────────────────────────────────────────────────────────────
+
+
+def score(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> int:
+    workers = args.workers or os.cpu_count() or 1
+    window = max(1, args.window or workers * 4)
+    chunks = _chunks(iter_inputs(args.sources, args.pattern, stdin), args.chunk_size)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else stdout
+    scored = errors = 0
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(args.mode,)
+        ) as pool:
+            # At most `window` chunks are in flight, so memory stays bounded
+            # no matter how large the input stream is; output keeps input order.
+            pending: deque[Future[list[tuple[bool, str]]]] = deque()
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < window:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                    else:
+                        pending.append(pool.submit(_score_chunk, chunk))
+                if not pending:
+                    break
+                for ok, line in pending.popleft().result():
+                    out.write(line + "\n")
+                    scored += 1
+                    errors += not ok
+                out.flush()
+    finally:
+        if out is not stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"scored {scored} documents ({errors} errors) in {elapsed:.2f}s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+# ── worker command ───────────────────────────────────────────────────────────
+
+
+async def _run_workers(concurrency: int, once: bool) -> int:
+    from app.services.jobs import JobWorkers, close_job_store, get_job_store
+
+    workers = JobWorkers(get_job_store(), concurrency)
+    try:
+        if once:
+            return await workers.drain()
+        workers.start()
+        await asyncio.Event().wait()  # until interrupted
+        return workers.processed
+    finally:
+        await workers.stop()
+        close_job_store()
+
+
+def worker(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> int:
+    from app.core.settings import settings
+
+    if args.db:
+        settings.jobs_db_path = args.db
+    started = time.perf_counter()
+    try:
+        processed = asyncio.run(_run_workers(args.concurrency, args.once))
+    except KeyboardInterrupt:
+        return 0
+    elapsed = time.perf_counter() - started
+    print(f"processed {processed} jobs in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+# ── batch command ────────────────────────────────────────────────────────────
+
+
+def _load_request(path: str | None, raw: str | None) -> Any:
+    from app.models.schemas import ReviewRequest
+
+    if path is not None:
+        return ReviewRequest(prd_markdown=Path(path).read_text(encoding="utf-8"), mode="auto")
+    payload = json.loads(raw or "")
+    payload.pop("id", None)
+    return ReviewRequest.model_validate({"mode": "auto", **payload})
+
+
+def batch(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> int:
+    from app.core.settings import settings
+    from app.services import offline_batch
+    from app.services.jobs import close_job_store, get_job_store
+
+    if args.db:
+        settings.jobs_db_path = args.db
+    if not settings.openai_api_key:
+        print("batch: OPENAI_API_KEY is not set", file=sys.stderr)
+        return 2
+    store = get_job_store()
+    held = errors = 0
+    try:
+        for source_id, path, raw in iter_inputs(args.sources, args.pattern, stdin):
+            try:
+                (job, created), = offline_batch.enqueue(store, [_load_request(path, raw)])
+            except Exception as exc:
+                errors += 1
+                print(f"{source_id}: {type(exc).__name__}: {exc}", file=sys.stderr)
+            else:
+                held += created
+                print(json.dumps({"id": source_id, "job_id": job.id}), file=stdout)
+        if args.no_wait:
+            submitted = offline_batch.submit_all(store, args.limit)
+            print(f"held {held} new jobs; submitted {len(submitted)} batches", file=sys.stderr)
+        else:
+            collected = offline_batch.run(store, args.interval, args.timeout, args.limit)
+            succeeded = sum(outcome.succeeded for outcome in collected)
+            print(
+                f"held {held} new jobs; collected {len(collected)} batches, {succeeded} reviews; "
+                f"{len(offline_batch.open_batches(store))} batches still open",
+                file=sys.stderr,
+            )
+        print(json.dumps(store.counts()), file=sys.stderr)
+    finally:
+        close_job_store()
+    return 1 if errors else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="PRD decision engine tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score_parser = commands.add_parser("score", help="Review PRDs in parallel and write JSONL results")
+    score_parser.add_argument(
+        "sources", nargs="+", help="Files, directories, glob patterns, or '-' for JSONL on stdin"
+    )
+    score_parser.add_argument("--pattern", default="*.md", help="File pattern used inside directories")
+    score_parser.add_argument("--mode", choices=["mock", "auto"], default="mock")
+    score_parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: all cores)")
+    score_parser.add_argument("--chunk-size", type=int, default=16, help="Documents per worker task")
+    score_parser.add_argument("--window", type=int, default=0, help="Max chunks in flight (default: 4x workers)")
+    score_parser.add_argument("-o", "--output", help="Write JSONL here instead of stdout")
+    score_parser.set_defaults(handler=score)
+
+    worker_parser = commands.add_parser("worker", help="Run review job workers against the job store")
+    worker_parser.add_argument("--concurrency", type=int, default=4, help="Jobs reviewed concurrently")
+    worker_parser.add_argument("--db", help="Job store path (default: JOBS_DB_PATH)")
+    worker_parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+    worker_parser.set_defaults(handler=worker)
+
+    batch_parser = commands.add_parser(
+        "batch", help="Review PRDs through the provider's offline Batch API, storing results as jobs"
+    )
+    batch_parser.add_argument(
+        "sources", nargs="*", help="Files, directories, glob patterns, or '-' (none: resume held and open batches)"
+    )
+    batch_parser.add_argument("--pattern", default="*.md", help="File pattern used inside directories")
+    batch_parser.add_argument("--db", help="Job store path (default: JOBS_DB_PATH)")
+    batch_parser.add_argument("--limit", type=int, help="Requests per batch (default: OFFLINE_BATCH_MAX_REQUESTS)")
+    batch_parser.add_argument("--interval", type=float, help="Seconds between polls (default: OFFLINE_BATCH_POLL_SECONDS)")
+    batch_parser.add_argument("--timeout", type=float, help="Stop polling after this many seconds")
+    batch_parser.add_argument("--no-wait", action="store_true", help="Submit and exit; rerun later to collect")
+    batch_parser.set_defaults(handler=batch)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args, sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
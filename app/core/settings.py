@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +11,65 @@ class Settings(BaseSettings):
     openai_api_key: str | None = None
     openai_model: str = "gpt-4o"
     openai_max_tokens: int = 4096
+    openai_criteria_max_tokens: int = 1024
+    openai_narrative_max_tokens: int = 3072
+    openai_parallel_criteria: bool = False
+    openai_prompt_token_budget: int = 24000
+    prompt_code_block_max_lines: int = 40
+    openai_base_url: str | None = None
+    openai_timeout_seconds: float = 60.0
+    openai_max_connections: int = 200
+    openai_max_keepalive_connections: int = 50
+    openai_keepalive_expiry_seconds: float = 30.0
+    schema_cache_max_age_seconds: int = 300
+    batch_max_items: int = 5000
+    batch_llm_concurrency: int = 16
+    stream_heartbeat_seconds: float = 10.0
+    section_cache_max_entries: int = 4096
+    cascade_first_tier: Literal["off", "mock", "model"] = "off"
+    cascade_model: str = "gpt-4o-mini"
+    cascade_boundary_margin: int = 5
+    cascade_min_confidence: int = 50
+    near_duplicate_mode: Literal["off", "reuse", "seed"] = "off"
+    near_duplicate_threshold: float = 0.9
+    near_duplicate_max_entries: int = 2048
+    near_duplicate_index_path: str | None = None
+    incremental_review_enabled: bool = True
+    incremental_max_documents: int = 256
+    incremental_max_criteria: int = 4
+    llm_max_concurrency: int = 32
+    llm_max_queue_depth: int = 1000
+    llm_queue_deadline_seconds: float = 15.0
+    llm_batch_queue_deadline_seconds: float = 300.0
+    llm_max_retries: int = 3
+    llm_backoff_base_seconds: float = 0.5
+    llm_backoff_max_seconds: float = 20.0
+    llm_degrade_to_mock: bool = True
+    openai_rpm_limit: int = 0
+    openai_tpm_limit: int = 0
+    hedged_llm_slo_seconds: float = 30.0
+    hedged_max_entries: int = 1024
+    hedged_ttl_seconds: float = 3600.0
+    review_response_slo_seconds: float = 0.0
+    jobs_db_path: str = "jobs.sqlite3"
+    jobs_inprocess_workers: int = 2
+    jobs_resume_on_startup: bool = False
+    jobs_lease_seconds: float = 300.0
+    jobs_max_attempts: int = 3
+    jobs_poll_interval_seconds: float = 1.0
+    offline_batch_max_requests: int = 50000
+    offline_batch_max_bytes: int = 190_000_000
+    offline_batch_claim_timeout_seconds: float = 3600.0
+    offline_batch_completion_window: str = "24h"
+    offline_batch_poll_seconds: float = 60.0
+    metrics_stage_timing: bool = True
+    profile_top_functions: int = 25
+    profile_dump_dir: str | None = None
+    warmup_enabled: bool = True
+    review_cache_enabled: bool = True
+    review_cache_max_entries: int = 1024
+    review_cache_ttl_seconds: float = 3600.0
+    review_cache_path: str | None = None
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -1,19 +1,65 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.api.routes import router
 from app.core.settings import settings
+from app.services.metrics import HTTP_SECONDS
+from app.services.scheduler import Overloaded
 
 logging.basicConfig(level=logging.DEBUG if settings.debug else logging.INFO)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # openai is only imported when an API key is configured, keeping mock-only
+    # deployments lean.
+    if settings.openai_api_key:
+        from app.services.llm_openai import get_async_client
+
+        get_async_client()
+    from app.services.jobs import close_job_store, ensure_workers, stop_workers
+
+    if settings.jobs_resume_on_startup:
+        # Resume jobs left queued (or with expired leases) by a previous run.
+        ensure_workers()
+    from app.services.warmup import run_warmup, warmup_state
+
+    # Warm up after startup completes so the server accepts connections (and
+    # answers /health) immediately; /ready flips once warmup has finished.
+    warmup_state.reset()
+    warmup = asyncio.create_task(run_warmup(app)) if settings.warmup_enabled else None
+    if warmup is None:
+        warmup_state.ready = True
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    from app.services.hedged import cancel_upgrades
+
+    await cancel_upgrades()
+    await stop_workers()
+    close_job_store()
+    if settings.openai_api_key:
+        from app.services.llm_openai import close_clients
+
+        await close_clients()
+
+
 app = FastAPI(
     title=settings.app_name,
     version="0.1.0",
     description="Automated PRD review engine powered by LLM analysis",
+    lifespan=lifespan,
 )
 
 ALLOWED_ORIGINS = [
@@ -22,6 +68,36 @@ ALLOWED_ORIGINS = [
     "https://prd-decision-engine-ewa84trba-davidgarzons-projects.vercel.app",
 ]
 
+
+class RequestTimingMiddleware:
+    """Records request latency by route template (pure ASGI, so streams are not buffered)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = perf_counter()
+        status = 500
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; templates keep
+            # label cardinality bounded (no per-ID series).
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_SECONDS.observe(perf_counter() - started, scope["method"], route, str(status))
+
+
+app.add_middleware(RequestTimingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
@@ -30,4 +106,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded) -> JSONResponse:
+    # Only reached when LLM_DEGRADE_TO_MOCK is off.
+    return JSONResponse(
+        status_code=503,
+        content={"detail": exc.reason},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
 app.include_router(router)
@@ -16,6 +16,11 @@ class ReviewRequest(BaseModel):
         default=None,
         description="Execution mode: 'auto' selects LLM when available, 'mock' forces deterministic output",
     )
+    document_id: str | None = Field(
+        default=None,
+        max_length=200,
+        description="Stable ID of the document across edits; enables incremental LLM re-review",
+    )
 
 
 # ── Response building blocks ─────────────────────────────────────────────────
@@ -65,12 +70,50 @@ class ImpactProfile(BaseModel):
     measurement_maturity: RiskLevel
 
 
+class PromptStats(BaseModel):
+    original_tokens: int = Field(..., ge=0)
+    sent_tokens: int = Field(..., ge=0)
+    sections_dropped: int = Field(default=0, ge=0)
+
+
+class CascadeInfo(BaseModel):
+    tier: Literal["mock", "small", "large"] = Field(..., description="Which tier produced the review")
+    model: str = Field(..., description="'mock' for the heuristics, else the OpenAI model that answered")
+    escalated: bool = Field(..., description="True when the first tier's result was borderline")
+    reason: str | None = Field(default=None, description="Why the review was escalated")
+    first_tier_seconds: float = Field(..., ge=0)
+    large_tokens_avoided: int = Field(
+        default=0, ge=0, description="Estimated tokens the large model would have used (0 when escalated)"
+    )
+    large_seconds_avoided: float | None = Field(
+        default=None, description="Recent large-model review latency minus this review's; unknown until one escalates"
+    )
+
+
+class NearDuplicateMatch(BaseModel):
+    review_id: str = Field(..., description="Request digest of the earlier, similar PRD's review")
+    similarity: float = Field(..., ge=0, le=1, description="Estimated Jaccard similarity of word shingles")
+    action: Literal["reuse", "seed"] = Field(
+        ..., description="'reuse': the earlier review was returned; 'seed': only changed criteria were re-scored"
+    )
+
+
 class DecisionTrace(BaseModel):
     scoring_rubric: list[ScoringRubricItem]
     assumptions: list[str]
     confidence: int = Field(..., ge=0, le=100)
     impact_profile: ImpactProfile
     readiness_level: ReadinessLevel
+    prompt_stats: PromptStats | None = Field(
+        default=None, description="PRD + context tokens before and after prompt compaction (LLM mode)"
+    )
+    fallback: str | None = Field(
+        default=None, description="Set when a mock review was served because the LLM path was overloaded"
+    )
+    near_duplicate: NearDuplicateMatch | None = Field(
+        default=None, description="Set when this review was derived from a near-duplicate earlier PRD"
+    )
+    cascade: CascadeInfo | None = Field(default=None, description="Set when the model cascade is enabled")
 
 
 # ── Response ─────────────────────────────────────────────────────────────────
@@ -86,3 +129,91 @@ class ReviewResponse(BaseModel):
     metrics: list[Metric] = Field(..., max_length=8)
     suggested_experiments: list[Experiment] = Field(..., max_length=5)
     decision_trace: DecisionTrace
+
+
+# ── Batch ────────────────────────────────────────────────────────────────────
+
+
+class BatchReviewRequest(BaseModel):
+    items: list[ReviewRequest] = Field(..., min_length=1, description="PRDs to review")
+
+
+class BatchReviewItem(BaseModel):
+    index: int = Field(..., ge=0, description="Position of the item in the request")
+    status: Literal["ok", "error"]
+    review: ReviewResponse | None = None
+    error: str | None = None
+
+
+class BatchReviewResponse(BaseModel):
+    results: list[BatchReviewItem]
+    unique_items: int = Field(..., ge=0, description="Distinct inputs after deduplication")
+
+
+# ── Hedged reviews ───────────────────────────────────────────────────────────
+
+
+class HedgedReview(BaseModel):
+    id: str = Field(..., description="Poll GET /review/hedged/{id} or stream /review/hedged/{id}/stream")
+    status: Literal["pending", "upgraded", "fallback", "mock"] = Field(
+        ...,
+        description=(
+            "pending: mock result while the LLM runs; upgraded: LLM result; "
+            "fallback: LLM timed out or failed, mock result stands; mock: mock mode, nothing to upgrade"
+        ),
+    )
+    review: ReviewResponse
+    error: str | None = None
+
+
+# ── Review jobs ──────────────────────────────────────────────────────────────
+
+
+class ReviewJob(BaseModel):
+    id: str
+    idempotency_key: str = Field(..., description="Derived from the request digest, mode and rubric version")
+    status: Literal["queued", "batched", "running", "succeeded", "failed"] = Field(
+        ..., description="'batched' jobs wait for an offline provider batch instead of a worker"
+    )
+    attempts: int = Field(..., ge=0)
+    created_at: float = Field(..., description="Unix timestamp")
+    updated_at: float = Field(..., description="Unix timestamp")
+    review: ReviewResponse | None = None
+    error: str | None = None
+
+
+class ReviewJobList(BaseModel):
+    jobs: list[ReviewJob]
+    next_before: str | None = Field(
+        default=None, description="Opaque cursor; pass as ?before= to fetch the next (older) page"
+    )
+
+
+# ── Profiling (debug only) ───────────────────────────────────────────────────
+
+
+class StageTiming(BaseModel):
+    stage: str
+    seconds: float
+    calls: int
+
+
+class HotFunction(BaseModel):
+    function: str = Field(..., description="module:qualified_name")
+    calls: int
+    self_seconds: float
+    cumulative_seconds: float
+
+
+class ProfileReport(BaseModel):
+    wall_seconds: float
+    stages: list[StageTiming]
+    hot_functions: list[HotFunction] = Field(..., description="Sorted by self time")
+    collapsed_path: str | None = Field(
+        default=None, description="Collapsed-stack file written under PROFILE_DUMP_DIR"
+    )
+
+
+class ProfiledReview(BaseModel):
+    review: ReviewResponse
+    profile: ProfileReport
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+
+from app.core.settings import settings
+from app.models.schemas import BatchReviewItem, BatchReviewResponse, ReviewRequest, ReviewResponse
+from app.services.reviewer import _cache_key, _should_use_mock, review_prd, review_prd_async
+from app.services.scheduler import Priority, current_priority
+
+logger = logging.getLogger(__name__)
+
+# Mock reviews per worker-thread hop: large enough to amortize the hop, small
+# enough that results stream steadily and the event loop is never blocked.
+_MOCK_CHUNK = 64
+
+
+def _error_message(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+
+
+@dataclass
+class BatchPlan:
+    """Identical inputs grouped once, split by execution path."""
+
+    mock: list[tuple[ReviewRequest, list[int]]] = field(default_factory=list)
+    llm: list[tuple[ReviewRequest, list[int]]] = field(default_factory=list)
+
+    @property
+    def unique_items(self) -> int:
+        return len(self.mock) + len(self.llm)
+
+
+def plan_batch(requests: Sequence[ReviewRequest]) -> BatchPlan:
+    groups: dict[str, tuple[ReviewRequest, list[int], bool]] = {}
+    for index, request in enumerate(requests):
+        use_mock = _should_use_mock(request)
+        key = _cache_key(request, use_mock)
+        if key in groups:
+            groups[key][1].append(index)
+        else:
+            groups[key] = (request, [index], use_mock)
+
+    plan = BatchPlan()
+    for request, indices, use_mock in groups.values():
+        (plan.mock if use_mock else plan.llm).append((request, indices))
+    return plan
+
+
+def _items(indices: list[int], review: ReviewResponse | None, error: str | None) -> list[BatchReviewItem]:
+    status = "ok" if error is None else "error"
+    return [BatchReviewItem(index=i, status=status, review=review, error=error) for i in indices]
+
+
+def _review_mock_chunk(chunk: list[tuple[ReviewRequest, list[int]]]) -> list[list[BatchReviewItem]]:
+    results = []
+    for request, indices in chunk:
+        try:
+            results.append(_items(indices, review_prd(request), None))
+        except Exception as exc:
+            logger.warning("Batch item %s failed: %s", indices[0], exc)
+            results.append(_items(indices, None, _error_message(exc)))
+    return results
+
+
+async def iter_batch_reviews(plan: BatchPlan) -> AsyncIterator[list[BatchReviewItem]]:
+    """Yield per-item results as soon as each unique input finishes.
+
+    LLM reviews start first and fan out with at most
+    ``settings.batch_llm_concurrency`` calls in flight; meanwhile mock reviews
+    run in chunks on a worker thread, one chunk at a time. A finished task is
+    dropped once its result is yielded, so memory does not grow with the batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.batch_llm_concurrency))
+
+    async def run(request: ReviewRequest, indices: list[int]) -> list[BatchReviewItem]:
+        # Each task has its own context, so this only deprioritizes the batch.
+        current_priority.set(Priority.BATCH)
+        async with semaphore:
+            try:
+                return _items(indices, await review_prd_async(request), None)
+            except asyncio.CancelledError as exc:
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise  # the batch itself is being torn down
+                # A shared review was cancelled under us: fail this item only.
+                logger.warning("Batch item %s was cancelled", indices[0])
+                return _items(indices, None, _error_message(exc))
+            except Exception as exc:
+                logger.warning("Batch item %s failed: %s", indices[0], exc)
+                return _items(indices, None, _error_message(exc))
+
+    chunks = (plan.mock[start:start + _MOCK_CHUNK] for start in range(0, len(plan.mock), _MOCK_CHUNK))
+
+    def next_chunk() -> asyncio.Future[list[list[BatchReviewItem]]] | None:
+        chunk = next(chunks, None)
+        return None if chunk is None else asyncio.ensure_future(asyncio.to_thread(_review_mock_chunk, chunk))
+
+    pending: set[asyncio.Future[list[BatchReviewItem]]] = {
+        asyncio.ensure_future(run(request, indices)) for request, indices in plan.llm
+    }
+    mock = next_chunk()
+    try:
+        while pending or mock is not None:
+            waiting = pending if mock is None else pending | {mock}
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if mock in done:
+                finished, mock = mock, next_chunk()
+                for items in finished.result():
+                    yield items
+            for task in done & pending:
+                pending.discard(task)
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if mock is not None:
+            mock.cancel()
+
+
+async def review_batch(requests: Sequence[ReviewRequest]) -> BatchReviewResponse:
+    plan = plan_batch(requests)
+    results: list[BatchReviewItem] = []
+    async for items in iter_batch_reviews(plan):
+        results.extend(items)
+    results.sort(key=lambda item: item.index)
+    return BatchReviewResponse(results=results, unique_items=plan.unique_items)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from app.models.schemas import ReviewResponse
+
+logger = logging.getLogger(__name__)
+
+_PRUNE_EVERY = 256
+
+
+class SharedStore(Protocol):
+    """Cross-process key/value tier behind the in-memory LRU.
+
+    ``SQLiteStore`` is the built-in, single-host implementation; a network KV
+    (Redis, Memcached) fits the same five methods to share results across
+    machines.
+    """
+
+    def get(self, key: str) -> str | None: ...
+
+    def set(self, key: str, value: str, ttl_seconds: float | None) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class SQLiteStore:
+    """``SharedStore`` in a SQLite file that any number of processes can open at once.
+
+    WAL mode lets readers proceed while another worker writes, and the busy
+    timeout makes concurrent writers wait instead of failing. Reads go
+    through a memory-mapped view of the file.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000, mmap_bytes: int = 64 * 1024 * 1024) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute(f"PRAGMA mmap_size = {int(mmap_bytes)}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS review_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._prune()
+
+    def _prune(self) -> None:
+        self._db.execute(
+            "DELETE FROM review_cache WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        )
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM review_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        # Expired rows are left for the periodic prune; another worker may be
+        # about to overwrite them.
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl_seconds: float | None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO review_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._writes += 1
+            if self._writes % _PRUNE_EVERY == 0:
+                self._prune()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM review_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM review_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ReviewCache:
+    """Two-tier result cache: bounded in-memory LRU in front of an optional shared store.
+
+    With a shared store (``path`` for SQLite, or any ``SharedStore``), a review
+    computed by one worker process is reused by every other worker. Cached
+    ``ReviewResponse`` objects are shared between callers and must be treated
+    as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float | None = 3600.0,
+        path: str | None = None,
+        store: SharedStore | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._entries: OrderedDict[str, tuple[float | None, ReviewResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._store: SharedStore | None = store if store is not None else (SQLiteStore(path) if path else None)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ── Shared tier ──────────────────────────────────────────────────────────
+
+    def _disk_get(self, key: str) -> ReviewResponse | None:
+        store = self._store
+        if store is None:
+            return None
+        value = store.get(key)
+        if value is None:
+            return None
+        try:
+            return ReviewResponse.model_validate_json(value)
+        except ValueError:
+            logger.warning("Discarding unreadable cache entry %s", key)
+            store.delete(key)
+            return None
+
+    def _disk_set(self, key: str, review: ReviewResponse) -> None:
+        store = self._store
+        if store is not None:
+            store.set(key, review.model_dump_json(), self.ttl_seconds)
+
+    # ── Public API ───────────────────────────────────────────────────────────
+    # The lock only guards the LRU dict; shared-store I/O and (de)serialization
+    # run outside it so a slow read never blocks memory hits on other threads.
+
+    def get(self, key: str) -> ReviewResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, review = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return review
+                del self._entries[key]
+                self.expirations += 1
+
+        review = self._disk_get(key)
+        with self._lock:
+            if review is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            # A concurrent set() may have landed while we read; keep the newer entry.
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[1]
+            self._memory_set(key, review)
+            return review
+
+    def set(self, key: str, review: ReviewResponse) -> None:
+        with self._lock:
+            self._memory_set(key, review)
+        self._disk_set(key, review)
+
+    def _memory_set(self, key: str, review: ReviewResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (expires_at, review)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            store = self._store
+        if store is not None:
+            store.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
@@ -0,0 +1,158 @@
+"""Model cascade: review with a cheap tier first, escalate to ``OPENAI_MODEL`` only when borderline.
+
+The first tier is the mock heuristics or a small model (``CASCADE_MODEL``).
+Its review stands unless the overall score lies within
+``CASCADE_BOUNDARY_MARGIN`` points of a readiness threshold (where a few
+points change the verdict) or its confidence is below
+``CASCADE_MIN_CONFIDENCE``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from time import perf_counter
+
+from app.core.settings import settings
+from app.models.schemas import CascadeInfo, ReviewRequest, ReviewResponse
+from app.services.metrics import CASCADE, CASCADE_AVOIDED
+from app.services.reviewer import READINESS_THRESHOLDS, _estimated_tokens, _mock_review
+from app.services.scheduler import Overloaded
+
+logger = logging.getLogger(__name__)
+
+# Shed load and missed deadlines are not tier failures: escalating them would
+# add large-model calls exactly when the LLM path is overloaded.
+_NOT_ESCALATED = (Overloaded, TimeoutError)
+
+
+class LatencyAverage:
+    """Exponentially weighted mean of recent large-model review latencies."""
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self.value: float | None = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.value = seconds if self.value is None else self.value + self.alpha * (seconds - self.value)
+
+
+large_latency = LatencyAverage()
+
+
+def policy_key() -> str:
+    """Part of the result cache key: a different policy can produce a different review."""
+    model = settings.cascade_model if settings.cascade_first_tier == "model" else "mock"
+    return f"cascade={model}/{settings.cascade_boundary_margin}/{settings.cascade_min_confidence}"
+
+
+def escalation_reason(review: ReviewResponse) -> str | None:
+    score = review.overall_score
+    nearest = min(READINESS_THRESHOLDS, key=lambda threshold: abs(score - threshold))
+    if abs(score - nearest) < settings.cascade_boundary_margin:
+        return f"score {score} is within {settings.cascade_boundary_margin} of the {nearest} readiness threshold"
+    confidence = review.decision_trace.confidence
+    if confidence < settings.cascade_min_confidence:
+        return f"confidence {confidence} is below {settings.cascade_min_confidence}"
+    return None
+
+
+def _first_tier() -> tuple[str, str]:
+    if settings.cascade_first_tier == "model":
+        return "small", settings.cascade_model
+    return "mock", "mock"
+
+
+def _with_cascade(review: ReviewResponse, info: CascadeInfo) -> ReviewResponse:
+    trace = review.decision_trace.model_copy(update={"cascade": info})
+    return review.model_copy(update={"decision_trace": trace})
+
+
+def _accepted(request: ReviewRequest, review: ReviewResponse, tier: str, model: str, seconds: float) -> ReviewResponse:
+    tokens = _estimated_tokens(request)
+    saved = None if large_latency.value is None else round(max(0.0, large_latency.value - seconds), 6)
+    CASCADE.inc(tier, "false")
+    CASCADE_AVOIDED.inc("tokens", amount=tokens)
+    if saved is not None:
+        CASCADE_AVOIDED.inc("seconds", amount=saved)
+    info = CascadeInfo(
+        tier=tier,
+        model=model,
+        escalated=False,
+        first_tier_seconds=round(seconds, 6),
+        large_tokens_avoided=tokens,
+        large_seconds_avoided=saved,
+    )
+    return _with_cascade(review, info)
+
+
+def _escalated(review: ReviewResponse, reason: str, first_seconds: float, large_seconds: float) -> ReviewResponse:
+    logger.info("Cascade escalated to %s: %s", settings.openai_model, reason)
+    large_latency.observe(large_seconds)
+    CASCADE.inc("large", "true")
+    info = CascadeInfo(
+        tier="large",
+        model=settings.openai_model,
+        escalated=True,
+        reason=reason,
+        first_tier_seconds=round(first_seconds, 6),
+    )
+    return _with_cascade(review, info)
+
+
+def _mock_tier(request: ReviewRequest) -> ReviewResponse:
+    return ReviewResponse.model_validate(_mock_review(request))
+
+
+def _first_tier_failed(exc: Exception) -> str:
+    logger.warning("Cascade first tier failed (%s); escalating", exc)
+    return f"first tier failed: {type(exc).__name__}"
+
+
+def review(
+    request: ReviewRequest, large: Callable[[], ReviewResponse], small: Callable[[], ReviewResponse]
+) -> ReviewResponse:
+    """``large`` and ``small`` run a full LLM review with ``OPENAI_MODEL`` and ``CASCADE_MODEL``."""
+    tier, model = _first_tier()
+    started = perf_counter()
+    try:
+        first = _mock_tier(request) if tier == "mock" else small()
+    except _NOT_ESCALATED:
+        raise
+    except Exception as exc:
+        reason = _first_tier_failed(exc)
+    else:
+        reason = escalation_reason(first)
+    first_seconds = perf_counter() - started
+    if reason is None:
+        return _accepted(request, first, tier, model, first_seconds)
+    started = perf_counter()
+    final = large()
+    return _escalated(final, reason, first_seconds, perf_counter() - started)
+
+
+async def review_async(
+    request: ReviewRequest,
+    large: Callable[[], Awaitable[ReviewResponse]],
+    small: Callable[[], Awaitable[ReviewResponse]],
+) -> ReviewResponse:
+    tier, model = _first_tier()
+    started = perf_counter()
+    try:
+        first = await asyncio.to_thread(_mock_tier, request) if tier == "mock" else await small()
+    except _NOT_ESCALATED:
+        raise
+    except Exception as exc:
+        reason = _first_tier_failed(exc)
+    else:
+        reason = escalation_reason(first)
+    first_seconds = perf_counter() - started
+    if reason is None:
+        return _accepted(request, first, tier, model, first_seconds)
+    started = perf_counter()
+    final = await large()
+    return _escalated(final, reason, first_seconds, perf_counter() - started)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import functools
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.settings import settings
+from app.services.reviewer import section_hits
+from app.services.sections import Section, split_sections
+
+# ── Token counting ───────────────────────────────────────────────────────────
+
+
+@functools.lru_cache(maxsize=8)
+def _encoder(model: str) -> Any | None:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Encodings are downloaded on first use; offline hosts fall back to the estimate.
+        return None
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Exact count for ``model`` (default ``OPENAI_MODEL``) when ``tiktoken`` is installed, otherwise ~4 characters per token."""
+    encoder = _encoder(model or settings.openai_model)
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+# ── Boilerplate stripping ────────────────────────────────────────────────────
+
+_DATA_URI = re.compile(r"data:[\w.+-]+/[\w.+-]+;base64,[A-Za-z0-9+/=\s]{16,}")
+_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_HTML_IMAGE = re.compile(r"<img\b[^>]*>", re.I)
+_FENCE = re.compile(r"^(```|~~~)[^\n]*\n(.*?)^\1[ \t]*$", re.M | re.S)
+_TOC_HEADING = re.compile(r"^#{1,6}[ \t]+(table of contents|contents|toc)[ \t]*$", re.I)
+_TOC_LINE = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+\[[^\]]+\]\(#[^)]*\)\s*$")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+_FENCE_LINE = re.compile(r"^\s*(```|~~~)")
+_HEADING = re.compile(r"^#{1,6}\s")
+# Page furniture pasted from exported docs: confidentiality footers, page numbers.
+_PAGE_FURNITURE = re.compile(
+    r"\b(confidential|proprietary|internal use only|all rights reserved|do not distribute|copyright)\b|©"
+    r"|^page \d+(?: of \d+)?$",
+    re.I,
+)
+
+
+def _image_placeholder(match: re.Match[str]) -> str:
+    alt = match.group(1).strip()
+    return f"[image: {alt}]" if alt else "[image]"
+
+
+def _truncate_code(match: re.Match[str]) -> str:
+    fence, body = match.group(1), match.group(2)
+    lines = body.splitlines()
+    limit = settings.prompt_code_block_max_lines
+    if len(lines) <= limit:
+        return match.group(0)
+    opening = match.group(0).split("\n", 1)[0]
+    kept = "\n".join(lines[:limit])
+    return f"{opening}\n{kept}\n# … {len(lines) - limit} more lines omitted\n{fence}"
+
+
+def _is_boilerplate(line: str) -> bool:
+    return bool(_HEADING.match(line)) or (len(line) <= 120 and bool(_PAGE_FURNITURE.search(line)))
+
+
+def drop_repeated_boilerplate(text: str) -> str:
+    """Keep the first copy of headings and page furniture repeated 3+ times.
+
+    Code blocks, list items, tables and prose are never touched, even when
+    repeated: they are what the model reviews.
+    """
+    lines = text.split("\n")
+    in_fence = False
+    candidates: list[str | None] = []
+    for line in lines:
+        key = line.strip()
+        if _FENCE_LINE.match(line):
+            in_fence = not in_fence
+            candidates.append(None)
+        else:
+            candidates.append(key if not in_fence and key and _is_boilerplate(key) else None)
+    counts = Counter(key for key in candidates if key is not None)
+    seen: set[str] = set()
+    kept = []
+    for line, key in zip(lines, candidates):
+        if key is not None and counts[key] >= 3:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def strip_boilerplate(markdown: str) -> str:
+    text = _DATA_URI.sub("[base64 omitted]", markdown)
+    text = _MD_IMAGE.sub(_image_placeholder, text)
+    text = _HTML_IMAGE.sub("[image]", text)
+    text = _FENCE.sub(_truncate_code, text)
+    sections = [
+        s.text
+        for s in split_sections(text)
+        if not _TOC_HEADING.match(s.heading)
+    ]
+    text = "\n".join(line for line in "".join(sections).split("\n") if not _TOC_LINE.match(line))
+    return _BLANK_RUNS.sub("\n\n", text).strip() + "\n"
+
+
+# ── Budgeted section selection ───────────────────────────────────────────────
+
+
+def _omitted(section: Section) -> str:
+    return f"{section.heading or '(untitled section)'}\n[section omitted for length]\n\n"
+
+
+def select_sections(markdown: str, budget: int, model: str | None = None) -> tuple[str, int]:
+    """Keep the highest-signal sections that fit ``budget`` tokens, in document order.
+
+    Each rubric criterion first gets its strongest section, then the remaining
+    budget goes to sections by keyword hits per token. Returns the text and the
+    number of sections dropped.
+    """
+    sections = split_sections(markdown)
+    hits = [section_hits.counts(section) for section in sections]
+    tokens = [count_tokens(section.text, model) for section in sections]
+    stubs = [count_tokens(_omitted(section), model) for section in sections]
+
+    best_per_criterion = [
+        max(range(len(sections)), key=lambda i, c=c: (hits[i][c], -tokens[i]))
+        for c in range(len(hits[0]))
+        if any(row[c] for row in hits)
+    ]
+    by_density = sorted(range(len(sections)), key=lambda i: -sum(hits[i]) / max(tokens[i], 1))
+    order = [0, *best_per_criterion, *by_density]
+
+    used = sum(stubs)
+    chosen: set[int] = set()
+    for i in order:
+        cost = tokens[i] - stubs[i]
+        if i not in chosen and used + cost <= budget:
+            chosen.add(i)
+            used += cost
+
+    if not chosen:
+        # Even one section is over budget: send the start of the strongest one.
+        first = best_per_criterion[0] if best_per_criterion else 0
+        chars = max(budget * 4 - sum(len(_omitted(s)) for s in sections), 0)
+        chosen_text = sections[first].text[:chars] + "\n[truncated]\n\n"
+        parts = [chosen_text if i == first else _omitted(s) for i, s in enumerate(sections)]
+        return "".join(parts), len(sections) - 1
+
+    parts = [s.text if i in chosen else _omitted(s) for i, s in enumerate(sections)]
+    return "".join(parts), len(sections) - len(chosen)
+
+
+# ── Compaction stage ─────────────────────────────────────────────────────────
+
+
+@dataclass
+class CompactedPrompt:
+    prd_markdown: str
+    context_json: str | None
+    original_tokens: int
+    sent_tokens: int
+    sections_dropped: int
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "original_tokens": self.original_tokens,
+            "sent_tokens": self.sent_tokens,
+            "sections_dropped": self.sections_dropped,
+        }
+
+
+def compact_context(product_context: dict | None) -> str | None:
+    if not product_context:
+        return None
+    return json.dumps(product_context, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_prd(markdown: str, product_context: dict | None, model: str | None = None) -> CompactedPrompt:
+    """``model`` is the model the prompt is for; token counts use its encoding."""
+    original = markdown + (json.dumps(product_context, indent=2) if product_context else "")
+    original_tokens = count_tokens(original, model)
+
+    text = strip_boilerplate(markdown)
+    context_json = compact_context(product_context)
+    context_tokens = count_tokens(context_json, model) if context_json else 0
+
+    dropped = 0
+    budget = settings.openai_prompt_token_budget
+    if budget > 0 and count_tokens(text, model) + context_tokens > budget:
+        text = drop_repeated_boilerplate(text)
+        if count_tokens(text, model) + context_tokens > budget:
+            text, dropped = select_sections(text, max(budget - context_tokens, 0), model)
+
+    sent_tokens = count_tokens(text, model) + context_tokens
+    return CompactedPrompt(text, context_json, original_tokens, sent_tokens, dropped)
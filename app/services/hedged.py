@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from app.core.settings import settings
+from app.models.schemas import HedgedReview, ReviewRequest, ReviewResponse
+from app.services.reviewer import _should_use_mock, review_prd, review_prd_async
+
+logger = logging.getLogger(__name__)
+
+
+class HedgedEntry:
+    __slots__ = ("state", "done", "expires_at")
+
+    def __init__(self, state: HedgedReview, expires_at: float) -> None:
+        self.state = state
+        self.done = asyncio.Event()
+        self.expires_at = expires_at
+
+
+class HedgedStore:
+    """Bounded, expiring map of hedged review IDs to their latest state."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, HedgedEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, state: HedgedReview) -> HedgedEntry:
+        entry = HedgedEntry(state, time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            self._entries[state.id] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, review_id: str) -> HedgedEntry | None:
+        with self._lock:
+            entry = self._entries.get(review_id)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[review_id]
+                return None
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+hedged_store = HedgedStore(settings.hedged_max_entries, settings.hedged_ttl_seconds)
+
+# Strong references so background upgrades are not garbage-collected mid-flight.
+_tasks: set[asyncio.Task[Any]] = set()
+
+
+def _with_fallback(review: ReviewResponse, fallback: str | None) -> ReviewResponse:
+    trace = review.decision_trace.model_copy(update={"fallback": fallback})
+    return review.model_copy(update={"decision_trace": trace})
+
+
+def _settle(entry: HedgedEntry, status: str, review: ReviewResponse, error: str | None = None) -> None:
+    entry.state = HedgedReview(id=entry.state.id, status=status, review=review, error=error)
+    entry.done.set()
+
+
+def _track(task: asyncio.Task[Any]) -> None:
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def _orphaned(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.info("LLM review finished after its hedge gave up: %s", task.exception())
+
+
+async def _upgrade(entry: HedgedEntry, request: ReviewRequest) -> None:
+    mock = entry.state.review
+    # Shielded: past the SLO the hedge gives up waiting, but the LLM review
+    # runs on (still populating the cache) and any coalesced callers keep it.
+    llm = asyncio.get_running_loop().create_task(review_prd_async(request))
+    _track(llm)
+    llm.add_done_callback(_orphaned)
+    try:
+        review = await asyncio.wait_for(asyncio.shield(llm), settings.hedged_llm_slo_seconds)
+    except asyncio.TimeoutError:
+        logger.info("Hedged review %s: LLM exceeded its SLO; mock result stands", entry.state.id)
+        _settle(entry, "fallback", _with_fallback(mock, "mock: LLM exceeded the latency SLO"), "timeout")
+    except Exception as exc:
+        logger.warning("Hedged review %s: LLM failed (%s); mock result stands", entry.state.id, exc)
+        error = f"{type(exc).__name__}: {exc}"
+        _settle(entry, "fallback", _with_fallback(mock, "mock: LLM review failed"), error)
+    else:
+        if review.decision_trace.fallback is not None:
+            # The scheduler already degraded it to a mock review.
+            _settle(entry, "fallback", review)
+        else:
+            _settle(entry, "upgraded", review)
+
+
+async def start_hedged_review(request: ReviewRequest) -> HedgedEntry:
+    """Return the deterministic mock review at once and upgrade it in the background."""
+    review_id = uuid.uuid4().hex
+    # The mock review is CPU work that grows with the PRD; keep it off the event loop.
+    mock = await asyncio.to_thread(review_prd, request.model_copy(update={"mode": "mock"}))
+    if _should_use_mock(request):
+        entry = hedged_store.add(HedgedReview(id=review_id, status="mock", review=mock))
+        entry.done.set()
+        return entry
+
+    pending = _with_fallback(mock, "mock: LLM review pending")
+    entry = hedged_store.add(HedgedReview(id=review_id, status="pending", review=pending))
+    _track(asyncio.get_running_loop().create_task(_upgrade(entry, request)))
+    return entry
+
+
+async def wait_for_result(entry: HedgedEntry, timeout: float) -> HedgedReview:
+    """The settled state, or the current (pending) one once ``timeout`` elapses."""
+    try:
+        await asyncio.wait_for(entry.done.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return entry.state
+
+
+async def cancel_upgrades() -> None:
+    """Cancel background upgrades at shutdown; their mock results stand."""
+    tasks = list(_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from app.core.settings import settings
+from app.models.schemas import NearDuplicateMatch, ReviewRequest, ReviewResponse
+from app.services.llm_openai import _recompute_derived_fields
+from app.services.near_duplicates import NearDuplicateIndex, signature
+from app.services.reviewer import (
+    RUBRIC,
+    RUBRIC_VERSION,
+    _compute_impact_profile,
+    _request_digest,
+    section_hits,
+)
+from app.services.sections import Section, split_sections
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_CRITERIA = [r["criterion"] for r in RUBRIC]
+
+
+@dataclass
+class Snapshot:
+    fingerprints: Counter[str]
+    hits: dict[str, list[int]]
+    review: ReviewResponse
+
+
+@dataclass
+class RereviewPlan:
+    prior: ReviewResponse
+    criteria: list[str]
+    excerpt: str
+    near_duplicate: NearDuplicateMatch | None = None
+
+
+@dataclass
+class IncrementalState:
+    key: str | None
+    sections: list[Section]
+    hits: list[list[int]]
+    plan: RereviewPlan | None = None
+    reuse: ReviewResponse | None = None
+    # Set when near-duplicate detection is on.
+    review_id: str | None = None
+    namespace: str | None = None
+    signature: np.ndarray | None = None
+    near_duplicate: NearDuplicateMatch | None = None
+
+
+class DocumentMemory:
+    """LRU of the last reviewed revision of each document."""
+
+    def __init__(self, max_documents: int) -> None:
+        self.max_documents = max_documents
+        self._entries: OrderedDict[str, Snapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Snapshot | None:
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None:
+                self._entries.move_to_end(key)
+            return snapshot
+
+    def set(self, key: str, snapshot: Snapshot) -> None:
+        with self._lock:
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_documents:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+document_memory = DocumentMemory(settings.incremental_max_documents)
+
+
+def _encode_snapshot(snapshot: Snapshot) -> str:
+    return json.dumps(
+        {
+            "fingerprints": dict(snapshot.fingerprints),
+            "hits": snapshot.hits,
+            "review": snapshot.review.model_dump(mode="json"),
+        },
+        separators=(",", ":"),
+    )
+
+
+def _decode_snapshot(text: str) -> Snapshot:
+    data = json.loads(text)
+    return Snapshot(Counter(data["fingerprints"]), data["hits"], ReviewResponse.model_validate(data["review"]))
+
+
+# Earlier reviews of any document, found by content similarity rather than document_id.
+near_duplicate_index: NearDuplicateIndex[Snapshot] = NearDuplicateIndex(
+    settings.near_duplicate_max_entries,
+    _encode_snapshot,
+    _decode_snapshot,
+    path=settings.near_duplicate_index_path,
+)
+
+
+def _scope(request: ReviewRequest, *identity: str) -> str:
+    # A different context, audience, model or rubric invalidates every prior score.
+    payload = json.dumps(
+        [
+            *identity,
+            request.product_context,
+            request.audience,
+            settings.openai_model,
+            RUBRIC_VERSION,
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _memory_key(request: ReviewRequest) -> str | None:
+    if not settings.incremental_review_enabled or not request.document_id:
+        return None
+    return _scope(request, request.document_id)
+
+
+def _annotated(review: ReviewResponse, match: NearDuplicateMatch) -> ReviewResponse:
+    trace = review.decision_trace.model_copy(update={"near_duplicate": match})
+    return review.model_copy(update={"decision_trace": trace})
+
+
+def _find_near_duplicate(state: IncrementalState) -> Snapshot | None:
+    match = near_duplicate_index.query(state.namespace, state.signature, settings.near_duplicate_threshold)
+    if match is None:
+        return None
+    state.near_duplicate = NearDuplicateMatch(
+        review_id=match.review_id,
+        similarity=round(match.similarity, 4),
+        action=settings.near_duplicate_mode,
+    )
+    if settings.near_duplicate_mode == "reuse":
+        state.reuse = _annotated(match.payload.review, state.near_duplicate)
+    return match.payload
+
+
+def prepare(request: ReviewRequest) -> IncrementalState:
+    """Diff ``request`` against the document's last revision and plan the cheapest re-review.
+
+    Criteria are re-scored only when an added or removed section contains one of
+    their keywords; the LLM then sees just the sections relevant to them. Without
+    a known earlier revision, a near-duplicate PRD (if enabled) is either reused
+    outright or diffed against in the same way.
+    """
+    key = _memory_key(request)
+    if key is None and settings.near_duplicate_mode == "off":
+        return IncrementalState(key=None, sections=[], hits=[])  # nothing to diff against or remember
+    sections = split_sections(request.prd_markdown)
+    hits = [section_hits.counts(section) for section in sections]
+    state = IncrementalState(key=key, sections=sections, hits=hits)
+    prior = document_memory.get(key) if key is not None else None
+
+    if settings.near_duplicate_mode != "off":
+        state.review_id = _request_digest(request)
+        state.namespace = _scope(request)
+        state.signature = signature(request.prd_markdown)
+        if prior is None:
+            prior = _find_near_duplicate(state)
+            if state.reuse is not None:
+                return state
+    if prior is None:
+        return state
+
+    current = Counter(section.fingerprint for section in sections)
+    known = {**prior.hits, **{s.fingerprint: counts for s, counts in zip(sections, hits)}}
+    changed = (current - prior.fingerprints) + (prior.fingerprints - current)
+    changed_hits = [known[fp] for fp in changed]
+    affected = [
+        criterion
+        for i, criterion in enumerate(_CRITERIA)
+        if any(counts[i] for counts in changed_hits)
+    ]
+
+    if not affected:
+        state.reuse = prior.review if state.near_duplicate is None else _annotated(prior.review, state.near_duplicate)
+    elif len(affected) <= settings.incremental_max_criteria:
+        indices = [_CRITERIA.index(c) for c in affected]
+        relevant = [s.text for s, counts in zip(sections, hits) if any(counts[i] for i in indices)]
+        excerpt = "".join(relevant).strip() or "(no sections address these criteria)"
+        state.plan = RereviewPlan(
+            prior=prior.review, criteria=affected, excerpt=excerpt, near_duplicate=state.near_duplicate
+        )
+    return state
+
+
+def merge_rereview(plan: RereviewPlan, items: list[dict[str, Any]]) -> ReviewResponse:
+    data = plan.prior.model_dump()
+    trace = data["decision_trace"]
+    updates = {item["criterion"]: item for item in items}
+    trace["scoring_rubric"] = [updates.get(item["criterion"], item) for item in trace["scoring_rubric"]]
+    trace["impact_profile"] = _compute_impact_profile(trace["scoring_rubric"])
+    trace["prompt_stats"] = None  # described the earlier full-review call
+    trace["near_duplicate"] = plan.near_duplicate.model_dump() if plan.near_duplicate else None
+    _recompute_derived_fields(data)
+    return ReviewResponse.model_validate(data)
+
+
+def remember(state: IncrementalState, review: ReviewResponse) -> None:
+    if state.key is None and state.signature is None:
+        return
+    snapshot = Snapshot(
+        fingerprints=Counter(section.fingerprint for section in state.sections),
+        hits={s.fingerprint: counts for s, counts in zip(state.sections, state.hits)},
+        review=review,
+    )
+    if state.key is not None:
+        document_memory.set(state.key, snapshot)
+    # A near-duplicate's review served as is (reuse mode, or a seed with no
+    # affected criteria) is not indexed again: chains of reuse would drift away
+    # from any document that was actually reviewed.
+    reused = state.near_duplicate is not None and state.reuse is not None
+    if state.signature is not None and not reused:
+        near_duplicate_index.add(state.review_id, state.namespace, state.signature, snapshot)
@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from typing import Any, Literal
+
+from app.core.settings import settings
+from app.models.schemas import ReviewJob, ReviewRequest, ReviewResponse
+from app.services.metrics import Family, registry
+from app.services.reviewer import _cache_key, _should_use_mock, review_prd_async
+from app.services.scheduler import Priority, current_priority
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "id, idempotency_key, status, request, result, error, attempts, created_at, updated_at"
+
+
+def idempotency_key(request: ReviewRequest) -> str:
+    # The cache key embeds the request digest (hex of _stable_seed), the effective
+    # mode/model and the rubric version, so equal keys mean equal reviews.
+    return _cache_key(request, _should_use_mock(request))
+
+
+class JobStore:
+    """Durable review job queue in SQLite (WAL), shared by in-process and CLI workers.
+
+    Jobs are claimed with a lease; a worker that dies mid-review lets its lease
+    expire and the job is picked up again.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS review_jobs ("
+            "id TEXT PRIMARY KEY, idempotency_key TEXT NOT NULL UNIQUE, status TEXT NOT NULL, "
+            "request TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, lease_expires REAL, worker TEXT)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS review_jobs_queue ON review_jobs (status, created_at)"
+        )
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _job(row: tuple[Any, ...]) -> ReviewJob:
+        job_id, key, status, _, result, error, attempts, created_at, updated_at = row
+        review = ReviewResponse.model_validate_json(result) if result else None
+        return ReviewJob(
+            id=job_id,
+            idempotency_key=key,
+            status=status,
+            attempts=attempts,
+            created_at=created_at,
+            updated_at=updated_at,
+            review=review,
+            error=error,
+        )
+
+    def enqueue(
+        self, request: ReviewRequest, key: str | None = None, status: Literal["queued", "batched"] = "queued"
+    ) -> tuple[ReviewJob, bool]:
+        """Insert a job unless one with the same idempotency key exists; failed jobs are re-queued.
+
+        ``batched`` jobs are left to ``app.services.offline_batch``; workers never claim them.
+        """
+        key = key or idempotency_key(request)
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                inserted = self._db.execute(
+                    "INSERT OR IGNORE INTO review_jobs "
+                    "(id, idempotency_key, status, request, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (uuid.uuid4().hex, key, status, request.model_dump_json(), now, now),
+                ).rowcount
+                if not inserted:
+                    self._db.execute(
+                        "UPDATE review_jobs SET status = ?, error = NULL, attempts = 0, worker = NULL, "
+                        "updated_at = ? WHERE idempotency_key = ? AND status = 'failed'",
+                        (status, now, key),
+                    )
+                row = self._db.execute(
+                    f"SELECT {_COLUMNS} FROM review_jobs WHERE idempotency_key = ?", (key,)
+                ).fetchone()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return self._job(row), bool(inserted)
+
+    def claim(
+        self, worker: str, lease_seconds: float, max_attempts: int | None = None
+    ) -> tuple[str, ReviewRequest] | None:
+        """Claim the oldest queued job, or one whose lease expired.
+
+        An expired job that has already used ``max_attempts`` is marked
+        ``failed`` instead, so a job that keeps crashing its worker stops.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if max_attempts is not None:
+                    self._db.execute(
+                        "UPDATE review_jobs SET status = 'failed', error = 'Lease expired on the final attempt', "
+                        "lease_expires = NULL, updated_at = ? "
+                        "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+                        (now, now, max_attempts),
+                    )
+                row = self._db.execute(
+                    "UPDATE review_jobs SET status = 'running', attempts = attempts + 1, worker = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ("
+                    "  SELECT id FROM review_jobs WHERE status = 'queued' "
+                    "  OR (status = 'running' AND lease_expires < ?) ORDER BY created_at LIMIT 1"
+                    ") RETURNING id, request",
+                    (worker, now + lease_seconds, now, now),
+                ).fetchone()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job_id, raw = row
+        return job_id, ReviewRequest.model_validate_json(raw)
+
+    def renew(self, job_id: str, worker: str, lease_seconds: float) -> bool:
+        """Extend a running job's lease; False once another worker has taken it over."""
+        now = time.time()
+        return bool(
+            self._execute(
+                "UPDATE review_jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running' RETURNING id",
+                (now + lease_seconds, now, job_id, worker),
+            )
+        )
+
+    # ``complete`` and ``fail`` only apply while ``worker`` still holds the
+    # job, so a worker whose lease was taken over cannot overwrite the result.
+
+    def complete(self, job_id: str, worker: str, review: ReviewResponse) -> bool:
+        return bool(
+            self._execute(
+                "UPDATE review_jobs SET status = 'succeeded', result = ?, error = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND worker = ? "
+                "AND status IN ('running', 'batched') RETURNING id",
+                (review.model_dump_json(), time.time(), job_id, worker),
+            )
+        )
+
+    def fail(self, job_id: str, worker: str, error: str, max_attempts: int) -> bool:
+        return bool(
+            self._execute(
+                "UPDATE review_jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                "error = ?, lease_expires = NULL, updated_at = ? WHERE id = ? AND worker = ? "
+                "AND status = 'running' RETURNING id",
+                (max_attempts, error, time.time(), job_id, worker),
+            )
+        )
+
+    # ── Offline batches ──────────────────────────────────────────────────────
+    # A batched job's ``worker`` is NULL until it is claimed for a provider
+    # batch, then holds that batch's tag until a result or retry clears it.
+    # An attempt is counted once the batch is actually submitted (retag).
+
+    def claim_batch(self, tag: str, limit: int) -> list[tuple[str, ReviewRequest]]:
+        rows = self._execute(
+            "UPDATE review_jobs SET worker = ?, updated_at = ? WHERE id IN ("
+            "  SELECT id FROM review_jobs WHERE status = 'batched' AND worker IS NULL "
+            "  ORDER BY created_at LIMIT ?"
+            ") RETURNING id, request",
+            (tag, time.time(), limit),
+        )
+        return [(job_id, ReviewRequest.model_validate_json(raw)) for job_id, raw in rows]
+
+    def retag_batch(self, old: str, new: str) -> None:
+        self._execute(
+            "UPDATE review_jobs SET worker = ?, attempts = attempts + 1, updated_at = ? "
+            "WHERE status = 'batched' AND worker = ?",
+            (new, time.time(), old),
+        )
+
+    def release_batch_claims(self, job_ids: Iterable[str]) -> None:
+        """Return claimed but unsubmitted jobs to the pool for the next batch."""
+        with self._lock:
+            self._db.executemany(
+                "UPDATE review_jobs SET worker = NULL WHERE id = ? AND status = 'batched'",
+                [(job_id,) for job_id in job_ids],
+            )
+
+    def release_stale_batch_claims(self, prefix: str, before: float) -> int:
+        """Un-tag claims under ``prefix`` untouched since ``before`` (a submitter that died)."""
+        rows = self._execute(
+            "UPDATE review_jobs SET worker = NULL, updated_at = ? "
+            "WHERE status = 'batched' AND substr(worker, 1, ?) = ? AND updated_at < ? RETURNING id",
+            (time.time(), len(prefix), prefix, before),
+        )
+        return len(rows)
+
+    def batch_tags(self) -> list[str]:
+        rows = self._execute(
+            "SELECT DISTINCT worker FROM review_jobs WHERE status = 'batched' AND worker IS NOT NULL"
+        )
+        return [tag for (tag,) in rows]
+
+    def batch_jobs(self, tag: str) -> dict[str, ReviewRequest]:
+        rows = self._execute("SELECT id, request FROM review_jobs WHERE status = 'batched' AND worker = ?", (tag,))
+        return {job_id: ReviewRequest.model_validate_json(raw) for job_id, raw in rows}
+
+    def retry_batched(self, errors: dict[str, str], max_attempts: int) -> None:
+        """Return jobs to the next batch, or mark them ``failed`` once out of attempts."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "UPDATE review_jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'batched' END, "
+                    "worker = NULL, error = ?, updated_at = ? WHERE id = ? AND status = 'batched'",
+                    [(max_attempts, error, now, job_id) for job_id, error in errors.items()],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def get(self, job_id: str) -> ReviewJob | None:
+        rows = self._execute(f"SELECT {_COLUMNS} FROM review_jobs WHERE id = ?", (job_id,))
+        return self._job(rows[0]) if rows else None
+
+    def list_jobs(
+        self, status: str | None = None, limit: int = 50, before: tuple[float, str] | None = None
+    ) -> list[ReviewJob]:
+        """Newest first; pass the last job's ``(created_at, id)`` as ``before`` for the next page.
+
+        The id breaks ties, so jobs created in the same instant are never skipped.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if before is not None:
+            clauses.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            params.extend([before[0], before[0], before[1]])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._execute(
+            f"SELECT {_COLUMNS} FROM review_jobs {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [self._job(row) for row in rows]
+
+    def counts(self) -> dict[str, int]:
+        rows = self._execute("SELECT status, COUNT(*) FROM review_jobs GROUP BY status")
+        return {"queued": 0, "batched": 0, "running": 0, "succeeded": 0, "failed": 0, **dict(rows)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_store: JobStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    # Opened on first use so deployments that never enqueue jobs create no file.
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore(settings.jobs_db_path)
+        return _store
+
+
+def job_stats() -> dict[str, int] | None:
+    """Queue counts, or None when the store has not been opened in this process."""
+    with _store_lock:
+        store = _store
+    return store.counts() if store is not None else None
+
+
+@registry.collector
+def _job_metrics() -> Iterable[Family]:
+    counts = job_stats()
+    if counts is not None:
+        yield (
+            "prd_review_jobs",
+            "gauge",
+            "Review jobs in the store by status",
+            [({"status": status}, count) for status, count in counts.items()],
+        )
+
+
+def close_job_store() -> None:
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+# ── Workers ──────────────────────────────────────────────────────────────────
+
+
+def _worker_id(index: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+class JobWorkers:
+    """Async workers that claim jobs from the store and run ``review_prd_async``."""
+
+    def __init__(self, store: JobStore, concurrency: int) -> None:
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+        self.processed = 0
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def _heartbeat(self, job_id: str, worker: str) -> None:
+        # Renew well before expiry so a slow review (queueing, retries) is
+        # never reclaimed and reviewed twice while this worker is alive.
+        lease = settings.jobs_lease_seconds
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                if not await asyncio.to_thread(self.store.renew, job_id, worker, lease):
+                    logger.warning("Job %s lease was taken over by another worker", job_id)
+                    return
+            except sqlite3.Error as exc:
+                logger.warning("Job %s lease renewal failed: %s", job_id, exc)
+
+    async def _process(self, worker: str) -> bool:
+        claimed = await asyncio.to_thread(
+            self.store.claim, worker, settings.jobs_lease_seconds, settings.jobs_max_attempts
+        )
+        if claimed is None:
+            return False
+        job_id, request = claimed
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, worker))
+        try:
+            review = await review_prd_async(request)
+        except Exception as exc:
+            logger.warning("Job %s failed: %s", job_id, exc)
+            error = f"{type(exc).__name__}: {exc}"
+            await asyncio.to_thread(self.store.fail, job_id, worker, error, settings.jobs_max_attempts)
+        else:
+            if review.decision_trace.fallback is not None:
+                # A degraded mock stored as ``succeeded`` would answer every later
+                # enqueue of this PRD; retry the job for the real review instead.
+                logger.warning("Job %s got a degraded review (%s); retrying", job_id, review.decision_trace.fallback)
+                error = f"Degraded review: {review.decision_trace.fallback}"
+                await asyncio.to_thread(self.store.fail, job_id, worker, error, settings.jobs_max_attempts)
+            elif not await asyncio.to_thread(self.store.complete, job_id, worker, review):
+                logger.warning("Job %s finished after losing its lease; result discarded", job_id)
+        finally:
+            heartbeat.cancel()
+        self.processed += 1
+        return True
+
+    async def _loop(self, index: int) -> None:
+        current_priority.set(Priority.BATCH)
+        worker = _worker_id(index)
+        while True:
+            try:
+                if await self._process(worker):
+                    continue
+            except Exception:
+                logger.exception("Job worker %s crashed; retrying", worker)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.jobs_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        # Restart when the previous event loop has gone away (tasks cancelled).
+        if not self._tasks or all(task.done() for task in self._tasks):
+            loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._tasks = [loop.create_task(self._loop(i)) for i in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def drain(self) -> int:
+        """Process queued jobs until none are left (used by ``--once`` and tests)."""
+        worker = _worker_id(0)
+        processed = 0
+        while await self._process(worker):
+            processed += 1
+        return processed
+
+
+_workers: JobWorkers | None = None
+
+
+def ensure_workers() -> JobWorkers | None:
+    """Start the in-process pool on first use; ``JOBS_INPROCESS_WORKERS=0`` leaves jobs to CLI workers."""
+    global _workers
+    if settings.jobs_inprocess_workers <= 0:
+        return None
+    if _workers is None:
+        _workers = JobWorkers(get_job_store(), settings.jobs_inprocess_workers)
+    _workers.start()
+    return _workers
+
+
+async def stop_workers() -> None:
+    global _workers
+    if _workers is not None:
+        await _workers.stop()
+        _workers = None
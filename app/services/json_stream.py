@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class _Container:
+    __slots__ = ("kind", "key", "start", "pending_key")
+
+    def __init__(self, kind: str, key: str | None, start: int) -> None:
+        self.kind = kind  # "{" or "["
+        self.key = key  # key of this container in its parent object
+        self.start = start
+        self.pending_key: str | None = None
+
+
+class ArrayItemParser:
+    """Incrementally extract the objects of one array from a streamed JSON document.
+
+    ``path`` names the keys from the root object down to the array, e.g.
+    ``("decision_trace", "scoring_rubric")``. Each call to :meth:`feed` scans only
+    the new characters and returns the array elements that were completed.
+    """
+
+    def __init__(self, path: tuple[str, ...]) -> None:
+        self.path = path
+        self._text = ""
+        self._pos = 0
+        self._stack: list[_Container] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: str | None = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        self._text += chunk
+        text = self._text
+        items: list[dict[str, Any]] = []
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start : pos + 1]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char == ":":
+                if self._stack and self._stack[-1].kind == "{" and self._last_string is not None:
+                    self._stack[-1].pending_key = json.loads(self._last_string)
+            elif char in "{[":
+                parent = self._stack[-1] if self._stack else None
+                key = parent.pending_key if parent is not None and parent.kind == "{" else None
+                self._stack.append(_Container(char, key, pos))
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                closed = self._stack.pop()
+                if closed.kind == "{" and self._is_target(self._stack):
+                    items.append(json.loads(text[closed.start : pos + 1]))
+            elif char == "," and self._stack and self._stack[-1].kind == "{":
+                self._stack[-1].pending_key = None
+        self._pos = len(text)
+        return items
+
+    def _is_target(self, stack: list[_Container]) -> bool:
+        # stack[0] is the root object; the array must sit exactly at ``path``.
+        if len(stack) != len(self.path) + 1 or stack[-1].kind != "[":
+            return False
+        return tuple(c.key for c in stack[1:]) == self.path
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+
+_ESCAPE = re.compile(r"\\.")
+_LITERAL_START = re.compile(r"[a-z0-9/ ]")
+
+
+def fold_case(text: str) -> str:
+    """Lowercase ``text`` so case-sensitive matching equals ``re.I`` on the original.
+
+    ``str.lower()`` agrees with ``re.I`` on everything except three code points
+    that re treats as ASCII letters: it expands "İ" to two characters and keeps
+    "ı" and "ſ" as they are.
+    """
+    if text.isascii():
+        return text.lower()
+    if "İ" in text:
+        text = text.replace("İ", "i")
+    text = text.lower()
+    if "ı" in text:
+        text = text.replace("ı", "i")
+    if "ſ" in text:
+        text = text.replace("ſ", "s")
+    return text
+
+
+def _alternatives(pattern: str) -> list[str] | None:
+    """Top-level alternatives, or None when the pattern has groups or classes."""
+    if any(meta in pattern for meta in "()[]") or "\\|" in pattern:
+        return None
+    return pattern.split("|")
+
+
+def _has_literal_start(alternative: str) -> bool:
+    return bool(_LITERAL_START.fullmatch(alternative[:1])) and alternative[1:2] not in ("?", "*", "{")
+
+
+class KeywordScanner:
+    """Count non-overlapping matches of several ``re.I`` patterns in one pass.
+
+    ``count(text)`` returns exactly ``[len(p.findall(text)) for p in patterns]``
+    without materializing match lists. The text is case-folded once, a single
+    regex built from every alternative (factored by first character) locates
+    candidate positions, and only the patterns that can start with the
+    candidate's first character are tried there.
+    """
+
+    def __init__(self, patterns: Sequence[re.Pattern[str]]) -> None:
+        for pattern in patterns:
+            if pattern.flags != re.IGNORECASE | re.UNICODE:
+                raise ValueError(f"expected a re.I pattern, got {pattern.pattern!r}")
+            if _ESCAPE.sub("", pattern.pattern) != _ESCAPE.sub("", pattern.pattern).lower():
+                raise ValueError(f"pattern literals must be lowercase: {pattern.pattern!r}")
+            if pattern.fullmatch(""):
+                raise ValueError(f"pattern must not match the empty string: {pattern.pattern!r}")
+
+        self.size = len(patterns)
+        self._matchers = [re.compile(p.pattern).match for p in patterns]
+
+        by_prefix: dict[str, list[str]] = {}
+        by_first: dict[str, set[int]] = {}
+        anywhere: set[int] = set()
+        unfactored: list[str] = []
+        for index, pattern in enumerate(patterns):
+            alternatives = _alternatives(pattern.pattern)
+            if alternatives is None:
+                anywhere.add(index)
+                unfactored.append(f"(?:{pattern.pattern})")
+                continue
+            for alternative in alternatives:
+                if not _has_literal_start(alternative):
+                    anywhere.add(index)
+                    unfactored.append(f"(?:{alternative})")
+                    continue
+                by_prefix.setdefault(alternative[0], []).append(alternative[1:])
+                by_first.setdefault(alternative[0], set()).add(index)
+
+        branches = [f"{re.escape(first)}(?:{'|'.join(rests)})" for first, rests in by_prefix.items()]
+        self._candidates = re.compile("|".join(branches + unfactored))
+        self._by_first = {first: tuple(sorted(ids | anywhere)) for first, ids in by_first.items()}
+        self._anywhere = tuple(sorted(anywhere))
+
+    def count(self, text: str) -> list[int]:
+        folded = fold_case(text)
+        counts = [0] * self.size
+        ends = [0] * self.size
+        matchers = self._matchers
+        by_first = self._by_first
+        anywhere = self._anywhere
+        search = self._candidates.search
+        pos = 0
+        while (candidate := search(folded, pos)) is not None:
+            start = candidate.start()
+            for index in by_first.get(folded[start], anywhere):
+                if start >= ends[index]:
+                    hit = matchers[index](folded, start)
+                    if hit is not None:
+                        counts[index] += 1
+                        ends[index] = hit.end()
+            pos = start + 1
+        return counts
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import math
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 
 from app.core.settings import settings
-from app.models.schemas import ReviewResponse
-from app.services.reviewer import RUBRIC
+from app.models.schemas import ReviewResponse, ScoringRubricItem
+from app.services.compaction import CompactedPrompt, compact_prd
+from app.services.json_stream import ArrayItemParser
+from app.services.metrics import labels_for, record_tokens, stage
+from app.services.reviewer import RUBRIC, _compute_impact_profile
+from app.services.scheduler import llm_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -50,13 +58,67 @@ In decision_trace, also include:
    - 80-100: Board Ready"""
 
 
-def _build_user_prompt(prd_markdown: str, product_context: dict | None, audience: str | None) -> str:
-    parts = [f"# PRD\n\n{prd_markdown}"]
-    if product_context:
-        parts.append(f"\n\n# Product Context\n\n{json.dumps(product_context, indent=2)}")
+CRITERIA_SYSTEM_PROMPT = f"""\
+You are a VP Product scoring selected criteria of a PRD rubric. You are given the PRD, \
+or only the sections relevant to those criteria. Do not wrap the JSON in markdown code fences.
+
+Full rubric (criterion and maximum weight):
+{_RUBRIC_TABLE}
+
+Respond with a JSON object {{"scoring_rubric": [...]}} containing exactly one entry per \
+requested criterion with fields: criterion, weight, score, notes. Each score must be \
+between 0 and the criterion's weight (inclusive). The "notes" field must focus on \
+business consequences — explain impact on delivery risk, strategic alignment, or \
+measurable outcomes. Avoid generic phrases like "missing" or "lacks detail"."""
+
+NARRATIVE_SYSTEM_PROMPT = """\
+You are a VP Product reviewing a PRD for board-readiness. Scores are produced \
+separately; write only the narrative part of the review. Be specific, actionable, \
+and concise. Do not wrap the JSON in markdown code fences.
+
+Respond with a JSON object with these fields:
+- summary: string
+- strengths: up to 6 strings
+- gaps: up to 10 objects with area, why, suggested_fix
+- risks: up to 8 objects with risk, impact, mitigation
+- questions: up to 12 strings
+- metrics: up to 8 objects with metric, definition
+- suggested_experiments: up to 5 objects with hypothesis, metric, design
+- assumptions: strings listing the assumptions your review relies on"""
+
+_NARRATIVE_FIELDS = ("summary", "strengths", "gaps", "risks", "questions", "metrics", "suggested_experiments")
+
+_WEIGHTS = {r["criterion"]: r["weight"] for r in RUBRIC}
+
+
+def _context_parts(context_json: str | None, audience: str | None) -> list[str]:
+    parts = []
+    if context_json:
+        parts.append(f"\n\n# Product Context\n\n{context_json}")
     if audience:
         parts.append(f"\n\n# Audience\n\n{audience}")
-    parts.append("\n\nRespond with ONLY valid JSON matching the ReviewResponse schema.")
+    return parts
+
+
+def _build_user_prompt(
+    prompt: CompactedPrompt,
+    audience: str | None,
+    closing: str = "Respond with ONLY valid JSON matching the ReviewResponse schema.",
+) -> str:
+    parts = [f"# PRD\n\n{prompt.prd_markdown}"]
+    parts.extend(_context_parts(prompt.context_json, audience))
+    parts.append(f"\n\n{closing}")
+    return "".join(parts)
+
+
+def _build_criteria_prompt(prompt: CompactedPrompt, criteria: list[str], audience: str | None) -> str:
+    requested = "\n".join(f"- {c} (max {_WEIGHTS[c]} pts)" for c in criteria)
+    parts = [
+        f"# Criteria to score\n\n{requested}",
+        f"\n\n# Relevant PRD sections\n\n{prompt.prd_markdown}",
+    ]
+    parts.extend(_context_parts(prompt.context_json, audience))
+    parts.append('\n\nRespond with ONLY valid JSON of the form {"scoring_rubric": [...]}.')
     return "".join(parts)
 
 
@@ -91,29 +153,317 @@ def _recompute_derived_fields(data: dict[str, Any]) -> None:
         trace["readiness_level"] = "Draft"
 
 
-def call_openai(prd_markdown: str, product_context: dict | None, audience: str | None) -> dict[str, Any]:
-    client = OpenAI(api_key=settings.openai_api_key)
+# ── Shared clients ───────────────────────────────────────────────────────────
+
+_client: OpenAI | None = None
+_async_client: AsyncOpenAI | None = None
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+        keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+    )
+
+
+def _record_rate_limits(response: httpx.Response) -> None:
+    llm_scheduler.budget.update_from_headers(response.headers)
+
+
+async def _record_rate_limits_async(response: httpx.Response) -> None:
+    _record_rate_limits(response)
+
 
-    response = client.chat.completions.create(
-        model=settings.openai_model,
-        max_tokens=settings.openai_max_tokens,
-        temperature=0.2,
-        response_format={"type": "json_object"},
-        messages=[
+# Retries are owned by app.services.scheduler (jittered, budget-aware), so the
+# SDK's own retry loop is disabled.
+
+
+def get_client() -> OpenAI:
+    global _client
+    if _client is None:
+        _client = OpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            timeout=settings.openai_timeout_seconds,
+            max_retries=0,
+            http_client=DefaultHttpxClient(
+                limits=_http_limits(), event_hooks={"response": [_record_rate_limits]}
+            ),
+        )
+    return _client
+
+
+def get_async_client() -> AsyncOpenAI:
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            timeout=settings.openai_timeout_seconds,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=_http_limits(), event_hooks={"response": [_record_rate_limits_async]}
+            ),
+        )
+    return _async_client
+
+
+async def close_clients() -> None:
+    global _client, _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+# ── Review calls ─────────────────────────────────────────────────────────────
+
+
+def _completion_kwargs(prompt: CompactedPrompt, audience: str | None, model: str | None = None) -> dict[str, Any]:
+    return {
+        "model": model or settings.openai_model,
+        "max_tokens": settings.openai_max_tokens,
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+        "messages": [
             {"role": "system", "content": SYSTEM_PROMPT},
             {
                 "role": "user",
-                "content": _build_user_prompt(prd_markdown, product_context, audience),
+                "content": _build_user_prompt(prompt, audience),
             },
         ],
-    )
+    }
+
 
-    raw = response.choices[0].message.content
+def _parse_review(raw: str | None, prompt_stats: dict[str, int] | None = None) -> ReviewResponse:
     if raw is None:
         raise RuntimeError("OpenAI returned an empty response")
 
-    data: dict[str, Any] = json.loads(raw)
-    _recompute_derived_fields(data)
+    labels = labels_for(False)
+    with stage("json_parse", labels):
+        data: dict[str, Any] = json.loads(raw)
+    with stage("recompute_derived", labels):
+        _recompute_derived_fields(data)
+    if prompt_stats is not None:
+        data.setdefault("decision_trace", {})["prompt_stats"] = prompt_stats
+
+    # The only validation pass on the LLM path; callers pass the model through.
+    with stage("validate", labels):
+        return ReviewResponse.model_validate(data)
+
+
+# Streaming asks for the rubric first so partial scores reach the client early.
+_STREAM_CLOSING = (
+    "Respond with ONLY valid JSON matching the ReviewResponse schema. "
+    "Write the decision_trace field first, starting with scoring_rubric."
+)
+
+
+def _stream_kwargs(prompt: CompactedPrompt, audience: str | None) -> dict[str, Any]:
+    kwargs = _completion_kwargs(prompt, audience)
+    kwargs["messages"][1]["content"] = _build_user_prompt(prompt, audience, _STREAM_CLOSING)
+    kwargs["stream"] = True
+    # The final chunk then carries the usage that non-streamed responses report.
+    kwargs["stream_options"] = {"include_usage": True}
+    return kwargs
+
+
+def _partial_rubric_item(item: dict[str, Any]) -> dict[str, Any] | None:
+    weight = _WEIGHTS.get(item.get("criterion"))
+    if weight is None:
+        return None
+    try:
+        validated = ScoringRubricItem.model_validate({**item, "weight": weight})
+    except ValueError:
+        return None  # the final validation pass reports the problem
+    return validated.model_dump()
+
+
+def _criteria_kwargs(
+    prompt: CompactedPrompt, criteria: list[str], audience: str | None, model: str | None = None
+) -> dict[str, Any]:
+    return {
+        "model": model or settings.openai_model,
+        "max_tokens": settings.openai_criteria_max_tokens,
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {"role": "system", "content": CRITERIA_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": _build_criteria_prompt(prompt, criteria, audience),
+            },
+        ],
+    }
+
+
+def _parse_criteria(raw: str | None, criteria: list[str]) -> list[dict[str, Any]]:
+    if raw is None:
+        raise RuntimeError("OpenAI returned an empty response")
+
+    with stage("json_parse", labels_for(False)):
+        items = json.loads(raw).get("scoring_rubric", [])
+    by_name: dict[str, dict[str, Any]] = {}
+    for item in items:
+        name = item.get("criterion")
+        if name in criteria and name not in by_name:
+            item["weight"] = _WEIGHTS[name]
+            by_name[name] = ScoringRubricItem.model_validate(item).model_dump()
+
+    missing = [c for c in criteria if c not in by_name]
+    if missing:
+        raise RuntimeError(f"OpenAI response is missing criteria: {', '.join(missing)}")
+    return [by_name[c] for c in criteria]
+
+
+def _narrative_kwargs(prompt: CompactedPrompt, audience: str | None, model: str | None = None) -> dict[str, Any]:
+    return {
+        "model": model or settings.openai_model,
+        "max_tokens": settings.openai_narrative_max_tokens,
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {"role": "system", "content": NARRATIVE_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": _build_user_prompt(prompt, audience, "Respond with ONLY the narrative JSON object."),
+            },
+        ],
+    }
+
+
+def _assemble_review(
+    narrative_raw: str | None, rubric_items: list[dict[str, Any]], prompt: CompactedPrompt
+) -> ReviewResponse:
+    """Build a full review from per-criterion scores and the narrative call."""
+    if narrative_raw is None:
+        raise RuntimeError("OpenAI returned an empty response")
+
+    labels = labels_for(False)
+    with stage("json_parse", labels):
+        narrative: dict[str, Any] = json.loads(narrative_raw)
+    data: dict[str, Any] = {field: narrative.get(field, []) for field in _NARRATIVE_FIELDS}
+    data["summary"] = narrative.get("summary", "")
+    data["decision_trace"] = {
+        "scoring_rubric": rubric_items,
+        "assumptions": narrative.get("assumptions", []),
+        "impact_profile": _compute_impact_profile(rubric_items),
+        "prompt_stats": prompt.stats(),
+    }
+    with stage("recompute_derived", labels):
+        _recompute_derived_fields(data)
+    with stage("validate", labels):
+        return ReviewResponse.model_validate(data)
+
+
+# ── Entry points ─────────────────────────────────────────────────────────────
+
+
+def _record_usage(response: Any) -> None:
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        record_tokens(getattr(response, "model", None) or settings.openai_model, usage.prompt_tokens, usage.completion_tokens)
+
+
+def _content(response: Any) -> str | None:
+    _record_usage(response)
+    return response.choices[0].message.content
+
+
+def _create(kwargs: dict[str, Any]) -> str | None:
+    with stage("openai_network", labels_for(False)):
+        response = get_client().chat.completions.create(**kwargs)
+    return _content(response)
+
+
+async def _create_async(kwargs: dict[str, Any]) -> str | None:
+    with stage("openai_network", labels_for(False)):
+        response = await get_async_client().chat.completions.create(**kwargs)
+    return _content(response)
+
+
+def _prompt(prd_markdown: str, product_context: dict | None, model: str | None = None) -> CompactedPrompt:
+    with stage("prompt_build", labels_for(False)):
+        return compact_prd(prd_markdown, product_context, model)
+
+
+def _call_parallel(prompt: CompactedPrompt, audience: str | None, model: str | None = None) -> ReviewResponse:
+    # One thread per completion; the shared httpx pool is thread-safe.
+    criteria = [r["criterion"] for r in RUBRIC]
+    with ThreadPoolExecutor(max_workers=len(criteria) + 1) as pool:
+        narrative = pool.submit(_create, _narrative_kwargs(prompt, audience, model))
+        scored = [pool.submit(_create, _criteria_kwargs(prompt, [c], audience, model)) for c in criteria]
+        rubric_items = [_parse_criteria(f.result(), [c])[0] for c, f in zip(criteria, scored)]
+        return _assemble_review(narrative.result(), rubric_items, prompt)
+
+
+async def _call_parallel_async(
+    prompt: CompactedPrompt, audience: str | None, model: str | None = None
+) -> ReviewResponse:
+    criteria = [r["criterion"] for r in RUBRIC]
+    narrative, *scored = await asyncio.gather(
+        _create_async(_narrative_kwargs(prompt, audience, model)),
+        *(_create_async(_criteria_kwargs(prompt, [c], audience, model)) for c in criteria),
+    )
+    rubric_items = [_parse_criteria(raw, [c])[0] for c, raw in zip(criteria, scored)]
+    return _assemble_review(narrative, rubric_items, prompt)
+
+
+def call_openai(
+    prd_markdown: str, product_context: dict | None, audience: str | None, model: str | None = None
+) -> ReviewResponse:
+    """Full review; ``model`` overrides ``OPENAI_MODEL`` (the cascade's small tier)."""
+    prompt = _prompt(prd_markdown, product_context, model)
+    if settings.openai_parallel_criteria:
+        return _call_parallel(prompt, audience, model)
+    return _parse_review(_create(_completion_kwargs(prompt, audience, model)), prompt.stats())
+
+
+async def call_openai_async(
+    prd_markdown: str, product_context: dict | None, audience: str | None, model: str | None = None
+) -> ReviewResponse:
+    prompt = _prompt(prd_markdown, product_context, model)
+    if settings.openai_parallel_criteria:
+        return await _call_parallel_async(prompt, audience, model)
+    return _parse_review(await _create_async(_completion_kwargs(prompt, audience, model)), prompt.stats())
+
+
+def call_openai_criteria(
+    excerpt: str, criteria: list[str], product_context: dict | None, audience: str | None
+) -> list[dict[str, Any]]:
+    prompt = _prompt(excerpt, product_context)
+    return _parse_criteria(_create(_criteria_kwargs(prompt, criteria, audience)), criteria)
+
+
+async def call_openai_criteria_async(
+    excerpt: str, criteria: list[str], product_context: dict | None, audience: str | None
+) -> list[dict[str, Any]]:
+    prompt = _prompt(excerpt, product_context)
+    return _parse_criteria(await _create_async(_criteria_kwargs(prompt, criteria, audience)), criteria)
+
 
-    ReviewResponse.model_validate(data)
-    return data
+async def stream_openai_async(
+    prd_markdown: str, product_context: dict | None, audience: str | None
+) -> AsyncIterator[tuple[str, Any]]:
+    """Stream a single-call review: ``("rubric", item)`` as each rubric item completes,
+    then ``("review", ReviewResponse)`` once the whole response has been validated."""
+    prompt = _prompt(prd_markdown, product_context)
+    parser = ArrayItemParser(("decision_trace", "scoring_rubric"))
+    # Covers the whole generation, including time spent handing events to the client.
+    with stage("openai_network", labels_for(False)):
+        stream = await get_async_client().chat.completions.create(**_stream_kwargs(prompt, audience))
+        async for chunk in stream:
+            _record_usage(chunk)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            for item in parser.feed(delta):
+                partial = _partial_rubric_item(item)
+                if partial is not None:
+                    yield "rubric", partial
+    yield "review", _parse_review(parser.text or None, prompt.stats())
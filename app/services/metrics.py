@@ -0,0 +1,266 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Hand-rolled rather than depending on ``prometheus_client``: a handful of
+counters and histograms is all the service needs, and recording must stay
+cheap enough to leave on for mock reviews.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+
+from app.core.settings import settings
+
+# Latency buckets from 50 µs (mock stages) up to a minute (slow LLM calls).
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Pending histogram observations folded into buckets per batch.
+_FOLD_BATCH = 4096
+
+# (name, type, help, [(labels, value), ...]) produced by collectors at scrape time.
+Family = tuple[str, str, str, list[tuple[dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Observations are appended to a queue (atomic, no lock) and folded into
+    buckets in batches or at scrape time, keeping ``observe`` to ~100 ns."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last slot is +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+        self._pending: deque[tuple[tuple[str, ...], float]] = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        self._pending.append((labels, value))
+        if len(self._pending) >= _FOLD_BATCH:
+            self._fold()
+
+    def _fold(self) -> None:
+        with self._lock:
+            pending = self._pending
+            for _ in range(len(pending)):
+                labels, value = pending.popleft()
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                series[0][bisect_left(self.buckets, value)] += 1
+                series[1] += value
+                series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        self._fold()
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        self._fold()
+        with self._lock:
+            items = sorted((labels, (list(s[0]), s[1], s[2])) for labels, s in self._series.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class Registry:
+    """Owns the metrics and the collectors that snapshot other components' stats."""
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], Iterable[Family]]) -> Callable[[], Iterable[Family]]:
+        """Register ``fn`` to be called on every scrape (usable as a decorator)."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REVIEWS = registry.counter(
+    "prd_reviews_total", "Reviews served, by outcome (computed, cache_hit, degraded, error)",
+    ("mode", "model", "outcome"),
+)
+REVIEW_SECONDS = registry.histogram(
+    "prd_review_duration_seconds", "End-to-end time of reviews that were computed", ("mode", "model")
+)
+STAGE_SECONDS = registry.histogram(
+    "prd_review_stage_duration_seconds", "Time spent in each review stage", ("stage", "mode", "model")
+)
+ERRORS = registry.counter(
+    "prd_review_errors_total", "Reviews that raised, by exception type", ("mode", "model", "error")
+)
+TOKENS = registry.counter(
+    "prd_llm_tokens_total", "Tokens reported by the OpenAI usage field", ("model", "kind")
+)
+CASCADE = registry.counter(
+    "prd_review_cascade_total", "Cascaded LLM reviews by the tier that produced them", ("tier", "escalated")
+)
+CASCADE_AVOIDED = registry.counter(
+    "prd_review_cascade_avoided_total",
+    "Estimated large-model cost avoided by the cascade (kind: tokens, seconds)",
+    ("kind",),
+)
+HTTP_SECONDS = registry.histogram(
+    "prd_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+
+# ── Stage timing ─────────────────────────────────────────────────────────────
+
+MOCK_LABELS = ("mock", "none")
+
+# (mode, model) of the review running in this context; set by the reviewer.
+review_labels: ContextVar[tuple[str, str]] = ContextVar("review_labels", default=("unknown", "none"))
+
+# When set, stages also append (name, seconds) here; used by the request profiler.
+stage_sink: ContextVar[list[tuple[str, float]] | None] = ContextVar("stage_sink", default=None)
+
+
+def labels_for(use_mock: bool) -> tuple[str, str]:
+    return MOCK_LABELS if use_mock else ("llm", settings.openai_model)
+
+
+class _Stage:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name: str, labels: tuple[str, str] | None) -> None:
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> _Stage:
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed = perf_counter() - self.started
+        sink = stage_sink.get()
+        if sink is not None:
+            sink.append((self.name, elapsed))
+        if settings.metrics_stage_timing:
+            mode, model = self.labels or review_labels.get()
+            STAGE_SECONDS.observe(elapsed, self.name, mode, model)
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoStage:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str, labels: tuple[str, str] | None = None) -> _Stage | _NoStage:
+    """Time a block into the stage histogram.
+
+    ``labels`` defaults to the current review's (mode, model); pass them
+    explicitly where the context may not carry over (worker threads).
+    """
+    if not settings.metrics_stage_timing and stage_sink.get() is None:
+        return _NO_STAGE
+    return _Stage(name, labels)
+
+
+def record_tokens(model: str, prompt_tokens: int | None, completion_tokens: int | None) -> None:
+    if prompt_tokens:
+        TOKENS.inc(model, "prompt", amount=prompt_tokens)
+    if completion_tokens:
+        TOKENS.inc(model, "completion", amount=completion_tokens)
@@ -0,0 +1,232 @@
+"""MinHash + LSH index over reviewed PRDs, for finding near-duplicates of a new one.
+
+Documents are reduced to a fixed-size MinHash signature over word shingles;
+two signatures agree in a fraction of positions that estimates the Jaccard
+similarity of the documents' shingle sets. Locality-sensitive banding turns
+lookup into a handful of dict probes, so a query costs the same whether the
+index holds ten documents or ten thousand.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    import numpy as np
+
+T = TypeVar("T")
+
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs above ~0.5 similarity share a band with high
+# probability; the exact threshold is applied to the candidates afterwards.
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+_PRIME = (1 << 31) - 1
+_CHUNK = 8192  # shingles hashed per numpy pass, bounding temporary memory
+_PRUNE_EVERY = 256
+_WORD = re.compile(r"\w+")
+
+_permutations: tuple[np.ndarray, np.ndarray] | None = None
+
+
+def _hash_params() -> tuple[np.ndarray, np.ndarray]:
+    # Fixed seed: signatures must agree across processes and with the index on disk.
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+
+        rng = np.random.default_rng(0x5EED)
+        a = rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+        b = rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+        _permutations = (a[:, None], b[:, None])
+    return _permutations
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (``NUM_PERM`` uint64 values) of the text's word shingles."""
+    import numpy as np
+
+    words = _WORD.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(1, len(words) - SHINGLE_WORDS + 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    a, b = _hash_params()
+    result = np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    for start in range(0, len(hashes), _CHUNK):
+        # a < 2**31 and crc32 < 2**32, so a * x + b cannot overflow uint64.
+        chunk = (a * hashes[None, start:start + _CHUNK] + b) % _PRIME
+        np.minimum(result, chunk.min(axis=1), out=result)
+    return result
+
+
+def similarity(left: np.ndarray, right: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    import numpy as np
+
+    return float(np.count_nonzero(left == right)) / NUM_PERM
+
+
+@dataclass
+class Match(Generic[T]):
+    review_id: str
+    similarity: float
+    payload: T
+
+
+@dataclass
+class _Entry(Generic[T]):
+    namespace: str
+    signature: np.ndarray
+    payload: T
+
+
+class NearDuplicateIndex(Generic[T]):
+    """Bounded LRU of signatures and payloads, with LSH buckets and an optional SQLite copy.
+
+    Only entries in the same ``namespace`` are compared, so reviews produced
+    under a different model, context or rubric are never matched. ``encode``
+    and ``decode`` turn payloads into text for the on-disk copy, which is
+    reloaded (newest ``max_entries`` rows) on startup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        encode: Callable[[T], str],
+        decode: Callable[[str], T],
+        path: str | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self._encode = encode
+        self._decode = decode
+        self._entries: OrderedDict[str, _Entry[T]] = OrderedDict()
+        self._buckets: dict[tuple[str, int, bytes], set[str]] = {}
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._writes = 0
+        self.lookups = 0
+        self.matches = 0
+        if path:
+            self._open_disk(path)
+
+    # ── Buckets ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _band_keys(namespace: str, sig: np.ndarray) -> list[tuple[str, int, bytes]]:
+        return [(namespace, band, sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+    def _insert(self, review_id: str, entry: _Entry[T]) -> None:
+        self._remove(review_id)
+        self._entries[review_id] = entry
+        for key in self._band_keys(entry.namespace, entry.signature):
+            self._buckets.setdefault(key, set()).add(review_id)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, review_id: str) -> None:
+        entry = self._entries.pop(review_id, None)
+        if entry is None:
+            return
+        for key in self._band_keys(entry.namespace, entry.signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(review_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    # ── Disk copy ────────────────────────────────────────────────────────────
+
+    def _open_disk(self, path: str) -> None:
+        import numpy as np
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS near_duplicates ("
+            "review_id TEXT PRIMARY KEY, namespace TEXT NOT NULL, signature BLOB NOT NULL, "
+            "payload TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        rows = self._db.execute(
+            "SELECT review_id, namespace, signature, payload FROM near_duplicates "
+            "ORDER BY created_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        for review_id, namespace, blob, payload in reversed(rows):
+            try:
+                entry = _Entry(namespace, np.frombuffer(blob, dtype=np.uint64).copy(), self._decode(payload))
+            except (ValueError, KeyError):
+                continue  # written by an incompatible version
+            self._insert(review_id, entry)
+
+    def _disk_add(self, review_id: str, entry: _Entry[T]) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO near_duplicates (review_id, namespace, signature, payload, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (review_id, entry.namespace, entry.signature.tobytes(), self._encode(entry.payload), time.time()),
+        )
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 0:
+            self._db.execute(
+                "DELETE FROM near_duplicates WHERE review_id NOT IN "
+                "(SELECT review_id FROM near_duplicates ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def add(self, review_id: str, namespace: str, sig: np.ndarray, payload: T) -> None:
+        if self.max_entries <= 0:
+            return
+        entry = _Entry(namespace, sig, payload)
+        with self._lock:
+            self._insert(review_id, entry)
+            self._disk_add(review_id, entry)
+
+    def query(self, namespace: str, sig: np.ndarray, threshold: float) -> Match[T] | None:
+        """The most similar entry at or above ``threshold``, if any."""
+        with self._lock:
+            self.lookups += 1
+            candidates: set[str] = set()
+            for key in self._band_keys(namespace, sig):
+                candidates |= self._buckets.get(key, set())
+            best: Match[T] | None = None
+            for review_id in candidates:
+                entry = self._entries[review_id]
+                score = similarity(sig, entry.signature)
+                if score >= threshold and (best is None or score > best.similarity):
+                    best = Match(review_id, score, entry.payload)
+            if best is not None:
+                self._entries.move_to_end(best.review_id)
+                self.matches += 1
+            return best
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM near_duplicates")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "lookups": self.lookups, "matches": self.matches}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,225 @@
+"""Offline review mode: many LLM reviews in one provider batch job instead of a call each.
+
+For corpora where latency does not matter (quarterly portfolio reviews) the
+OpenAI Batch API answers within ``OFFLINE_BATCH_COMPLETION_WINDOW`` at about
+half the token price and under its own, much larger rate limit. Requests wait
+in the job store as ``batched`` jobs, which workers never claim; each job's id
+(plus its prompt compaction stats) is its ``custom_id`` in the batch file, and
+its output line is parsed exactly like a synchronous response into a
+``succeeded`` job.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import IO, Any
+
+from app.core.settings import settings
+from app.models.schemas import ReviewJob, ReviewRequest, ReviewResponse
+from app.services.jobs import JobStore
+from app.services.llm_openai import _completion_kwargs, _parse_review, _prompt, get_client
+from app.services.reviewer import _should_use_mock
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT = "/v1/chat/completions"
+TERMINAL = frozenset({"completed", "failed", "expired", "cancelled"})
+
+_TAG = "batch:"
+# Claimed jobs carry this tag until the provider has returned a batch id.
+_PENDING = f"{_TAG}pending:"
+_STATS = ("original_tokens", "sent_tokens", "sections_dropped")
+
+
+@dataclass
+class BatchOutcome:
+    batch_id: str
+    status: str
+    succeeded: int = 0
+    errors: int = 0  # returned to the next batch, or failed once out of attempts
+
+
+def enqueue(store: JobStore, requests: Iterable[ReviewRequest]) -> list[tuple[ReviewJob, bool]]:
+    """Hold requests for the next batch; idempotent like ``POST /reviews``."""
+    held = []
+    for request in requests:
+        if _should_use_mock(request):
+            raise ValueError("Offline batches run the LLM path; set OPENAI_API_KEY and use mode 'auto'")
+        held.append(store.enqueue(request, status="batched"))
+    return held
+
+
+def _custom_id(job_id: str, stats: dict[str, int]) -> str:
+    # The provider echoes custom_id back with each result, so the compaction
+    # stats travel with it instead of being recomputed from the PRD.
+    return ":".join([job_id, *(str(stats[name]) for name in _STATS)])
+
+
+def _split_custom_id(custom_id: str) -> tuple[str, dict[str, int] | None]:
+    job_id, *values = custom_id.split(":")
+    try:
+        return job_id, dict(zip(_STATS, map(int, values), strict=True))
+    except ValueError:
+        return job_id, None
+
+
+def request_line(job_id: str, request: ReviewRequest) -> str:
+    """One batch input line: the same chat completion a synchronous review sends."""
+    prompt = _prompt(request.prd_markdown, request.product_context)
+    body = _completion_kwargs(prompt, request.audience)
+    line = {"custom_id": _custom_id(job_id, prompt.stats()), "method": "POST", "url": ENDPOINT, "body": body}
+    return json.dumps(line, separators=(",", ":"))
+
+
+def _write_input(claimed: list[tuple[str, ReviewRequest]], out: IO[bytes]) -> list[str]:
+    """Stream request lines to ``out`` up to ``OFFLINE_BATCH_MAX_BYTES``; returns the job ids written."""
+    written: list[str] = []
+    size = 0
+    for job_id, request in claimed:
+        line = (request_line(job_id, request) + "\n").encode()
+        if written and size + len(line) > settings.offline_batch_max_bytes:
+            break
+        out.write(line)
+        size += len(line)
+        written.append(job_id)
+    return written
+
+
+def submit(store: JobStore, limit: int | None = None) -> str | None:
+    """Upload held jobs as one batch job; returns its id, or None when nothing is held.
+
+    A batch holds at most ``limit`` (default ``OFFLINE_BATCH_MAX_REQUESTS``)
+    requests and ``OFFLINE_BATCH_MAX_BYTES`` of input; the rest stay held.
+    """
+    pending = f"{_PENDING}{uuid.uuid4().hex}"
+    claimed = store.claim_batch(pending, limit or settings.offline_batch_max_requests)
+    if not claimed:
+        return None
+    try:
+        with tempfile.TemporaryFile() as payload:
+            written = _write_input(claimed, payload)
+            store.release_batch_claims(job_id for job_id, _ in claimed[len(written):])
+            size = payload.tell()
+            payload.seek(0)
+            client = get_client()
+            upload = client.files.create(file=("reviews.jsonl", payload), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=upload.id,
+            endpoint=ENDPOINT,
+            completion_window=settings.offline_batch_completion_window,
+            metadata={"source": settings.app_name},
+        )
+    except Exception as exc:
+        error = f"Batch submission failed: {type(exc).__name__}: {exc}"
+        store.retry_batched({job_id: error for job_id, _ in claimed}, settings.jobs_max_attempts)
+        raise
+    store.retag_batch(pending, _TAG + batch.id)
+    logger.info("Submitted batch %s with %d reviews (%d bytes)", batch.id, len(written), size)
+    return batch.id
+
+
+def recover(store: JobStore) -> int:
+    """Release claims left by a submitter that died before the provider returned a batch id."""
+    released = store.release_stale_batch_claims(
+        _PENDING, time.time() - settings.offline_batch_claim_timeout_seconds
+    )
+    if released:
+        logger.warning("Released %d jobs from abandoned batch submissions", released)
+    return released
+
+
+def submit_all(store: JobStore, limit: int | None = None) -> list[str]:
+    recover(store)
+    batch_ids = []
+    while (batch_id := submit(store, limit)) is not None:
+        batch_ids.append(batch_id)
+    return batch_ids
+
+
+def open_batches(store: JobStore) -> list[str]:
+    # A pending tag is a submission in progress (or one that died before the
+    # provider answered, released by ``recover``); there is no batch id to poll.
+    return [tag.removeprefix(_TAG) for tag in store.batch_tags() if not tag.startswith(_PENDING)]
+
+
+# ── Results ──────────────────────────────────────────────────────────────────
+
+
+def _file_lines(file_id: str | None) -> list[dict[str, Any]]:
+    if not file_id:
+        return []
+    text = get_client().files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def parse_result(line: dict[str, Any]) -> ReviewResponse:
+    """Validate one output line like a synchronous response; raises on a per-request error."""
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        error = line.get("error") or (response.get("body") or {}).get("error") or {}
+        raise RuntimeError(error.get("message") or f"HTTP {response.get('status_code')}")
+    content = response["body"]["choices"][0]["message"]["content"]
+    return _parse_review(content, _split_custom_id(line["custom_id"])[1])
+
+
+def collect(store: JobStore, batch: Any) -> BatchOutcome:
+    """Store every result of a finished batch; requests without one go back to the next batch."""
+    jobs = store.batch_jobs(_TAG + batch.id)
+    outcome = BatchOutcome(batch.id, batch.status)
+    errors: dict[str, str] = {}
+    for line in _file_lines(batch.output_file_id) + _file_lines(batch.error_file_id):
+        job_id, _ = _split_custom_id(line.get("custom_id") or "")
+        if jobs.pop(job_id, None) is None:
+            continue  # collected by an earlier poll
+        try:
+            review = parse_result(line)
+        except Exception as exc:
+            errors[job_id] = f"{type(exc).__name__}: {exc}"
+        else:
+            store.complete(job_id, _TAG + batch.id, review)
+            outcome.succeeded += 1
+    # Expired, cancelled and failed batches leave some or all requests unanswered.
+    errors.update({job_id: f"Batch {batch.id} {batch.status} without a result" for job_id in jobs})
+    store.retry_batched(errors, settings.jobs_max_attempts)
+    outcome.errors = len(errors)
+    logger.info(
+        "Collected batch %s (%s): %d succeeded, %d errors", batch.id, batch.status, outcome.succeeded, outcome.errors
+    )
+    return outcome
+
+
+def poll(store: JobStore) -> list[BatchOutcome]:
+    """Check each open batch once and collect those that have finished."""
+    outcomes = []
+    for batch_id in open_batches(store):
+        batch = get_client().batches.retrieve(batch_id)
+        outcomes.append(collect(store, batch) if batch.status in TERMINAL else BatchOutcome(batch_id, batch.status))
+    return outcomes
+
+
+def run(
+    store: JobStore, interval: float | None = None, timeout: float | None = None, limit: int | None = None
+) -> list[BatchOutcome]:
+    """Submit held jobs and poll until every job has a result (or ``timeout`` passes).
+
+    Errors are resubmitted in a fresh batch until ``JOBS_MAX_ATTEMPTS`` is
+    used up. Returns the outcome of every batch collected along the way.
+    """
+    interval = settings.offline_batch_poll_seconds if interval is None else interval
+    deadline = None if timeout is None else time.monotonic() + timeout
+    collected: list[BatchOutcome] = []
+    while True:
+        submit_all(store, limit)
+        if not open_batches(store):
+            return collected
+        collected += [outcome for outcome in poll(store) if outcome.status in TERMINAL]
+        if deadline is not None and time.monotonic() >= deadline:
+            return collected
+        if open_batches(store):
+            time.sleep(interval)
@@ -0,0 +1,146 @@
+"""Per-request profiler for diagnosing slow reviews (enabled only with DEBUG)."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from time import perf_counter
+from types import FrameType
+from typing import Any, TypeVar
+
+from app.core.settings import settings
+from app.models.schemas import HotFunction, ProfileReport, ReviewRequest, ReviewResponse, StageTiming
+from app.services.metrics import labels_for, review_labels, stage_sink
+from app.services.reviewer import _request_digest, _run_review, _should_use_mock
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _frame_label(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def _builtin_label(fn: Any) -> str:
+    module = getattr(fn, "__module__", None) or "builtins"
+    return f"{module}:{getattr(fn, '__qualname__', repr(fn))}"
+
+
+class StackProfiler:
+    """Attributes self time to full call stacks via ``sys.setprofile``.
+
+    Deterministic rather than sampling, so even sub-millisecond mock reviews
+    yield a complete flame graph. Tracing inflates absolute times; compare
+    proportions. Only the calling thread is profiled.
+    """
+
+    def __init__(self) -> None:
+        self.self_time: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        self.calls: defaultdict[str, int] = defaultdict(int)
+        self._paths: list[tuple[str, ...]] = []
+        self._mark = 0.0
+
+    def _push(self, label: str) -> None:
+        parent = self._paths[-1] if self._paths else ()
+        self._paths.append((*parent, label))
+        self.calls[label] += 1
+
+    def _event(self, frame: FrameType, event: str, arg: Any) -> None:
+        now = perf_counter()
+        if self._paths:
+            self.self_time[self._paths[-1]] += now - self._mark
+        if event == "call":
+            self._push(_frame_label(frame))
+        elif event == "c_call":
+            self._push(_builtin_label(arg))
+        elif self._paths:  # return, c_return, c_exception
+            self._paths.pop()
+        # Exclude the profiler's own bookkeeping from the next interval.
+        self._mark = perf_counter()
+
+    def run(self, fn: Callable[[], T]) -> T:
+        self._mark = perf_counter()
+        sys.setprofile(self._event)
+        try:
+            return fn()
+        finally:
+            sys.setprofile(None)
+
+    def hot_functions(self, limit: int) -> list[HotFunction]:
+        own: defaultdict[str, float] = defaultdict(float)
+        cumulative: defaultdict[str, float] = defaultdict(float)
+        for path, seconds in self.self_time.items():
+            own[path[-1]] += seconds
+            for label in set(path):  # recursion counts once per stack
+                cumulative[label] += seconds
+        ranked = sorted(own, key=own.__getitem__, reverse=True)[:limit]
+        return [
+            HotFunction(
+                function=label,
+                calls=self.calls[label],
+                self_seconds=round(own[label], 6),
+                cumulative_seconds=round(cumulative[label], 6),
+            )
+            for label in ranked
+        ]
+
+    def collapsed(self) -> str:
+        """Folded stacks (``a;b;c <microseconds>``) for speedscope or flamegraph.pl."""
+        lines = [
+            f"{';'.join(path)} {round(seconds * 1e6)}"
+            for path, seconds in sorted(self.self_time.items())
+            if seconds >= 5e-7
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _stage_timings(samples: list[tuple[str, float]]) -> list[StageTiming]:
+    totals: dict[str, list[float]] = {}
+    for name, seconds in samples:
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    return [StageTiming(stage=name, seconds=round(total, 6), calls=int(calls)) for name, (total, calls) in totals.items()]
+
+
+def _dump(collapsed: str, request: ReviewRequest) -> str:
+    directory = settings.profile_dump_dir or "."
+    os.makedirs(directory, exist_ok=True)
+    name = f"review-{time.strftime('%Y%m%dT%H%M%S')}-{_request_digest(request)[:12]}.collapsed"
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(collapsed)
+    logger.info("Wrote review profile to %s", path)
+    return path
+
+
+def profile_review(request: ReviewRequest) -> tuple[ReviewResponse, ProfileReport, str]:
+    """Run one review under the profiler, bypassing the result cache so real work is measured.
+
+    Blocking: call it from a worker thread, not the event loop.
+    """
+    use_mock = _should_use_mock(request)
+    review_labels.set(labels_for(use_mock))
+    samples: list[tuple[str, float]] = []
+    token = stage_sink.set(samples)
+    profiler = StackProfiler()
+    started = perf_counter()
+    try:
+        review = profiler.run(lambda: _run_review(request, use_mock))
+    finally:
+        stage_sink.reset(token)
+    wall_seconds = perf_counter() - started
+
+    collapsed = profiler.collapsed()
+    report = ProfileReport(
+        wall_seconds=round(wall_seconds, 6),
+        stages=_stage_timings(samples),
+        hot_functions=profiler.hot_functions(settings.profile_top_functions),
+        collapsed_path=_dump(collapsed, request) if settings.profile_dump_dir else None,
+    )
+    return review, report, collapsed
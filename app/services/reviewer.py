@@ -1,19 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
 import math
 import re
-from typing import Any
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
 
 from app.core.settings import settings
 from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services.cache import ReviewCache
+from app.services.keywords import KeywordScanner
+from app.services.metrics import (
+    ERRORS,
+    REVIEW_SECONDS,
+    REVIEWS,
+    Family,
+    labels_for,
+    registry,
+    review_labels,
+    stage,
+)
+from app.services.scheduler import Overloaded, call_with_retries, llm_scheduler
+from app.services.sections import SectionHitCache, split_sections
+from app.services.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
 # ── Fixed rubric definition ──────────────────────────────────────────────────
 
+# Bump whenever rubric weights, notes or mock heuristics change so cached
+# reviews computed under the old rules are not served.
+RUBRIC_VERSION = 2
+
 RUBRIC: list[dict[str, Any]] = [
     {"criterion": "Problem Clarity", "weight": 20},
     {"criterion": "User Definition", "weight": 15},
@@ -50,6 +76,17 @@ _KW_ROLLOUT = re.compile(
 
 _PATTERNS = [_KW_PROBLEM, _KW_USER, _KW_SCOPE, _KW_METRICS, _KW_RISKS, _KW_SOLUTION, _KW_ROLLOUT]
 
+_SCANNER = KeywordScanner(_PATTERNS)
+
+
+def count_keyword_hits(text: str) -> list[int]:
+    """Per-criterion keyword hit counts, in ``RUBRIC`` order, from a single scan."""
+    return _SCANNER.count(text)
+
+
+# Keyword counts are additive over sections, so an edit only rescans what changed.
+section_hits = SectionHitCache(settings.section_cache_max_entries, count_keyword_hits)
+
 # ── VP-quality notes: (high_score_note, low_score_note) ─────────────────────
 
 _NOTES: dict[str, tuple[str, str]] = {
@@ -98,7 +135,7 @@ _NOTES: dict[str, tuple[str, str]] = {
 }
 
 
-def _stable_seed(request: ReviewRequest) -> int:
+def _request_digest(request: ReviewRequest) -> str:
     payload = json.dumps(
         {
             "prd_markdown": request.prd_markdown,
@@ -107,7 +144,11 @@ def _stable_seed(request: ReviewRequest) -> int:
         },
         sort_keys=True,
     )
-    return int(hashlib.sha256(payload.encode()).hexdigest(), 16)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _stable_seed(request: ReviewRequest) -> int:
+    return int(_request_digest(request), 16)
 
 
 def _pick(seed: int, options: list[str], count: int) -> list[str]:
@@ -121,8 +162,7 @@ def _pick(seed: int, options: list[str], count: int) -> list[str]:
     return result
 
 
-def _keyword_score(pattern: re.Pattern[str], text: str, weight: int, seed: int) -> int:
-    hits = len(pattern.findall(text))
+def _keyword_score(hits: int, weight: int, seed: int) -> int:
     if hits == 0:
         return min(3, weight)
     if hits <= 2:
@@ -135,16 +175,28 @@ def _keyword_score(pattern: re.Pattern[str], text: str, weight: int, seed: int)
     return min(base + jitter, weight)
 
 
+# Per-criterion jitter salts. Unlike hash(), which PYTHONHASHSEED randomizes per
+# process, these are identical in every worker, so mock scores depend only on
+# the input and cached results can be shared across processes and machines.
+_CRITERION_SALTS = {
+    entry["criterion"]: int.from_bytes(hashlib.sha256(entry["criterion"].encode()).digest()[:8], "big")
+    for entry in RUBRIC
+}
+
+
 def _score_rubric_mock(prd: str, seed: int) -> list[dict[str, Any]]:
+    with stage("keyword_scan"):
+        counts = section_hits.total(split_sections(prd))
     items: list[dict[str, Any]] = []
-    for rubric_entry, pattern in zip(RUBRIC, _PATTERNS):
-        criterion = rubric_entry["criterion"]
-        weight = rubric_entry["weight"]
-        subseed = (seed >> 3) ^ hash(criterion)
-        score = _keyword_score(pattern, prd, weight, subseed & 0xFFFFFFFF)
-        good_note, bad_note = _NOTES[criterion]
-        note = good_note if score > weight * 0.5 else bad_note
-        items.append({"criterion": criterion, "weight": weight, "score": score, "notes": note})
+    with stage("rubric"):
+        for rubric_entry, hits in zip(RUBRIC, counts):
+            criterion = rubric_entry["criterion"]
+            weight = rubric_entry["weight"]
+            subseed = (seed >> 3) ^ _CRITERION_SALTS[criterion]
+            score = _keyword_score(hits, weight, subseed & 0xFFFFFFFF)
+            good_note, bad_note = _NOTES[criterion]
+            note = good_note if score > weight * 0.5 else bad_note
+            items.append({"criterion": criterion, "weight": weight, "score": score, "notes": note})
     return items
 
 
@@ -222,11 +274,11 @@ def _compute_confidence(rubric_items: list[dict[str, Any]]) -> int:
 
 
 def _mock_review(request: ReviewRequest) -> dict[str, Any]:
-    seed = _stable_seed(request)
+    with stage("seed"):
+        seed = _stable_seed(request)
     prd = request.prd_markdown
 
     rubric_items = _score_rubric_mock(prd, seed)
-    overall_score = sum(item["score"] for item in rubric_items)
 
     strengths_pool = [
         "Clear problem statement",
@@ -238,9 +290,11 @@ def _mock_review(request: ReviewRequest) -> dict[str, Any]:
     ]
     strengths = _pick(seed, strengths_pool, 3)
 
-    impact_profile = _compute_impact_profile(rubric_items)
-    readiness_level = _compute_readiness_level(overall_score)
-    confidence = _compute_confidence(rubric_items)
+    with stage("impact_confidence"):
+        overall_score = sum(item["score"] for item in rubric_items)
+        impact_profile = _compute_impact_profile(rubric_items)
+        readiness_level = _compute_readiness_level(overall_score)
+        confidence = _compute_confidence(rubric_items)
 
     return {
         "overall_score": overall_score,
@@ -301,6 +355,113 @@ def _mock_review(request: ReviewRequest) -> dict[str, Any]:
     }
 
 
+# ── Bulk corpus scoring ──────────────────────────────────────────────────────
+
+_READINESS_LEVELS = ["Draft", "Pre-Discovery", "Validation Ready", "Build Ready", "Board Ready"]
+# Lowest overall_score of each level after Draft; see _compute_readiness_level.
+READINESS_THRESHOLDS = (25, 45, 65, 80)
+
+
+@dataclass
+class CorpusScores:
+    """Columnar mock scores for a corpus; row ``i`` matches ``_mock_review`` of document ``i``."""
+
+    criteria: list[str]
+    rubric_scores: np.ndarray  # (n_docs, n_criteria) int64, columns in ``criteria`` order
+    overall_scores: np.ndarray  # (n_docs,) int64
+    confidence: np.ndarray  # (n_docs,) int64
+    delivery_risk: np.ndarray  # (n_docs,) str
+    strategic_alignment: np.ndarray  # (n_docs,) str
+    measurement_maturity: np.ndarray  # (n_docs,) str
+    readiness_level: np.ndarray  # (n_docs,) str
+
+    def __len__(self) -> int:
+        return len(self.overall_scores)
+
+
+def _tri_level_array(values: np.ndarray, low_threshold: float, high_threshold: float) -> np.ndarray:
+    import numpy as np
+
+    return np.where(
+        values <= low_threshold, "low", np.where(values >= high_threshold, "high", "medium")
+    )
+
+
+def score_corpus(documents: Iterable[ReviewRequest | str]) -> CorpusScores:
+    """Mock-score many PRDs at once.
+
+    Hashing and keyword scanning stay per document; the rubric, impact,
+    confidence and readiness math runs vectorized across the corpus and
+    reproduces the per-document float operations in the same order, so the
+    results are identical to ``_mock_review``.
+    """
+    import numpy as np
+
+    low_seeds: list[int] = []
+    hit_rows: list[list[int]] = []
+    for document in documents:
+        request = ReviewRequest(prd_markdown=document) if isinstance(document, str) else document
+        low_seeds.append((_stable_seed(request) >> 3) & 0xFFFFFFFF)
+        hit_rows.append(count_keyword_hits(request.prd_markdown))
+
+    criteria = [entry["criterion"] for entry in RUBRIC]
+    n_criteria = len(criteria)
+    weights_list = [entry["weight"] for entry in RUBRIC]
+    weights = np.array(weights_list, dtype=np.int64)
+    hits = np.array(hit_rows, dtype=np.int64).reshape(-1, n_criteria)
+    n_docs = hits.shape[0]
+
+    # _keyword_score: tiered base from hit count plus a 0-2 jitter, capped at the weight.
+    salts = np.array([_CRITERION_SALTS[c] & 0xFFFFFFFF for c in criteria], dtype=np.uint64)
+    jitter = (np.array(low_seeds, dtype=np.uint64)[:, None] ^ salts[None, :]) % 3
+    base = np.select(
+        [hits <= 2, hits <= 5],
+        [
+            np.array([int(w * 0.4) for w in weights_list], dtype=np.int64),
+            np.array([int(w * 0.65) for w in weights_list], dtype=np.int64),
+        ],
+        default=np.array([int(w * 0.85) for w in weights_list], dtype=np.int64),
+    )
+    scored = np.minimum(base + jitter.astype(np.int64), weights)
+    rubric_scores = np.where(hits == 0, np.minimum(3, weights), scored)
+    overall_scores = rubric_scores.sum(axis=1)
+
+    # Accumulate column by column to keep the float summation order of sum().
+    ratios = rubric_scores / weights
+    total = np.zeros(n_docs)
+    for column in range(n_criteria):
+        total = total + ratios[:, column]
+    mean = total / n_criteria
+    squared = np.zeros(n_docs)
+    for column in range(n_criteria):
+        squared = squared + (ratios[:, column] - mean) ** 2
+    std_dev = np.sqrt(squared / n_criteria)
+    confidence = np.clip(np.rint(30 + mean * 60 - std_dev * 80).astype(np.int64), 0, 100)
+
+    column = {name: ratios[:, i] for i, name in enumerate(criteria)}
+    delivery_raw = 1.0 - (column["Scope Definition"] * 0.5 + column["Risks & Dependencies"] * 0.5)
+    alignment_raw = (
+        column["Problem Clarity"] * 0.4 + column["User Definition"] * 0.3 + column["Solution Coherence"] * 0.3
+    )
+    measurement_raw = column["Success Metrics"] * 0.6 + column["Rollout & Experimentation"] * 0.4
+    rollout_scores = rubric_scores[:, criteria.index("Rollout & Experimentation")]
+
+    readiness_index = np.searchsorted(np.array(READINESS_THRESHOLDS), overall_scores, side="right")
+
+    return CorpusScores(
+        criteria=criteria,
+        rubric_scores=rubric_scores,
+        overall_scores=overall_scores,
+        confidence=confidence,
+        delivery_risk=_tri_level_array(delivery_raw, 0.35, 0.65),
+        strategic_alignment=_tri_level_array(alignment_raw, 0.35, 0.6),
+        measurement_maturity=np.where(
+            rollout_scores < 5, "low", _tri_level_array(measurement_raw, 0.35, 0.6)
+        ),
+        readiness_level=np.array(_READINESS_LEVELS)[readiness_index],
+    )
+
+
 # ── Mode selection ───────────────────────────────────────────────────────────
 
 
@@ -314,14 +475,331 @@ def _should_use_mock(request: ReviewRequest) -> bool:
     return True
 
 
-def review_prd(request: ReviewRequest) -> ReviewResponse:
-    if _should_use_mock(request):
+# ── Result cache & request coalescing ───────────────────────────────────────
+
+review_cache = ReviewCache(
+    max_entries=settings.review_cache_max_entries,
+    ttl_seconds=settings.review_cache_ttl_seconds,
+    path=settings.review_cache_path,
+)
+
+# Concurrent identical requests share one in-flight review (and one LLM call).
+review_flights = SingleFlight()
+
+
+@registry.collector
+def _cache_metrics() -> Iterable[Family]:
+    cache = review_cache.stats()
+    yield "prd_review_cache_entries", "gauge", "Reviews held in the in-memory cache", [({}, cache["size"])]
+    yield (
+        "prd_review_cache_lookups_total",
+        "counter",
+        "Result cache lookups by result",
+        [({"result": result}, cache[field]) for result, field in (("hit", "hits"), ("disk_hit", "disk_hits"), ("miss", "misses"))],
+    )
+    yield "prd_review_cache_evictions_total", "counter", "LRU evictions", [({}, cache["evictions"])]
+    flights = review_flights.stats()
+    yield "prd_review_coalesced_total", "counter", "Requests that joined an in-flight identical review", [({}, flights["collapsed"])]
+
+
+def _cache_key(request: ReviewRequest, use_mock: bool) -> str:
+    mode = "mock" if use_mock else f"llm:{settings.openai_model}"
+    if not use_mock and settings.cascade_first_tier != "off":
+        from app.services.cascade import policy_key
+
+        mode = f"{mode}:{policy_key()}"
+    return f"{_request_digest(request)}:{mode}:v{RUBRIC_VERSION}"
+
+
+def _review_calls() -> int:
+    """Provider calls behind one full review: a narrative plus one per criterion in parallel mode."""
+    return 1 + len(RUBRIC) if settings.openai_parallel_criteria else 1
+
+
+def _estimated_tokens(request: ReviewRequest, calls: int | None = None) -> int:
+    # Providers count max_tokens against the per-minute token budget up front,
+    # and every parallel-criteria call resends the prompt.
+    calls = _review_calls() if calls is None else calls
+    prompt = len(request.prd_markdown) // 4
+    if settings.openai_prompt_token_budget > 0:
+        prompt = min(prompt, settings.openai_prompt_token_budget)
+    if calls == 1:
+        return prompt + settings.openai_max_tokens
+    return prompt * calls + settings.openai_narrative_max_tokens + settings.openai_criteria_max_tokens * (calls - 1)
+
+
+def _degraded_review(request: ReviewRequest, exc: Overloaded) -> ReviewResponse:
+    logger.warning("LLM path overloaded (%s); serving mock review", exc.reason)
+    data = _mock_review(request)
+    data["decision_trace"]["fallback"] = f"mock: {exc.reason}"
+    return ReviewResponse.model_validate(data)
+
+
+def _run_review(request: ReviewRequest, use_mock: bool) -> ReviewResponse:
+    if use_mock:
         logger.info("Using mock reviewer (no API key or mock mode requested)")
         data = _mock_review(request)
     else:
         logger.info("Using OpenAI reviewer (model=%s)", settings.openai_model)
-        from app.services.llm_openai import call_openai
+        from app.services import incremental
+        from app.services.llm_openai import call_openai, call_openai_criteria
+
+        state = incremental.prepare(request)
+        tokens, calls = _estimated_tokens(request), _review_calls()
+        if state.reuse is not None:
+            data = state.reuse
+        elif state.plan is not None:
+            plan = state.plan
+            items = call_with_retries(
+                lambda: call_openai_criteria(plan.excerpt, plan.criteria, request.product_context, request.audience),
+                _estimated_tokens(request, calls=1),
+            )
+            data = incremental.merge_rereview(plan, items)
+        elif settings.cascade_first_tier != "off":
+            from app.services import cascade
+
+            data = cascade.review(
+                request,
+                lambda: call_with_retries(
+                    lambda: call_openai(request.prd_markdown, request.product_context, request.audience),
+                    tokens,
+                    calls,
+                ),
+                lambda: call_with_retries(
+                    lambda: call_openai(
+                        request.prd_markdown, request.product_context, request.audience, model=settings.cascade_model
+                    ),
+                    tokens,
+                    calls,
+                ),
+            )
+        else:
+            data = call_with_retries(
+                lambda: call_openai(request.prd_markdown, request.product_context, request.audience),
+                tokens,
+                calls,
+            )
+        incremental.remember(state, data)
+
+    # Validates mock dicts; an already-validated ReviewResponse passes through untouched.
+    with stage("validate"):
+        return ReviewResponse.model_validate(data)
+
+
+async def _run_review_async(request: ReviewRequest, use_mock: bool) -> ReviewResponse:
+    if use_mock:
+        # Pure CPU and fast enough to run inline on the event loop.
+        return _run_review(request, use_mock)
+
+    logger.info("Using OpenAI reviewer (model=%s, async)", settings.openai_model)
+    from app.services import incremental
+    from app.services.llm_openai import call_openai_async, call_openai_criteria_async
+
+    state = incremental.prepare(request)
+    tokens, calls = _estimated_tokens(request), _review_calls()
+    if state.reuse is not None:
+        data = state.reuse
+    elif state.plan is not None:
+        plan = state.plan
+        items = await llm_scheduler.run(
+            lambda: call_openai_criteria_async(plan.excerpt, plan.criteria, request.product_context, request.audience),
+            _estimated_tokens(request, calls=1),
+        )
+        data = incremental.merge_rereview(plan, items)
+    elif settings.cascade_first_tier != "off":
+        from app.services import cascade
+
+        data = await cascade.review_async(
+            request,
+            lambda: llm_scheduler.run(
+                lambda: call_openai_async(request.prd_markdown, request.product_context, request.audience),
+                tokens,
+                requests=calls,
+            ),
+            lambda: llm_scheduler.run(
+                lambda: call_openai_async(
+                    request.prd_markdown, request.product_context, request.audience, model=settings.cascade_model
+                ),
+                tokens,
+                requests=calls,
+            ),
+        )
+    else:
+        data = await llm_scheduler.run(
+            lambda: call_openai_async(request.prd_markdown, request.product_context, request.audience),
+            tokens,
+            requests=calls,
+        )
+    incremental.remember(state, data)
+    return ReviewResponse.model_validate(data)
 
-        data = call_openai(request.prd_markdown, request.product_context, request.audience)
 
-    return ReviewResponse.model_validate(data)
+def _cached(key: str) -> ReviewResponse | None:
+    if not settings.review_cache_enabled:
+        return None
+    cached = review_cache.get(key)
+    if cached is not None:
+        logger.debug("Review cache hit (%s)", key)
+    return cached
+
+
+def _store(key: str, review: ReviewResponse) -> ReviewResponse:
+    if settings.review_cache_enabled:
+        review_cache.set(key, review)
+    return review
+
+
+def _record_error(labels: tuple[str, str], exc: BaseException) -> None:
+    REVIEWS.inc(*labels, "error")
+    ERRORS.inc(*labels, type(exc).__name__)
+
+
+def _record_computed(labels: tuple[str, str], started: float) -> None:
+    REVIEWS.inc(*labels, "computed")
+    if settings.metrics_stage_timing:
+        REVIEW_SECONDS.observe(perf_counter() - started, *labels)
+
+
+def _begin(request: ReviewRequest) -> tuple[bool, str, tuple[str, str], ReviewResponse | None]:
+    use_mock = _should_use_mock(request)
+    labels = labels_for(use_mock)
+    review_labels.set(labels)
+    key = _cache_key(request, use_mock)
+    cached = _cached(key)
+    if cached is not None:
+        REVIEWS.inc(*labels, "cache_hit")
+    return use_mock, key, labels, cached
+
+
+def review_prd(request: ReviewRequest) -> ReviewResponse:
+    use_mock, key, labels, cached = _begin(request)
+    if cached is not None:
+        return cached
+
+    def run() -> ReviewResponse:
+        started = perf_counter()
+        try:
+            review = _run_review(request, use_mock)
+        except Overloaded as exc:
+            if not settings.llm_degrade_to_mock:
+                _record_error(labels, exc)
+                raise
+            REVIEWS.inc(*labels, "degraded")
+            return _degraded_review(request, exc)
+        except Exception as exc:
+            _record_error(labels, exc)
+            raise
+        _record_computed(labels, started)
+        return _store(key, review)
+
+    return review_flights.do(key, run)
+
+
+async def review_prd_async(request: ReviewRequest) -> ReviewResponse:
+    use_mock, key, labels, cached = _begin(request)
+    if cached is not None:
+        return cached
+    return await _review_flight(request, use_mock, key, labels)
+
+
+async def _review_flight(request: ReviewRequest, use_mock: bool, key: str, labels: tuple[str, str]) -> ReviewResponse:
+    """Lead or join the single-flight review for ``key`` (after a cache miss)."""
+
+    async def run() -> ReviewResponse:
+        started = perf_counter()
+        try:
+            review = await _run_review_async(request, use_mock)
+        except Overloaded as exc:
+            if not settings.llm_degrade_to_mock:
+                _record_error(labels, exc)
+                raise
+            REVIEWS.inc(*labels, "degraded")
+            return _degraded_review(request, exc)  # not cached: the LLM may be back soon
+        except Exception as exc:
+            _record_error(labels, exc)
+            raise
+        _record_computed(labels, started)
+        return _store(key, review)
+
+    return await review_flights.do_async(key, run)
+
+
+async def review_prd_events(request: ReviewRequest) -> AsyncIterator[tuple[str, Any]]:
+    """Like :func:`review_prd_async`, but yields ``("rubric", item)`` events while a
+    single-call LLM review is generated, before the final ``("review", review)``.
+
+    Identical concurrent requests share one generation through ``review_flights``;
+    only the caller that leads it sees the rubric events.
+    """
+    if (
+        _should_use_mock(request)
+        or settings.openai_parallel_criteria
+        or settings.cascade_first_tier != "off"  # the first tier decides whether there is anything to stream
+    ):
+        yield "review", await review_prd_async(request)
+        return
+
+    use_mock, key, labels, cached = _begin(request)
+    if cached is not None:
+        yield "review", cached
+        return
+    if key in review_flights:
+        yield "review", await _review_flight(request, use_mock, key, labels)
+        return
+
+    from app.services import incremental
+    from app.services.llm_openai import stream_openai_async
+
+    state = incremental.prepare(request)
+    if state.reuse is not None or state.plan is not None:
+        # Partial re-reviews are small; nothing worth streaming.
+        yield "review", await _review_flight(request, use_mock, key, labels)
+        return
+
+    rubric: asyncio.Queue[Any] = asyncio.Queue()
+
+    async def run() -> ReviewResponse:
+        logger.info("Using OpenAI reviewer (model=%s, streaming)", settings.openai_model)
+        events = stream_openai_async(request.prd_markdown, request.product_context, request.audience)
+        started = perf_counter()
+        try:
+            async with llm_scheduler.slot(_estimated_tokens(request, calls=1)):
+                async for kind, value in events:
+                    if kind == "rubric":
+                        rubric.put_nowait(value)
+                    else:
+                        review = value
+        except Overloaded as exc:
+            # Only raised while waiting for a slot, before anything was streamed.
+            if not settings.llm_degrade_to_mock:
+                _record_error(labels, exc)
+                raise
+            REVIEWS.inc(*labels, "degraded")
+            return _degraded_review(request, exc)
+        except Exception as exc:
+            _record_error(labels, exc)
+            raise
+        _record_computed(labels, started)
+        review = _store(key, review)
+        incremental.remember(state, review)
+        return review
+
+    # Another request may have started the same review since the check above;
+    # then ``run`` never executes and only the final review arrives.
+    flight = asyncio.ensure_future(review_flights.do_async(key, run))
+    item: asyncio.Future[Any] | None = None
+    try:
+        while not flight.done() or not rubric.empty():
+            item = asyncio.ensure_future(rubric.get())
+            done, _ = await asyncio.wait({item, flight}, return_when=asyncio.FIRST_COMPLETED)
+            if item in done:
+                yield "rubric", item.result()
+            else:
+                item.cancel()
+        yield "review", flight.result()
+    finally:
+        # A client that goes away only leaves the flight; it keeps running for
+        # any other request that joined it.
+        flight.cancel()
+        if item is not None:
+            item.cancel()
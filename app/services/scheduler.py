@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, TypeVar
+
+from app.core.settings import settings
+from app.services.metrics import Family, registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+# Batch fan-out sets BATCH inside its tasks; everything else is interactive.
+current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+
+
+class Overloaded(Exception):
+    """The LLM path cannot take this request in time; callers shed or degrade."""
+
+    def __init__(self, reason: str, retry_after: float = 1.0) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+# ── Rate-limit budget ────────────────────────────────────────────────────────
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: str) -> float | None:
+    """Parse OpenAI reset durations such as ``"20ms"``, ``"1s"`` or ``"6m0s"``."""
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    # A malformed header must not fail the successful call that carried it.
+    try:
+        return int(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateBudget:
+    """Requests/tokens per minute, from configured limits and ``x-ratelimit-*`` headers."""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self._lock = threading.Lock()
+        self._window: deque[tuple[float, int]] = deque()
+        self._window_tokens = 0
+        self.remaining_requests: int | None = None
+        self.remaining_tokens: int | None = None
+        self._requests_reset_at = 0.0
+        self._tokens_reset_at = 0.0
+        self._paused_until = 0.0
+
+    def _trim(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - 60.0:
+            self._window_tokens -= self._window.popleft()[1]
+
+    def delay_for(self, tokens: int, requests: int = 1) -> float:
+        """Seconds to wait before ``requests`` calls costing ``tokens`` in total fit the budget."""
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            delay = self._paused_until - now
+            if self.remaining_requests is not None and self.remaining_requests < requests:
+                delay = max(delay, self._requests_reset_at - now)
+            if self.remaining_tokens is not None and self.remaining_tokens < tokens:
+                delay = max(delay, self._tokens_reset_at - now)
+            if self.rpm and len(self._window) + requests > self.rpm:
+                # Wait until enough of the oldest requests leave the window.
+                excess = min(len(self._window) + requests - self.rpm, len(self._window))
+                if excess:
+                    delay = max(delay, self._window[excess - 1][0] + 60.0 - now)
+            if self.tpm and self._window_tokens + tokens > self.tpm:
+                freed = self._window_tokens + tokens - self.tpm
+                for started, cost in self._window:
+                    freed -= cost
+                    if freed <= 0:
+                        delay = max(delay, started + 60.0 - now)
+                        break
+            return max(delay, 0.0)
+
+    def consume(self, tokens: int, requests: int = 1) -> None:
+        now = time.monotonic()
+        with self._lock:
+            # One window entry per request; the tokens ride on the first.
+            self._window.extend([(now, tokens)] + [(now, 0)] * (requests - 1))
+            self._window_tokens += tokens
+            if self.remaining_requests is not None:
+                self.remaining_requests -= requests
+            if self.remaining_tokens is not None:
+                self.remaining_tokens -= tokens
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if (remaining := _header_int(headers, "x-ratelimit-remaining-requests")) is not None:
+                self.remaining_requests = remaining
+                reset = parse_reset(headers.get("x-ratelimit-reset-requests", ""))
+                self._requests_reset_at = now + (reset or 0.0)
+            if (remaining := _header_int(headers, "x-ratelimit-remaining-tokens")) is not None:
+                self.remaining_tokens = remaining
+                reset = parse_reset(headers.get("x-ratelimit-reset-tokens", ""))
+                self._tokens_reset_at = now + (reset or 0.0)
+            rpm = _header_int(headers, "x-ratelimit-limit-requests")
+            if rpm is not None and not settings.openai_rpm_limit:
+                self.rpm = rpm
+            tpm = _header_int(headers, "x-ratelimit-limit-tokens")
+            if tpm is not None and not settings.openai_tpm_limit:
+                self.tpm = tpm
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                "rpm_limit": self.rpm,
+                "tpm_limit": self.tpm,
+                "requests_last_minute": len(self._window),
+                "tokens_last_minute": self._window_tokens,
+                "remaining_requests": self.remaining_requests,
+                "remaining_tokens": self.remaining_tokens,
+            }
+
+
+# ── Retry policy ─────────────────────────────────────────────────────────────
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+
+def _status(exc: BaseException) -> int | None:
+    return getattr(exc, "status_code", None)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    # Duck-typed so this module never imports openai.
+    return _status(exc) in _RETRYABLE_STATUS or type(exc).__name__ in _RETRYABLE_ERRORS
+
+
+def retry_after(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for name in ("retry-after-ms", "retry-after"):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        return seconds / 1000 if name == "retry-after-ms" else seconds
+    return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    cap = min(settings.llm_backoff_max_seconds, settings.llm_backoff_base_seconds * 2**attempt)
+    return random.uniform(0, cap)
+
+
+def _retry_delay(exc: BaseException, attempt: int) -> float:
+    hinted = retry_after(exc)
+    if hinted is None:
+        return backoff_delay(attempt)
+    return min(hinted, settings.llm_backoff_max_seconds)
+
+
+def call_with_retries(fn: Callable[[], T], tokens: int = 0, requests: int = 1) -> T:
+    """Blocking callers (CLI, threadpool) get the same retry policy and rate budget, without queueing."""
+    budget = llm_scheduler.budget
+    for attempt in itertools.count():
+        _, deadline = llm_scheduler._admission(None)
+        while (delay := budget.delay_for(tokens, requests)) > 0:
+            if time.monotonic() + delay > deadline:
+                raise Overloaded("OpenAI rate limit budget exhausted", retry_after=delay)
+            time.sleep(delay)
+        budget.consume(tokens, requests)
+        try:
+            return fn()
+        except Exception as exc:
+            if not is_retryable(exc) or attempt >= settings.llm_max_retries:
+                raise
+            delay = _retry_delay(exc, attempt)
+            if _status(exc) == 429:
+                budget.pause(delay)
+            logger.warning("OpenAI call failed (%s); retry %d in %.2fs", exc, attempt + 1, delay)
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+# ── Scheduler ────────────────────────────────────────────────────────────────
+
+
+class LLMScheduler:
+    """Priority admission queue with an AIMD concurrency limit and rate budget.
+
+    The limit halves on every 429 and grows by ``1/limit`` per success, so it
+    settles just under the provider's real capacity.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue_depth: int, budget: RateBudget) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue_depth = max_queue_depth
+        self.budget = budget
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._waits: deque[float] = deque(maxlen=1024)
+        self.admitted = 0
+        self.shed = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def queue_depth(self, priority: Priority | None = None) -> int:
+        return sum(
+            1
+            for p, _, future in self._waiters
+            if not future.done() and (priority is None or p == priority)
+        )
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    async def acquire(self, priority: Priority, tokens: int, deadline: float, requests: int = 1) -> None:
+        started = time.monotonic()
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+        else:
+            if self.queue_depth() >= self.max_queue_depth:
+                self.shed += 1
+                raise Overloaded("LLM queue is full")
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), future))
+            try:
+                await asyncio.wait_for(future, timeout=max(deadline - started, 0))
+            except (asyncio.CancelledError, asyncio.TimeoutError) as exc:
+                # _wake may have granted the slot just before the cancel landed.
+                if future.done() and not future.cancelled():
+                    self.release("error")
+                if isinstance(exc, asyncio.CancelledError):
+                    raise
+                self.timeouts += 1
+                raise Overloaded("LLM queue wait exceeded the deadline") from None
+
+        try:
+            while (delay := self.budget.delay_for(tokens, requests)) > 0:
+                if time.monotonic() + delay > deadline:
+                    self.timeouts += 1
+                    raise Overloaded("OpenAI rate limit budget exhausted", retry_after=delay)
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.release("error")
+            raise
+        self.budget.consume(tokens, requests)
+        self.admitted += 1
+        self._waits.append(time.monotonic() - started)
+
+    def release(self, outcome: str) -> None:
+        self.in_flight -= 1
+        if outcome == "rate_limited":
+            self.rate_limited += 1
+            self.limit = max(1.0, self.limit / 2)
+        elif outcome == "ok":
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int, priority: Priority | None = None) -> AsyncIterator[None]:
+        """Hold one admission slot (no retries), e.g. for a streamed completion."""
+        await self.acquire_for(tokens, priority)
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        except BaseException as exc:
+            if _status(exc) == 429:
+                outcome = "rate_limited"
+            raise
+        finally:
+            self.release(outcome)
+
+    def _admission(self, priority: Priority | None) -> tuple[Priority, float]:
+        priority = current_priority.get() if priority is None else priority
+        wait = (
+            settings.llm_queue_deadline_seconds
+            if priority == Priority.INTERACTIVE
+            else settings.llm_batch_queue_deadline_seconds
+        )
+        return priority, time.monotonic() + wait
+
+    async def acquire_for(self, tokens: int, priority: Priority | None = None, requests: int = 1) -> None:
+        priority, deadline = self._admission(priority)
+        await self.acquire(priority, tokens, deadline, requests)
+
+    async def run(
+        self, fn: Callable[[], Awaitable[T]], tokens: int, priority: Priority | None = None, requests: int = 1
+    ) -> T:
+        """Run ``fn`` under admission control, retrying transient failures with jittered backoff.
+
+        ``fn`` may fan out into ``requests`` provider calls; they share one
+        concurrency slot but each counts against the RPM budget.
+        """
+        for attempt in itertools.count():
+            await self.acquire_for(tokens, priority, requests)
+            try:
+                result = await fn()
+            except Exception as exc:
+                rate_limited = _status(exc) == 429
+                self.release("rate_limited" if rate_limited else "error")
+                if not is_retryable(exc) or attempt >= settings.llm_max_retries:
+                    raise
+                delay = _retry_delay(exc, attempt)
+                if rate_limited:
+                    self.budget.pause(delay)
+                self.retries += 1
+                logger.warning("OpenAI call failed (%s); retry %d in %.2fs", exc, attempt + 1, delay)
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self.release("error")
+                raise
+            self.release("ok")
+            return result
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict[str, Any]:
+        waits = sorted(self._waits)
+
+        def quantile(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))], 4) if waits else 0.0
+
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": {p.name.lower(): self.queue_depth(p) for p in Priority},
+            "queue_wait_seconds": {"p50": quantile(0.5), "p95": quantile(0.95), "max": quantile(1.0)},
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "budget": self.budget.stats(),
+        }
+
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.llm_max_concurrency,
+    max_queue_depth=settings.llm_max_queue_depth,
+    budget=RateBudget(rpm=settings.openai_rpm_limit, tpm=settings.openai_tpm_limit),
+)
+
+
+@registry.collector
+def _scheduler_metrics() -> Iterable[Family]:
+    stats = llm_scheduler.stats()
+    yield "prd_llm_concurrency_limit", "gauge", "Current adaptive LLM concurrency limit", [({}, stats["concurrency_limit"])]
+    yield "prd_llm_in_flight", "gauge", "LLM calls holding a slot", [({}, stats["in_flight"])]
+    yield (
+        "prd_llm_queue_depth",
+        "gauge",
+        "LLM calls waiting for a slot",
+        [({"priority": priority}, depth) for priority, depth in stats["queue_depth"].items()],
+    )
+    for field, help in (
+        ("admitted", "LLM calls admitted"),
+        ("shed", "LLM calls rejected because the queue was full"),
+        ("timeouts", "LLM calls that missed their queue deadline"),
+        ("retries", "LLM call retries"),
+        ("rate_limited", "LLM calls answered with 429"),
+    ):
+        yield f"prd_llm_{field}_total", "counter", help, [({}, stats[field])]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+# ATX headings; splitting right before a "#" that starts a line keeps keyword
+# counts additive, because no _KW_* alternative can match across "\n#".
+_HEADING = re.compile(r"^#{1,6}[ \t]", re.M)
+
+
+@dataclass(frozen=True)
+class Section:
+    heading: str
+    text: str
+    fingerprint: str
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def split_sections(markdown: str) -> list[Section]:
+    """Split Markdown into heading-delimited sections that concatenate back to ``markdown``."""
+    starts = [m.start() for m in _HEADING.finditer(markdown)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(markdown)]
+    sections = []
+    for start, end in zip(bounds, bounds[1:]):
+        text = markdown[start:end]
+        heading = text.split("\n", 1)[0].strip() if text.startswith("#") else ""
+        sections.append(Section(heading=heading, text=text, fingerprint=_fingerprint(text)))
+    return sections
+
+
+class SectionHitCache:
+    """LRU of per-section keyword hit counts keyed by section fingerprint."""
+
+    def __init__(self, max_entries: int, counter: Callable[[str], list[int]]) -> None:
+        self.max_entries = max_entries
+        self._counter = counter
+        self._entries: OrderedDict[str, list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def counts(self, section: Section) -> list[int]:
+        with self._lock:
+            cached = self._entries.get(section.fingerprint)
+            if cached is not None:
+                self._entries.move_to_end(section.fingerprint)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        counts = self._counter(section.text)
+        with self._lock:
+            self._entries[section.fingerprint] = counts
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return counts
+
+    def total(self, sections: list[Section]) -> list[int]:
+        """Whole-document counts, rescanning only sections not seen before."""
+        totals: list[int] = []
+        for section in sections:
+            counts = self.counts(section)
+            totals = [a + b for a, b in zip(totals, counts)] if totals else list(counts)
+        return totals
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future[Any]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls sharing a key into one execution.
+
+    Sync callers (threadpool routes) and async callers (event loop) are
+    tracked separately; each kind shares the same metrics.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[Any]] = {}
+        self._flights: dict[str, _Flight] = {}
+        self.executions = 0
+        self.collapsed = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.collapsed += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Like ``do``, but ``fn`` runs as its own task, so cancelling any one
+        caller (a client disconnect, an SLO timeout) never fails the others.
+        The task is cancelled only once every caller has gone away."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.collapsed += 1
+            else:
+                flight = self._flights[key] = _Flight(asyncio.ensure_future(fn()))
+                self.executions += 1
+                flight.task.add_done_callback(lambda task: self._landed(key, flight))
+            flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0 and not flight.task.done()
+            if abandoned:
+                flight.task.cancel()
+
+    def _landed(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark retrieved so an exception nobody waited for is not logged.
+            flight.task.exception()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls or key in self._flights
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._flights)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self.in_flight(),
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+        }
@@ -0,0 +1,107 @@
+"""Post-startup warmup: pays first-request costs before ``/ready`` reports the app as ready."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from time import perf_counter
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services.reviewer import _run_review
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PRD = """# Warmup PRD
+
+## Problem
+Users struggle to find past reviews; support tickets show the pain.
+
+## Success Metrics
+Reduce search time by 30% (KPI tracked weekly).
+
+## Risks
+Dependency on the search vendor; rollout behind a feature flag.
+"""
+
+
+class WarmupState:
+    """Progress of the startup warmup, as reported by ``/ready``."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.ready = False
+        self.seconds: float | None = None
+        self.steps: dict[str, float] = {}
+        self.error: str | None = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming",
+            "warmup_seconds": self.seconds,
+            "steps": dict(self.steps),
+            "error": self.error,
+        }
+
+
+warmup_state = WarmupState()
+
+
+def _llm_client() -> None:
+    # The import is the expensive part (~0.4 s); the client itself is cheap.
+    from app.services.llm_openai import get_async_client
+
+    get_async_client()
+
+
+def _synthetic_review() -> None:
+    # Bypasses the cache and metrics counters; exercises the scoring,
+    # keyword and section code paths plus response validation and encoding.
+    review = _run_review(ReviewRequest(prd_markdown=WARMUP_PRD, mode="mock"), use_mock=True)
+    ReviewResponse.model_validate_json(review.model_dump_json())
+
+
+async def _http_stack(app: FastAPI) -> None:
+    # One in-process round trip through middleware, routing, body parsing and
+    # serialization. This, not the review itself, is most of the first-request
+    # penalty. It is counted in /metrics like any other mock review.
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        response = await client.post("/review", json={"prd_markdown": WARMUP_PRD, "mode": "mock"})
+        response.raise_for_status()
+        (await client.get("/schema")).raise_for_status()
+
+
+async def _timed(name: str, step: Callable[[], Awaitable[object]]) -> None:
+    started = perf_counter()
+    await step()
+    warmup_state.steps[name] = round(perf_counter() - started, 6)
+
+
+async def run_warmup(app: FastAPI) -> None:
+    """Warm the process, then flip ``warmup_state.ready``.
+
+    A failed step is logged and recorded but still marks the app ready: a cold
+    first request is better than a replica that never joins the pool.
+    """
+    started = perf_counter()
+    try:
+        if settings.openai_api_key:
+            await _timed("llm_client", lambda: asyncio.to_thread(_llm_client))
+        await _timed("openapi", lambda: asyncio.to_thread(app.openapi))
+        await _timed("mock_review", lambda: asyncio.to_thread(_synthetic_review))
+        await _timed("http_stack", lambda: _http_stack(app))
+    except Exception as exc:
+        logger.exception("Warmup failed; serving cold")
+        warmup_state.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        warmup_state.seconds = round(perf_counter() - started, 6)
+        warmup_state.ready = True
+    logger.info("Warmup finished in %.3fs: %s", warmup_state.seconds, warmup_state.steps)
@@ -0,0 +1,336 @@
+"""Local stand-in for the OpenAI chat completions and Batch APIs, with configurable latency.
+
+Point the app at it with ``OPENAI_BASE_URL=http://127.0.0.1:8765/v1`` and any
+``OPENAI_API_KEY``. Answers are canned mock reviews, so only the transport,
+parsing and validation cost of the LLM path is exercised. Batches (``/v1/files``
+and ``/v1/batches``) finish ``--batch-delay`` seconds after they are created.
+
+Usage: python -m benchmarks.fake_openai [--port 8765] [--latency 0.2] [--jitter 0.05] [--batch-delay 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import email.parser
+import email.policy
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from app.models.schemas import ReviewRequest
+from app.services.llm_openai import CRITERIA_SYSTEM_PROMPT, NARRATIVE_SYSTEM_PROMPT
+from app.services.reviewer import _mock_review
+
+SAMPLE = Path(__file__).resolve().parent.parent / "examples" / "prd_sample.md"
+
+_REQUESTED = re.compile(r"^- (.+?) \(max \d+ pts\)$", re.M)
+
+
+def _canned_review() -> dict[str, Any]:
+    return _mock_review(ReviewRequest(prd_markdown=SAMPLE.read_text(encoding="utf-8")))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 drops connections under concurrent load
+
+
+class FakeOpenAI:
+    """Threaded HTTP server answering ``POST /v1/chat/completions``.
+
+    Usable as a context manager; ``base_url`` is what ``OPENAI_BASE_URL`` should be.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        batch_delay: float = 0.0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.batch_delay = batch_delay
+        # Terminal status for new batches; anything but "completed" returns no output.
+        self.batch_status = "completed"
+        # custom_ids answered with a 500 in the batch error file.
+        self.batch_failures: set[str] = set()
+        self.review = _canned_review()
+        self.requests = 0
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    # ── Responses ────────────────────────────────────────────────────────────
+
+    def answer(self, body: dict[str, Any]) -> str:
+        """The assistant message content for a chat completion request."""
+        messages = body.get("messages", [])
+        system = messages[0]["content"] if messages else ""
+        user = messages[-1]["content"] if messages else ""
+        rubric = self.review["decision_trace"]["scoring_rubric"]
+        if system == CRITERIA_SYSTEM_PROMPT:
+            wanted = set(_REQUESTED.findall(user.split("# Relevant PRD sections")[0]))
+            return json.dumps({"scoring_rubric": [item for item in rubric if item["criterion"] in wanted]})
+        if system == NARRATIVE_SYSTEM_PROMPT:
+            narrative = {key: value for key, value in self.review.items() if key != "decision_trace"}
+            narrative["assumptions"] = self.review["decision_trace"]["assumptions"]
+            return json.dumps(narrative)
+        # Rubric first, as the streaming prompt asks for.
+        return json.dumps({"decision_trace": self.review["decision_trace"], **self.review})
+
+    # ── Batches ──────────────────────────────────────────────────────────────
+
+    def _upload(self, content_type: str, data: bytes) -> dict[str, Any]:
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + data
+        )
+        fields = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+        content = fields["file"].get_payload(decode=True)
+        purpose = fields["purpose"].get_payload(decode=True).decode()
+        file_id = f"file-{uuid.uuid4().hex}"
+        with self._lock:
+            self.files[file_id] = content
+        return _file_object(file_id, content, fields["file"].get_filename() or "upload", purpose)
+
+    def _create_batch(self, body: dict[str, Any]) -> dict[str, Any]:
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex}",
+            "object": "batch",
+            "endpoint": body["endpoint"],
+            "input_file_id": body["input_file_id"],
+            "completion_window": body["completion_window"],
+            "status": "in_progress",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "metadata": body.get("metadata"),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            "_ready_at": time.monotonic() + self.batch_delay,
+        }
+        with self._lock:
+            self.batches[batch["id"]] = batch
+        return batch
+
+    def _finish(self, batch: dict[str, Any]) -> None:
+        """Answer every request line once the batch's delay has passed (called under the lock)."""
+        if batch["status"] != "in_progress" or time.monotonic() < batch["_ready_at"]:
+            return
+        lines = [json.loads(line) for line in self.files[batch["input_file_id"]].splitlines() if line.strip()]
+        output, errors = [], []
+        if self.batch_status == "completed":
+            for line in lines:
+                result = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": line["custom_id"], "error": None}
+                if line["custom_id"] in self.batch_failures:
+                    body = {"error": {"message": "The server had an error", "type": "server_error"}}
+                    errors.append({**result, "response": {"status_code": 500, "body": body}})
+                else:
+                    completion = _completion(line["body"], self.answer(line["body"]))
+                    output.append({**result, "response": {"status_code": 200, "body": completion}})
+        for key, rows in (("output_file_id", output), ("error_file_id", errors)):
+            if rows:
+                batch[key] = f"file-{uuid.uuid4().hex}"
+                self.files[batch[key]] = "".join(json.dumps(row) + "\n" for row in rows).encode()
+        batch["status"] = self.batch_status
+        batch["request_counts"] = {"total": len(lines), "completed": len(output), "failed": len(errors)}
+
+    def _batch(self, batch_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            batch = self.batches.get(batch_id)
+            if batch is not None:
+                self._finish(batch)
+        return batch
+
+    def _delay(self) -> None:
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; Nagle would add ~40 ms each.
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+            def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _not_found(self) -> None:
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def do_GET(self) -> None:
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if parts[-2:-1] == ["batches"]:
+                    batch = fake._batch(parts[-1])
+                    if batch is None:
+                        self._not_found()
+                    else:
+                        self._send_json(200, {k: v for k, v in batch.items() if not k.startswith("_")})
+                elif parts[-3:-2] == ["files"] and parts[-1] == "content" and parts[-2] in fake.files:
+                    data = fake.files[parts[-2]]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                else:
+                    self._not_found()
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                with fake._lock:
+                    fake.requests += 1
+                if self.path.endswith("/files"):
+                    self._send_json(200, fake._upload(self.headers["Content-Type"], raw))
+                    return
+                body = json.loads(raw or b"{}")
+                if self.path.endswith("/batches"):
+                    batch = fake._create_batch(body)
+                    self._send_json(200, {k: v for k, v in batch.items() if not k.startswith("_")})
+                    return
+                if not self.path.endswith("/chat/completions"):
+                    self._not_found()
+                    return
+                fake._delay()
+                content = fake.answer(body)
+                if body.get("stream"):
+                    self._stream(body, content)
+                else:
+                    self._send_json(200, _completion(body, content))
+
+            def _stream(self, body: dict[str, Any], content: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+                for start in range(0, len(content), 64):
+                    delta = {"content": content[start:start + 64]}
+                    self._chunk(_stream_chunk(body, chunk_id, delta, None))
+                self._chunk(_stream_chunk(body, chunk_id, {}, "stop"))
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    self._chunk({**_stream_chunk(body, chunk_id, {}, None), "choices": [], "usage": _usage(body, content)})
+                self._write(b"data: [DONE]\n\n")
+                self._write(b"")
+
+            def _chunk(self, payload: dict[str, Any]) -> None:
+                self._write(f"data: {json.dumps(payload)}\n\n".encode())
+
+            def _write(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        return Handler
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> FakeOpenAI:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeOpenAI:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def _usage(body: dict[str, Any], content: str) -> dict[str, int]:
+    prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _completion(body: dict[str, Any], content: str) -> dict[str, Any]:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": _usage(body, content),
+    }
+
+
+def _file_object(file_id: str, content: bytes, filename: str, purpose: str) -> dict[str, Any]:
+    return {
+        "id": file_id,
+        "object": "file",
+        "bytes": len(content),
+        "created_at": int(time.time()),
+        "filename": filename,
+        "purpose": purpose,
+        "status": "processed",
+    }
+
+
+def _stream_chunk(body: dict[str, Any], chunk_id: str, delta: dict[str, Any], finish: str | None) -> dict[str, Any]:
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter in seconds")
+    parser.add_argument("--batch-delay", type=float, default=5.0, help="Seconds until a batch completes")
+    args = parser.parse_args()
+
+    server = FakeOpenAI(args.host, args.port, args.latency, args.jitter, args.batch_delay)
+    print(f"Fake OpenAI listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
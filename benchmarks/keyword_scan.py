@@ -0,0 +1,55 @@
+"""Throughput of the single-pass keyword scanner versus per-pattern findall.
+
+Usage: python -m benchmarks.keyword_scan [--sizes 50,200,500] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from app.services.reviewer import _PATTERNS, count_keyword_hits
+
+SAMPLE = Path(__file__).resolve().parent.parent / "examples" / "prd_sample.md"
+
+
+def findall_counts(text: str) -> list[int]:
+    return [len(pattern.findall(text)) for pattern in _PATTERNS]
+
+
+def synthetic_prd(size_kb: int) -> str:
+    base = SAMPLE.read_text(encoding="utf-8")
+    appendix = "\n\n## Appendix\n\n" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+    unit = base + appendix
+    return (unit * (size_kb * 1024 // len(unit) + 1))[: size_kb * 1024]
+
+
+def throughput(fn: Callable[[str], list[int]], text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode()) / best / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="50,200,500", help="Comma-separated PRD sizes in KB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>8}  {'findall MB/s':>12}  {'scanner MB/s':>12}  {'speedup':>7}")
+    for size_kb in (int(s) for s in args.sizes.split(",")):
+        text = synthetic_prd(size_kb)
+        if findall_counts(text) != count_keyword_hits(text):
+            raise SystemExit(f"count mismatch at {size_kb} KB")
+        old = throughput(findall_counts, text, args.repeat)
+        new = throughput(count_keyword_hits, text, args.repeat)
+        print(f"{size_kb:>6}KB  {old:>12.2f}  {new:>12.2f}  {new / old:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
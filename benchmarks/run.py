@@ -0,0 +1,283 @@
+"""Review engine benchmark suite with machine-readable output and baseline regression checks.
+
+Usage:
+    python -m benchmarks.run                                   # every case, table on stdout
+    python -m benchmarks.run --cases mock_review,route_mock --sizes 1,100
+    python -m benchmarks.run --output results.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.3
+
+Exits with status 1 when any case's median is slower than the baseline by more
+than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services.reviewer import _mock_review, _score_rubric_mock, _stable_seed, section_hits
+from benchmarks.fake_openai import FakeOpenAI
+from benchmarks.keyword_scan import synthetic_prd
+
+CASES = ("stable_seed", "score_rubric_mock", "mock_review", "validate", "route_mock", "route_llm", "route_llm_concurrent")
+
+
+@dataclass
+class Result:
+    case: str
+    size_kb: int
+    iterations: int
+    min_s: float
+    p50_s: float
+    p95_s: float
+    mean_s: float
+    ops_per_s: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}@{self.size_kb}KB"
+
+
+def _summarize(case: str, size_kb: int, samples: list[float], ops_per_s: float | None = None) -> Result:
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    return Result(
+        case=case,
+        size_kb=size_kb,
+        iterations=len(ordered),
+        min_s=ordered[0],
+        p50_s=statistics.median(ordered),
+        p95_s=ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        mean_s=mean,
+        ops_per_s=ops_per_s if ops_per_s is not None else (1.0 / mean if mean else 0.0),
+    )
+
+
+def measure(
+    fn: Callable[[], object],
+    setup: Callable[[], object] | None,
+    min_time: float,
+    max_iterations: int,
+    min_iterations: int = 3,
+) -> list[float]:
+    """Per-iteration timings; ``setup`` runs untimed before each iteration."""
+    if setup:
+        setup()
+    fn()  # warm-up
+    samples: list[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_iterations and (len(samples) < min_iterations or time.perf_counter() < deadline):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+@contextmanager
+def _overrides(**values: Any) -> Iterator[None]:
+    previous = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+# ── Cases ────────────────────────────────────────────────────────────────────
+
+
+def _unit_cases(case: str, prd: str, size_kb: int, args: argparse.Namespace) -> Result:
+    request = ReviewRequest(prd_markdown=prd, mode="mock")
+    seed = _stable_seed(request)
+    # Cold section cache, so keyword scanning is measured rather than cache hits.
+    cold = section_hits.clear
+    fns: dict[str, tuple[Callable[[], object], Callable[[], object] | None]] = {
+        "stable_seed": (lambda: _stable_seed(request), None),
+        "score_rubric_mock": (lambda: _score_rubric_mock(prd, seed), cold),
+        "mock_review": (lambda: _mock_review(request), cold),
+        "validate": (lambda data=_mock_review(request): ReviewResponse.model_validate(data), None),
+    }
+    fn, setup = fns[case]
+    return _summarize(case, size_kb, measure(fn, setup, args.min_time, args.max_iterations))
+
+
+def _route_mock(client: TestClient, prd: str, size_kb: int, args: argparse.Namespace) -> Result:
+    payload = {"prd_markdown": prd, "mode": "mock"}
+
+    def call() -> None:
+        client.post("/review", json=payload).raise_for_status()
+
+    return _summarize("route_mock", size_kb, measure(call, section_hits.clear, args.min_time, args.max_iterations))
+
+
+def _route_llm(client: TestClient, prd: str, size_kb: int, args: argparse.Namespace) -> Result:
+    counter = iter(range(sys.maxsize))
+
+    def call() -> float:
+        # A unique suffix per request defeats single-flight coalescing.
+        payload = {"prd_markdown": f"{prd}\n\n<!-- {next(counter)} -->", "mode": "auto"}
+        started = time.perf_counter()
+        client.post("/review", json=payload).raise_for_status()
+        return time.perf_counter() - started
+
+    if args.case == "route_llm":
+        return _summarize("route_llm", size_kb, measure(call, None, args.min_time, args.llm_requests))
+
+    call()  # warm-up
+    with ThreadPoolExecutor(max_workers=args.llm_concurrency) as pool:
+        started = time.perf_counter()
+        samples = list(pool.map(lambda _: call(), range(args.llm_requests)))
+        wall = time.perf_counter() - started
+    return _summarize("route_llm_concurrent", size_kb, samples, ops_per_s=len(samples) / wall)
+
+
+def run_cases(args: argparse.Namespace) -> list[Result]:
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise SystemExit(f"Unknown cases: {', '.join(sorted(unknown))}")
+    sizes = [int(s) for s in args.sizes.split(",")]
+    documents = {size: synthetic_prd(size) for size in sizes}
+    results: list[Result] = []
+
+    with _overrides(review_cache_enabled=False, incremental_review_enabled=False):
+        for case in (c for c in cases if not c.startswith("route_")):
+            results.extend(_unit_cases(case, documents[size], size, args) for size in sizes)
+
+        if "route_mock" in cases:
+            with TestClient(app) as client:
+                results.extend(_route_mock(client, documents[size], size, args) for size in sizes)
+
+        llm_cases = [c for c in cases if c.startswith("route_llm")]
+        if llm_cases:
+            with FakeOpenAI(latency=args.llm_latency) as fake, _overrides(
+                openai_api_key="sk-benchmark", openai_base_url=fake.base_url, llm_degrade_to_mock=False
+            ):
+                from app.services.llm_openai import close_clients
+
+                asyncio.run(close_clients())  # rebuild clients against the fake server
+                with TestClient(app) as client:
+                    for case in llm_cases:
+                        args.case = case
+                        results.extend(_route_llm(client, documents[size], size, args) for size in sizes)
+    return results
+
+
+# ── Reporting ────────────────────────────────────────────────────────────────
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+def print_table(results: list[Result]) -> None:
+    print(f"{'case':<32} {'n':>5} {'p50':>10} {'p95':>10} {'ops/s':>10}", file=sys.stderr)
+    for r in results:
+        print(
+            f"{r.key:<32} {r.iterations:>5} {_format_seconds(r.p50_s):>10} "
+            f"{_format_seconds(r.p95_s):>10} {r.ops_per_s:>10.1f}",
+            file=sys.stderr,
+        )
+
+
+def report(results: list[Result], args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "llm_latency_s": args.llm_latency,
+            "llm_concurrency": args.llm_concurrency,
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+def regressions(results: list[Result], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Cases whose median is more than ``tolerance`` slower than the baseline median."""
+    previous = {f"{r['case']}@{r['size_kb']}KB": r for r in baseline.get("results", [])}
+    failures = []
+    for r in results:
+        base = previous.get(r.key)
+        if base is None:
+            continue
+        limit = base["p50_s"] * (1 + tolerance)
+        if r.p50_s > limit:
+            change = r.p50_s / base["p50_s"] - 1
+            failures.append(
+                f"{r.key}: p50 {_format_seconds(r.p50_s)} vs baseline {_format_seconds(base['p50_s'])} (+{change:.0%})"
+            )
+    return failures
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--sizes", default="1,10,100,1024", help="Comma-separated synthetic PRD sizes in KB")
+    parser.add_argument("--min-time", type=float, default=0.3, help="Minimum seconds spent timing each case")
+    parser.add_argument("--max-iterations", type=int, default=2000)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake OpenAI response latency (s)")
+    parser.add_argument("--llm-requests", type=int, default=32, help="Requests per LLM case")
+    parser.add_argument("--llm-concurrency", type=int, default=16)
+    parser.add_argument("-o", "--output", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="Fail if slower than this results file")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed p50 slowdown vs the baseline")
+    parser.add_argument("--save-baseline", help="Also write the results here as the new baseline")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.disable(logging.INFO)  # per-request log lines would dominate small cases
+    try:
+        results = run_cases(args)
+    finally:
+        logging.disable(logging.NOTSET)
+    print_table(results)
+
+    document = json.dumps(report(results, args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(document + "\n")
+    else:
+        print(document)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            handle.write(document + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            failures = regressions(results, json.load(handle), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
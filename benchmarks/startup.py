@@ -0,0 +1,143 @@
+"""Cold-start report: import-time breakdown and first-request latency, with budgets.
+
+Every measurement runs in a fresh interpreter, so nothing is already imported
+or warm.
+
+Usage:
+    python -m benchmarks.startup                       # table on stderr, JSON on stdout
+    python -m benchmarks.startup --top 30 -o startup.json
+    python -m benchmarks.startup --import-budget 1.5 --first-request-budget 0.05
+
+Exits with status 1 when a budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter; prints one JSON object.
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter() - started
+
+from fastapi.testclient import TestClient
+
+payload = {"prd_markdown": "# Cold start\\n\\nUsers struggle; KPI target 20%.", "mode": "mock"}
+with TestClient(app) as client:
+    started = time.perf_counter()
+    while client.get("/ready").status_code != 200:
+        time.sleep(0.002)
+    ready = time.perf_counter() - started
+    started = time.perf_counter()
+    client.post("/review", json=payload).raise_for_status()
+    first = time.perf_counter() - started
+    payload["prd_markdown"] += " Again."
+    started = time.perf_counter()
+    client.post("/review", json=payload).raise_for_status()
+    second = time.perf_counter() - started
+print(json.dumps({"import_s": imported, "ready_s": ready, "first_request_s": first, "second_request_s": second}))
+"""
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_s: float
+    cumulative_s: float
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True, timeout=120
+    )
+
+
+def import_times(module: str = "app.main") -> list[ImportTime]:
+    """Per-module import cost from ``python -X importtime``, slowest cumulative first."""
+    stderr = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append(ImportTime(name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+    return sorted(rows, key=lambda row: row.cumulative_s, reverse=True)
+
+
+def first_request() -> dict[str, float]:
+    """Import, warmup-to-ready and first/second ``POST /review`` latency in a fresh process."""
+    return json.loads(_run(["-c", _PROBE]).stdout.strip().splitlines()[-1])
+
+
+def report(module: str, top: int) -> dict[str, Any]:
+    rows = import_times(module)
+    top_level = [row for row in rows if row.module == module]
+    return {
+        "module": module,
+        "import_total_s": top_level[0].cumulative_s if top_level else None,
+        "slowest_imports": [asdict(row) for row in rows[:top]],
+        "slowest_self": [asdict(row) for row in sorted(rows, key=lambda row: row.self_s, reverse=True)[:top]],
+        "timings": first_request(),
+    }
+
+
+def over_budget(result: dict[str, Any], import_budget: float, first_request_budget: float) -> list[str]:
+    timings = result["timings"]
+    failures = []
+    if timings["import_s"] > import_budget:
+        failures.append(f"import {timings['import_s']:.3f}s > budget {import_budget:.3f}s")
+    if timings["first_request_s"] > first_request_budget:
+        failures.append(f"first request {timings['first_request_s']:.3f}s > budget {first_request_budget:.3f}s")
+    return failures
+
+
+def print_table(result: dict[str, Any]) -> None:
+    timings = result["timings"]
+    print(
+        f"import {timings['import_s'] * 1e3:.0f}ms, ready after {timings['ready_s'] * 1e3:.0f}ms, "
+        f"first request {timings['first_request_s'] * 1e3:.1f}ms, second {timings['second_request_s'] * 1e3:.1f}ms",
+        file=sys.stderr,
+    )
+    print(f"{'module':<48} {'cumulative':>10} {'self':>10}", file=sys.stderr)
+    for row in result["slowest_imports"]:
+        print(f"{row['module']:<48} {row['cumulative_s'] * 1e3:>8.1f}ms {row['self_s'] * 1e3:>8.1f}ms", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main", help="Module whose import is profiled")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--import-budget", type=float, default=2.0, help="Max seconds to import the app")
+    parser.add_argument("--first-request-budget", type=float, default=0.1, help="Max seconds for the first review")
+    parser.add_argument("-o", "--output", help="Write JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    result = report(args.module, args.top)
+    print_table(result)
+    document = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(document + "\n")
+    else:
+        print(document)
+
+    failures = over_budget(result, args.import_budget, args.first_request_budget)
+    for failure in failures:
+        print(f"OVER BUDGET {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
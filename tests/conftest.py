@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services import incremental, llm_openai
+from app.services.reviewer import _mock_review, review_cache
+
+
+def _reset_review_memory() -> None:
+    review_cache.clear()
+    incremental.document_memory.clear()
+    incremental.near_duplicate_index.clear()
+
+
+@pytest.fixture
+def llm_mode(monkeypatch):
+    """The LLM path (an API key is set) with empty caches and review memories."""
+    _reset_review_memory()
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    yield
+    _reset_review_memory()
+
+
+class FakeLLM:
+    """Stands in for the OpenAI calls: full reviews are mock reviews, criteria calls score ``criteria_score``.
+
+    ``calls`` logs ``("full", prd, model)`` and ``("criteria", excerpt, names)``;
+    ``small_error`` is raised by calls to any model other than ``OPENAI_MODEL``.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self.criteria_score = 1
+        self.small_error: Exception | None = None
+
+    @property
+    def kinds(self) -> list[str]:
+        return [call[0] for call in self.calls]
+
+    @property
+    def models(self) -> list[str | None]:
+        return [call[2] for call in self.calls if call[0] == "full"]
+
+    def full(self, prd, ctx, audience, model=None) -> ReviewResponse:
+        self.calls.append(("full", prd, model))
+        if model is not None and self.small_error is not None:
+            raise self.small_error
+        review = _mock_review(ReviewRequest(prd_markdown=prd))
+        review["summary"] = f"by {model or settings.openai_model}"
+        return ReviewResponse.model_validate(review)
+
+    def criteria(self, excerpt, names, ctx, audience) -> list[dict]:
+        self.calls.append(("criteria", excerpt, list(names)))
+        items = [{"criterion": c, "weight": 0, "score": self.criteria_score, "notes": "re-scored"} for c in names]
+        return llm_openai._parse_criteria(json.dumps({"scoring_rubric": items}), names)
+
+    async def full_async(self, prd, ctx, audience, model=None) -> ReviewResponse:
+        return self.full(prd, ctx, audience, model)
+
+    async def criteria_async(self, excerpt, names, ctx, audience) -> list[dict]:
+        return self.criteria(excerpt, names, ctx, audience)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch) -> FakeLLM:
+    fake = FakeLLM()
+    monkeypatch.setattr(llm_openai, "call_openai", fake.full)
+    monkeypatch.setattr(llm_openai, "call_openai_criteria", fake.criteria)
+    monkeypatch.setattr(llm_openai, "call_openai_async", fake.full_async)
+    monkeypatch.setattr(llm_openai, "call_openai_criteria_async", fake.criteria_async)
+    return fake
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services import llm_openai
+from app.services.reviewer import _mock_review, review_cache, review_prd_async
+from app.services.scheduler import llm_scheduler
+
+PRD = "# Async PRD\n\nUsers struggle with slow reviews; success metric is latency."
+
+
+class _FakeCompletions:
+    def __init__(self, content: str, delay: float = 0.0) -> None:
+        self.content = content
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _fake_client(delay: float = 0.0):
+    content = ReviewResponse.model_validate(_mock_review(ReviewRequest(prd_markdown=PRD))).model_dump_json()
+    completions = _FakeCompletions(content, delay)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions)), completions
+
+
+def test_lifespan_creates_and_closes_shared_async_client(monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    with TestClient(app):
+        client = llm_openai._async_client
+        assert client is not None
+        assert llm_openai.get_async_client() is client
+    assert llm_openai._async_client is None
+
+
+def test_review_route_uses_async_llm_path(monkeypatch):
+    review_cache.clear()
+    fake, completions = _fake_client()
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "get_async_client", lambda: fake)
+
+    def sync_call_openai(*args):
+        raise AssertionError("sync path used")
+
+    monkeypatch.setattr(llm_openai, "call_openai", sync_call_openai)
+
+    resp = TestClient(app).post("/review", json={"prd_markdown": PRD, "mode": "auto"})
+    assert resp.status_code == 200
+    ReviewResponse.model_validate(resp.json())
+    assert completions.calls == 1
+
+
+def test_async_reviews_run_concurrently(monkeypatch):
+    review_cache.clear()
+    fake, completions = _fake_client(delay=0.05)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "get_async_client", lambda: fake)
+
+    async def main():
+        requests = [ReviewRequest(prd_markdown=f"{PRD}\n\nVariant {i}", mode="auto") for i in range(100)]
+        return await asyncio.gather(*(review_prd_async(r) for r in requests))
+
+    reviews = asyncio.run(main())
+    assert len(reviews) == 100
+    assert completions.calls == 100
+    # Bounded only by the LLM scheduler's concurrency limit.
+    assert completions.peak_in_flight == min(100, llm_scheduler.max_concurrency)
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest
+from app.services import batch, llm_openai
+from app.services.reviewer import _mock_review, review_cache
+
+client = TestClient(app)
+
+PRD = "# Batch PRD {i}\n\nUsers struggle; KPI target and rollout plan with risk mitigation."
+
+
+def _item(i: int, mode: str = "mock") -> dict:
+    return {"prd_markdown": PRD.format(i=i), "mode": mode}
+
+
+def test_batch_returns_results_in_request_order():
+    items = [_item(i) for i in range(5)]
+    resp = client.post("/review/batch", json={"items": items})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [r["index"] for r in body["results"]] == list(range(5))
+    assert all(r["status"] == "ok" for r in body["results"])
+    single = client.post("/review", json=items[3]).json()
+    assert body["results"][3]["review"] == single
+
+
+def test_batch_dedupes_identical_inputs():
+    items = [_item(1), _item(2), _item(1), _item(1)]
+    body = client.post("/review/batch", json={"items": items}).json()
+    assert body["unique_items"] == 2
+    assert body["results"][0]["review"] == body["results"][2]["review"] == body["results"][3]["review"]
+
+
+def test_batch_rejects_empty_and_oversized(monkeypatch):
+    assert client.post("/review/batch", json={"items": []}).status_code == 422
+    monkeypatch.setattr(settings, "batch_max_items", 2)
+    resp = client.post("/review/batch", json={"items": [_item(i) for i in range(3)]})
+    assert resp.status_code == 413
+
+
+def test_batch_llm_failure_is_isolated_and_concurrency_bounded(monkeypatch):
+    review_cache.clear()
+    state = {"in_flight": 0, "peak": 0, "calls": 0}
+
+    async def fake_call_openai_async(prd_markdown, product_context, audience):
+        state["calls"] += 1
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        if "Batch PRD 3\n" in prd_markdown:
+            raise RuntimeError("upstream timeout")
+        return _mock_review(ReviewRequest(prd_markdown=prd_markdown))
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "batch_llm_concurrency", 3)
+    monkeypatch.setattr(llm_openai, "call_openai_async", fake_call_openai_async)
+
+    items = [_item(i, mode="auto") for i in range(10)] + [_item(0, mode="mock")]
+    body = client.post("/review/batch", json={"items": items}).json()
+    results = body["results"]
+
+    assert state["calls"] == 10
+    assert state["peak"] <= 3
+    assert results[3]["status"] == "error"
+    assert results[3]["review"] is None
+    assert "upstream timeout" in results[3]["error"]
+    assert all(r["status"] == "ok" for i, r in enumerate(results) if i != 3)
+
+
+def test_batch_cancelled_shared_review_fails_only_its_item(monkeypatch):
+    review_cache.clear()
+
+    async def fake_call_openai_async(prd_markdown, product_context, audience):
+        if "Batch PRD 1\n" in prd_markdown:
+            raise asyncio.CancelledError
+        return _mock_review(ReviewRequest(prd_markdown=prd_markdown))
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "call_openai_async", fake_call_openai_async)
+
+    results = client.post("/review/batch", json={"items": [_item(i, mode="auto") for i in range(3)]}).json()["results"]
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert results[1]["error"] == "CancelledError"
+
+
+def test_mock_batch_runs_off_the_event_loop(monkeypatch):
+    threads = set()
+    review = batch.review_prd
+
+    def tracking_review(request):
+        threads.add(threading.current_thread().name)
+        return review(request)
+
+    monkeypatch.setattr(batch, "review_prd", tracking_review)
+
+    async def main():
+        loop_thread = threading.current_thread().name
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(ticker())
+        reviewed = await batch.review_batch([ReviewRequest(**_item(i)) for i in range(200)])
+        task.cancel()
+        return loop_thread, ticks, reviewed
+
+    loop_thread, ticks, reviewed = asyncio.run(main())
+    assert len(reviewed.results) == 200
+    assert loop_thread not in threads
+    assert ticks >= 200 // batch._MOCK_CHUNK  # the loop kept running between chunks
+
+
+def test_llm_items_run_alongside_mock_chunks(monkeypatch):
+    review_cache.clear()
+    llm_started = threading.Event()
+    chunk = batch._review_mock_chunk
+
+    async def fake_call_openai_async(prd_markdown, product_context, audience):
+        llm_started.set()
+        return _mock_review(ReviewRequest(prd_markdown=prd_markdown))
+
+    def waiting_chunk(items):
+        # Old behaviour ran every mock chunk before scheduling any LLM item.
+        return chunk(items) if llm_started.wait(2) else []
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "call_openai_async", fake_call_openai_async)
+    monkeypatch.setattr(batch, "_review_mock_chunk", waiting_chunk)
+
+    requests = [ReviewRequest(**_item(i)) for i in range(3)] + [ReviewRequest(**_item(9, mode="auto"))]
+    reviewed = asyncio.run(batch.review_batch(requests))
+    assert [r.status for r in reviewed.results] == ["ok"] * 4
+
+
+def test_mock_batch_throughput():
+    items = [_item(i) for i in range(1000)]
+    start = time.perf_counter()
+    resp = client.post("/review/batch", json={"items": items})
+    elapsed = time.perf_counter() - start
+    assert resp.status_code == 200
+    assert len(resp.json()["results"]) == 1000
+    assert elapsed < 10.0
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest
+from app.services import llm_openai
+from app.services.reviewer import review_cache, review_prd
+from benchmarks.fake_openai import FakeOpenAI
+from benchmarks.run import main
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    with FakeOpenAI() as fake:
+        monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+        monkeypatch.setattr(settings, "openai_base_url", fake.base_url)
+        asyncio.run(llm_openai.close_clients())
+        review_cache.clear()
+        yield fake
+        asyncio.run(llm_openai.close_clients())
+        review_cache.clear()
+
+
+def test_fake_openai_serves_single_and_parallel_reviews(fake_openai, monkeypatch):
+    review = review_prd(ReviewRequest(prd_markdown="# Fake\n\nUsers struggle.", mode="auto"))
+    assert review.summary == fake_openai.review["summary"]
+    assert fake_openai.requests == 1
+
+    monkeypatch.setattr(settings, "openai_parallel_criteria", True)
+    parallel = review_prd(ReviewRequest(prd_markdown="# Fake\n\nUsers struggle more.", mode="auto"))
+    assert parallel.decision_trace.scoring_rubric == review.decision_trace.scoring_rubric
+    assert fake_openai.requests == 1 + 8  # narrative + one call per criterion
+
+
+def test_runner_writes_results_and_flags_regressions(tmp_path):
+    output = tmp_path / "results.json"
+    baseline = tmp_path / "baseline.json"
+    args = ["--cases", "stable_seed,route_mock", "--sizes", "1", "--min-time", "0", "--max-iterations", "5"]
+
+    assert main([*args, "-o", str(output), "--save-baseline", str(baseline)]) == 0
+    results = json.loads(output.read_text())["results"]
+    assert [(r["case"], r["size_kb"]) for r in results] == [("stable_seed", 1), ("route_mock", 1)]
+    assert all(r["iterations"] >= 3 and r["p50_s"] > 0 for r in results)
+    assert settings.review_cache_enabled  # overrides are restored
+
+    # An impossibly fast baseline must fail the run.
+    fast = json.loads(baseline.read_text())
+    for r in fast["results"]:
+        r["p50_s"] = 1e-9
+    baseline.write_text(json.dumps(fast))
+    assert main([*args, "-o", str(output), "--baseline", str(baseline)]) == 1
+
+
+def test_runner_llm_case_uses_fake_server(tmp_path):
+    output = tmp_path / "results.json"
+    api_key = settings.openai_api_key
+    code = main(
+        ["--cases", "route_llm", "--sizes", "1", "--min-time", "0", "--llm-requests", "3", "--llm-latency", "0", "-o", str(output)]
+    )
+    assert code == 0
+    (result,) = json.loads(output.read_text())["results"]
+    assert result["case"] == "route_llm" and result["iterations"] == 3
+    assert settings.openai_api_key == api_key
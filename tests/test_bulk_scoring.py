@@ -0,0 +1,51 @@
+import random
+from pathlib import Path
+
+from app.models.schemas import ReviewRequest
+from app.services.reviewer import _mock_review, score_corpus
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+VOCABULARY = (
+    "problem pain point user persona customer scope mvp phase milestone metric kpi baseline "
+    "target risk dependency mitigation compliance solution architecture api endpoint rollout "
+    "experiment a/b canary beta launch pilot feature flag lorem ipsum dolor the and of"
+).split()
+
+
+def _corpus(n: int) -> list[ReviewRequest]:
+    rng = random.Random(11)
+    docs = [
+        ReviewRequest(prd_markdown=" ".join(rng.choices(VOCABULARY, k=rng.randint(1, 300))))
+        for _ in range(n)
+    ]
+    docs.append(ReviewRequest(prd_markdown=(EXAMPLES / "prd_sample.md").read_text(encoding="utf-8")))
+    docs.append(
+        ReviewRequest(prd_markdown="# Idea", product_context={"stage": "seed"}, audience="board")
+    )
+    return docs
+
+
+def test_bulk_scores_match_per_document_path():
+    docs = _corpus(400)
+    scores = score_corpus(docs)
+    assert len(scores) == len(docs)
+
+    for i, request in enumerate(docs):
+        expected = _mock_review(request)
+        trace = expected["decision_trace"]
+        rubric = [item["score"] for item in trace["scoring_rubric"]]
+        assert scores.rubric_scores[i].tolist() == rubric
+        assert scores.overall_scores[i] == expected["overall_score"]
+        assert scores.confidence[i] == trace["confidence"]
+        assert scores.readiness_level[i] == trace["readiness_level"]
+        assert scores.delivery_risk[i] == trace["impact_profile"]["delivery_risk"]
+        assert scores.strategic_alignment[i] == trace["impact_profile"]["strategic_alignment"]
+        assert scores.measurement_maturity[i] == trace["impact_profile"]["measurement_maturity"]
+
+
+def test_bulk_accepts_plain_markdown_and_empty_corpus():
+    text = "# Plain\n\nUsers have a problem with metrics."
+    scores = score_corpus([text])
+    assert scores.overall_scores[0] == _mock_review(ReviewRequest(prd_markdown=text))["overall_score"]
+    assert len(score_corpus([])) == 0
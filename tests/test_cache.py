@@ -0,0 +1,203 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest
+from app.services import llm_openai, reviewer
+from app.services.cache import ReviewCache, SQLiteStore
+from app.services.reviewer import _cache_key, _mock_review, review_cache, review_prd
+
+SAMPLE_REQUEST = {
+    "prd_markdown": "# Cache Me\n\nA PRD about user metrics and rollout risk.",
+    "product_context": {"domain": "fintech"},
+    "audience": "engineering leadership",
+    "mode": "mock",
+}
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Reviews the same PRDs in a fresh interpreter and reports results + cache stats.
+_WORKER = """
+import json
+from app.models.schemas import ReviewRequest
+from app.services.reviewer import review_cache, review_prd
+reviews = [
+    review_prd(ReviewRequest(prd_markdown=f"# PRD {i}\\n\\nUsers struggle; KPI target and rollout plan.", mode="mock"))
+    for i in range(12)
+]
+print(json.dumps({"reviews": [r.model_dump() for r in reviews], "stats": review_cache.stats()}))
+"""
+
+
+def _worker(hash_seed: int, cache_path: str = "") -> subprocess.Popen:
+    env = {**os.environ, "PYTHONHASHSEED": str(hash_seed), "REVIEW_CACHE_PATH": cache_path, "OPENAI_API_KEY": ""}
+    return subprocess.Popen([sys.executable, "-c", _WORKER], cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+
+
+def _result(process: subprocess.Popen) -> dict:
+    stdout, _ = process.communicate(timeout=60)
+    assert process.returncode == 0
+    return json.loads(stdout)
+
+
+def _review(markdown: str = "# PRD\n\nSome problem for users."):
+    request = ReviewRequest(prd_markdown=markdown, mode="mock")
+    return review_prd(request)
+
+
+# ── ReviewCache unit tests ───────────────────────────────────────────────────
+
+
+def test_cache_lru_evicts_least_recently_used():
+    cache = ReviewCache(max_entries=2, ttl_seconds=None)
+    review = _review()
+    cache.set("a", review)
+    cache.set("b", review)
+    assert cache.get("a") is review
+    cache.set("c", review)
+    assert cache.get("b") is None
+    assert cache.get("a") is review
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_ttl_expires_entries(monkeypatch):
+    cache = ReviewCache(max_entries=8, ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr("app.services.cache.time.monotonic", lambda: now[0])
+    cache.set("a", _review())
+    assert cache.get("a") is not None
+    now[0] += 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["misses"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "reviews.sqlite3")
+    review = _review()
+    first = ReviewCache(max_entries=8, path=path)
+    first.set("a", review)
+    first.close()
+
+    second = ReviewCache(max_entries=8, path=path)
+    restored = second.get("a")
+    assert restored == review
+    assert second.stats()["disk_hits"] == 1
+    assert second.get("a") is restored
+    assert second.stats()["hits"] == 1
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    writer, reader = SQLiteStore(path), SQLiteStore(path)
+    writer.set("a", "{}", ttl_seconds=None)
+    assert reader.get("a") == "{}"
+    writer.set("b", "{}", ttl_seconds=-1)  # already expired
+    assert reader.get("b") is None
+    reader.delete("a")
+    assert writer.get("a") is None
+    writer.close()
+    reader.close()
+
+
+def test_slow_shared_store_does_not_block_memory_hits():
+    entered, release = threading.Event(), threading.Event()
+
+    class SlowStore:
+        def get(self, key):
+            entered.set()
+            release.wait(5)
+            return None
+
+        def set(self, key, value, ttl_seconds):
+            pass
+
+    cache = ReviewCache(max_entries=8, store=SlowStore())
+    review = _review()
+    cache.set("hot", review)
+    reader = threading.Thread(target=cache.get, args=("cold",))
+    reader.start()
+    assert entered.wait(5)
+    hits = []
+    try:
+        hot = threading.Thread(target=lambda: hits.append(cache.get("hot")))
+        hot.start()
+        hot.join(1)
+        assert hits == [review]  # served while the store read is in flight
+    finally:
+        release.set()
+        reader.join()
+    assert cache.stats()["misses"] == 1
+
+
+# ── Cross-process determinism and sharing ────────────────────────────────────
+
+
+def test_mock_scores_do_not_depend_on_hash_seed():
+    first, second = _result(_worker(1)), _result(_worker(2))
+    assert first["reviews"] == second["reviews"]
+    local = review_prd(
+        ReviewRequest(prd_markdown="# PRD 0\n\nUsers struggle; KPI target and rollout plan.", mode="mock")
+    )
+    assert first["reviews"][0] == local.model_dump()
+
+
+def test_shared_store_reuses_reviews_across_worker_processes(tmp_path):
+    path = str(tmp_path / "reviews.sqlite3")
+    origin = _result(_worker(1, path))
+    assert origin["stats"]["misses"] == 12 and origin["stats"]["disk_hits"] == 0
+
+    # Concurrent workers with different hash seeds reuse every stored review.
+    workers = [_result(process) for process in [_worker(seed, path) for seed in (2, 3, 4)]]
+    for worker in workers:
+        assert worker["reviews"] == origin["reviews"]
+        assert worker["stats"]["disk_hits"] == 12
+        assert worker["stats"]["misses"] == 0
+
+
+# ── review_prd integration ───────────────────────────────────────────────────
+
+
+def test_review_prd_serves_identical_resubmission_from_cache():
+    review_cache.clear()
+    request = ReviewRequest(**SAMPLE_REQUEST)
+    before = review_cache.stats()
+    first = review_prd(request)
+    second = review_prd(ReviewRequest(**copy.deepcopy(SAMPLE_REQUEST)))
+    after = review_cache.stats()
+    assert second is first
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"] + 1
+
+
+def test_cache_key_separates_mode_and_model(monkeypatch):
+    request = ReviewRequest(**SAMPLE_REQUEST)
+    mock_key = _cache_key(request, use_mock=True)
+    llm_key = _cache_key(request, use_mock=False)
+    monkeypatch.setattr(settings, "openai_model", "gpt-4o-mini")
+    assert _cache_key(request, use_mock=False) != llm_key
+    assert mock_key != llm_key
+    assert f"v{reviewer.RUBRIC_VERSION}" in mock_key
+
+
+def test_llm_resubmission_does_not_call_openai_twice(monkeypatch):
+    review_cache.clear()
+    calls = []
+
+    def fake_call_openai(prd_markdown, product_context, audience):
+        calls.append(prd_markdown)
+        return _mock_review(ReviewRequest(prd_markdown=prd_markdown))
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "call_openai", fake_call_openai)
+    payload = {**SAMPLE_REQUEST, "mode": "auto"}
+    review_prd(ReviewRequest(**payload))
+    review_prd(ReviewRequest(**payload))
+    assert len(calls) == 1
@@ -0,0 +1,118 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services import cascade
+from app.services.reviewer import _cache_key, _mock_review, review_prd
+from app.services.scheduler import Overloaded
+
+PRD = "# Cascade\n\n## Problem\nUsers struggle with onboarding.\n\n## Metrics\nKPI activation target 40%."
+
+
+@pytest.fixture(autouse=True)
+def _cascade(llm_mode, monkeypatch):
+    monkeypatch.setattr(settings, "cascade_first_tier", "mock")
+    monkeypatch.setattr(cascade, "large_latency", cascade.LatencyAverage())
+
+
+def _policy(monkeypatch, escalate: bool) -> None:
+    # A margin wider than any score-to-threshold distance forces escalation;
+    # zero margin and confidence floor accept every first-tier review.
+    monkeypatch.setattr(settings, "cascade_boundary_margin", 101 if escalate else 0)
+    monkeypatch.setattr(settings, "cascade_min_confidence", 0)
+
+
+def _review() -> ReviewResponse:
+    return review_prd(ReviewRequest(prd_markdown=PRD, mode="auto"))
+
+
+def test_escalation_reason_checks_boundaries_and_confidence(monkeypatch):
+    monkeypatch.setattr(settings, "cascade_boundary_margin", 5)
+    monkeypatch.setattr(settings, "cascade_min_confidence", 50)
+    review = ReviewResponse.model_validate(_mock_review(ReviewRequest(prd_markdown=PRD)))
+
+    def scored(score: int, confidence: int) -> ReviewResponse:
+        trace = review.decision_trace.model_copy(update={"confidence": confidence})
+        return review.model_copy(update={"overall_score": score, "decision_trace": trace})
+
+    assert "65 readiness threshold" in cascade.escalation_reason(scored(62, 90))
+    assert cascade.escalation_reason(scored(55, 90)) is None
+    assert cascade.escalation_reason(scored(55, 40)) == "confidence 40 is below 50"
+
+
+def test_mock_tier_answers_without_llm(monkeypatch, fake_llm):
+    _policy(monkeypatch, escalate=False)
+    review = _review()
+
+    assert fake_llm.models == []
+    info = review.decision_trace.cascade
+    assert (info.tier, info.model, info.escalated) == ("mock", "mock", False)
+    assert info.large_tokens_avoided > settings.openai_max_tokens
+    assert info.large_seconds_avoided is None  # no large-model latency observed yet
+
+
+def test_borderline_review_escalates_to_large_model(monkeypatch, fake_llm):
+    _policy(monkeypatch, escalate=True)
+    review = _review()
+
+    assert fake_llm.models == [None]
+    info = review.decision_trace.cascade
+    assert (info.tier, info.model, info.escalated) == ("large", settings.openai_model, True)
+    assert "readiness threshold" in info.reason
+    assert info.large_tokens_avoided == 0
+    assert cascade.large_latency.value is not None
+
+
+def test_small_model_tier_and_seconds_avoided(monkeypatch, fake_llm):
+    monkeypatch.setattr(settings, "cascade_first_tier", "model")
+    cascade.large_latency.observe(10.0)
+    _policy(monkeypatch, escalate=False)
+    review = _review()
+
+    assert fake_llm.models == [settings.cascade_model]
+    assert review.summary == f"by {settings.cascade_model}"
+    info = review.decision_trace.cascade
+    assert (info.tier, info.model) == ("small", settings.cascade_model)
+    assert 9.0 < info.large_seconds_avoided <= 10.0
+
+
+def test_failed_small_model_escalates(monkeypatch, fake_llm):
+    monkeypatch.setattr(settings, "cascade_first_tier", "model")
+    _policy(monkeypatch, escalate=False)
+    fake_llm.small_error = RuntimeError("small model down")
+    review = _review()
+
+    assert fake_llm.models == [settings.cascade_model, None]
+    assert review.decision_trace.cascade.reason == "first tier failed: RuntimeError"
+
+
+def test_overloaded_small_model_is_not_escalated(monkeypatch, fake_llm):
+    monkeypatch.setattr(settings, "cascade_first_tier", "model")
+    monkeypatch.setattr(settings, "llm_degrade_to_mock", False)
+    _policy(monkeypatch, escalate=False)
+    fake_llm.small_error = Overloaded("LLM queue is full")
+
+    with pytest.raises(Overloaded):
+        _review()
+    assert fake_llm.models == [settings.cascade_model]
+
+
+def test_cache_key_includes_cascade_policy(monkeypatch):
+    request = ReviewRequest(prd_markdown=PRD, mode="auto")
+    mock_tier = _cache_key(request, use_mock=False)
+    monkeypatch.setattr(settings, "cascade_first_tier", "off")
+    assert _cache_key(request, use_mock=False) != mock_tier
+    assert "cascade" not in _cache_key(request, use_mock=False)
+
+
+def test_async_route_reports_tier_and_metrics(monkeypatch):
+    _policy(monkeypatch, escalate=False)
+    client = TestClient(app)
+    body = client.post("/review", json={"prd_markdown": PRD + " Async.", "mode": "auto"}).json()
+
+    assert body["decision_trace"]["cascade"]["tier"] == "mock"
+    metrics = client.get("/metrics").text
+    assert 'prd_review_cascade_total{tier="mock",escalated="false"}' in metrics
+    assert 'prd_review_cascade_avoided_total{kind="tokens"}' in metrics
@@ -0,0 +1,52 @@
+import io
+import json
+
+from app.cli import main
+from app.models.schemas import ReviewRequest
+from app.services.reviewer import review_prd
+
+
+def _write_prds(directory, count):
+    for i in range(count):
+        (directory / f"prd_{i:02d}.md").write_text(f"# PRD {i}\n\nUsers struggle; KPI target {i}.")
+
+
+def test_score_directory_matches_http_path(tmp_path, capsys):
+    _write_prds(tmp_path, 12)
+    (tmp_path / "notes.txt").write_text("ignored")
+    output = tmp_path / "out.jsonl"
+
+    code = main(["score", str(tmp_path), "--workers", "2", "--chunk-size", "5", "-o", str(output)])
+
+    assert code == 0
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["id"] for row in rows] == [str(tmp_path / f"prd_{i:02d}.md") for i in range(12)]
+    expected = review_prd(ReviewRequest(prd_markdown="# PRD 3\n\nUsers struggle; KPI target 3.", mode="mock"))
+    assert rows[3]["review"] == expected.model_dump()
+    assert "scored 12 documents (0 errors)" in capsys.readouterr().err
+
+
+def test_score_glob_pattern(tmp_path):
+    _write_prds(tmp_path, 3)
+    output = tmp_path / "out.jsonl"
+    assert main(["score", str(tmp_path / "prd_0[12].md"), "--workers", "1", "-o", str(output)]) == 0
+    assert len(output.read_text().splitlines()) == 2
+
+
+def test_score_stdin_jsonl_reports_per_line_errors(monkeypatch, capsys):
+    lines = [
+        json.dumps({"id": "alpha", "prd_markdown": "# Alpha\n\nA metrics-driven rollout."}),
+        "{not json",
+        json.dumps({"prd_markdown": ""}),
+    ]
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(lines) + "\n"))
+
+    code = main(["score", "-", "--workers", "2"])
+
+    captured = capsys.readouterr()
+    rows = [json.loads(line) for line in captured.out.splitlines()]
+    assert code == 1
+    assert rows[0]["id"] == "alpha" and "review" in rows[0]
+    assert rows[1]["id"] == "stdin:2" and rows[1]["error"].startswith("JSONDecodeError")
+    assert rows[2]["id"] == "stdin:3" and rows[2]["error"].startswith("ValidationError")
+    assert "(2 errors)" in captured.err
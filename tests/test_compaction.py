@@ -0,0 +1,141 @@
+import json
+from types import SimpleNamespace
+
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services import llm_openai
+from app.services import compaction
+from app.services.compaction import (
+    compact_prd,
+    count_tokens,
+    drop_repeated_boilerplate,
+    select_sections,
+    strip_boilerplate,
+)
+from app.services.reviewer import _mock_review
+
+FOOTER = "Acme Corp — Confidential"
+
+NOISY_PRD = f"""# Checkout Revamp
+
+## Table of Contents
+- [Problem](#problem)
+- [Metrics](#metrics)
+
+## Problem
+Users struggle with checkout. ![funnel chart](data:image/png;base64,{"A" * 400})
+{FOOTER}
+
+## Metrics
+KPI conversion target 4%, baseline 3%.
+
+| Metric | Target |
+|--------|--------|
+| conversion | 4% |
+{FOOTER}
+
+## Appendix
+```python
+{chr(10).join(f"line_{i} = {i}" for i in range(100))}
+```
+{FOOTER}
+"""
+
+
+def test_strip_boilerplate_removes_noise_and_keeps_content():
+    text = strip_boilerplate(NOISY_PRD)
+    assert "base64" not in text.replace("[base64 omitted]", "")
+    assert "AAAA" not in text
+    assert "[image: funnel chart]" in text
+    assert "Table of Contents" not in text and "(#problem)" not in text
+    assert text.count(FOOTER) == 3  # repeats are only dropped when over budget
+    assert "|--------|--------|" in text
+    assert "line_39 = 39" in text and "line_40 = 40" not in text
+    assert "60 more lines omitted" in text
+    assert "Users struggle with checkout." in text and "baseline 3%" in text
+
+
+def test_repeated_boilerplate_is_dropped_but_content_is_kept():
+    story = "### User story\n- Given a cart, when I pay, then I see a receipt\n"
+    code = "```\nretry()\n```\n"
+    text = drop_repeated_boilerplate(f"# Spec\n{FOOTER}\n" + (story + code + "Page 2 of 9\n" + FOOTER + "\n") * 3)
+
+    assert text.count(FOOTER) == 1 and text.count("Page 2 of 9") == 1
+    assert text.count("### User story") == 1
+    assert text.count("- Given a cart") == 3  # repeated acceptance criteria stay
+    assert text.count("retry()") == 3  # and so does code
+
+
+def test_repeated_boilerplate_is_kept_under_budget(monkeypatch):
+    monkeypatch.setattr(settings, "openai_prompt_token_budget", 10_000)
+    assert compact_prd(NOISY_PRD, None).prd_markdown.count(FOOTER) == 3
+    monkeypatch.setattr(settings, "openai_prompt_token_budget", count_tokens(strip_boilerplate(NOISY_PRD)) - 5)
+    assert compact_prd(NOISY_PRD, None).prd_markdown.count(FOOTER) == 1
+
+
+def test_tokens_are_counted_for_the_called_model(monkeypatch):
+    models = []
+    monkeypatch.setattr(compaction, "_encoder", lambda model: models.append(model))
+    compact_prd("# PRD\n\nUsers struggle.", None, "gpt-4o-mini")
+    assert set(models) == {"gpt-4o-mini"}
+
+
+def test_budget_keeps_highest_signal_sections_in_order():
+    filler = "".join(f"## Filler {i}\n{'lorem ipsum dolor sit amet ' * 80}\n\n" for i in range(10))
+    markdown = (
+        "# Title\n\n## Problem\nUsers struggle; the problem is churn.\n\n"
+        + filler
+        + "## Metrics\nKPI retention target and baseline.\n"
+    )
+    text, dropped = select_sections(markdown, budget=200)
+    assert count_tokens(text) <= 200
+    assert dropped == 10
+    assert text.index("churn") < text.index("KPI retention")
+    assert "## Filler 3\n[section omitted for length]" in text
+
+
+def test_compact_prd_reports_savings(monkeypatch):
+    monkeypatch.setattr(settings, "openai_prompt_token_budget", 300)
+    context = {"domain": "fintech", "stage": "growth", "regions": ["EU", "US"]}
+    prd = NOISY_PRD + "".join(f"## Notes {i}\n{'background text ' * 100}\n" for i in range(5))
+
+    prompt = compact_prd(prd, context)
+    assert prompt.context_json == json.dumps(context, separators=(",", ":"))
+    assert prompt.sent_tokens <= 300 < prompt.original_tokens
+    assert prompt.sections_dropped > 0
+    assert "KPI conversion" in prompt.prd_markdown
+
+
+def test_small_prd_is_sent_unchanged_apart_from_whitespace():
+    prompt = compact_prd("# PRD\n\nUsers struggle.\n\n\n\nKPI target.", None)
+    assert prompt.prd_markdown == "# PRD\n\nUsers struggle.\n\nKPI target.\n"
+    assert prompt.sections_dropped == 0
+    assert prompt.context_json is None
+
+
+def test_call_openai_sends_compacted_prompt_and_traces_tokens(monkeypatch):
+    sent: dict = {}
+    content = ReviewResponse.model_validate(_mock_review(ReviewRequest(prd_markdown="# PRD"))).model_dump_json()
+
+    def create(**kwargs):
+        sent.update(kwargs)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_openai, "get_client", lambda: fake)
+
+    review = llm_openai.call_openai(NOISY_PRD, {"domain": "fintech"}, None)
+    user_prompt = sent["messages"][1]["content"]
+    assert "AAAA" not in user_prompt
+    assert '{"domain":"fintech"}' in user_prompt
+
+    stats = review.decision_trace.prompt_stats
+    assert stats is not None
+    assert stats.sent_tokens < stats.original_tokens
+    assert stats.sections_dropped == 0
+
+
+def test_mock_reviews_have_no_prompt_stats():
+    review = ReviewResponse.model_validate(_mock_review(ReviewRequest(prd_markdown="# PRD")))
+    assert review.decision_trace.prompt_stats is None
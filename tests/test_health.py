@@ -14,3 +14,14 @@ def test_health_returns_ok():
 def test_health_method_not_allowed():
     resp = client.post("/health")
     assert resp.status_code == 405
+
+
+def test_health_sends_etag_and_revalidates():
+    resp = client.get("/health")
+    etag = resp.headers["etag"]
+    assert resp.headers["cache-control"] == "no-cache"
+
+    revalidated = client.get("/health", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services import hedged, llm_openai
+from app.services.hedged import hedged_store
+from app.services.reviewer import _cache_key, _mock_review, review_cache
+
+PRD = "# Hedged PRD\n\nUsers struggle; KPI target and rollout plan."
+
+
+def _llm_review() -> ReviewResponse:
+    data = _mock_review(ReviewRequest(prd_markdown=PRD))
+    data["summary"] = "LLM summary"
+    return ReviewResponse.model_validate(data)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    review_cache.clear()
+    hedged_store.clear()
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    # Startup warmup would compete with the first timed request.
+    monkeypatch.setattr(settings, "warmup_enabled", False)
+    behaviour = {"delay": 0.05, "error": None}
+
+    async def fake_call_openai_async(prd_markdown, product_context, audience):
+        await asyncio.sleep(behaviour["delay"])
+        if behaviour["error"]:
+            raise behaviour["error"]
+        return _llm_review()
+
+    monkeypatch.setattr(llm_openai, "call_openai_async", fake_call_openai_async)
+    yield behaviour
+    review_cache.clear()
+
+
+def _poll(client: TestClient, review_id: str, timeout: float = 2.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(f"/review/hedged/{review_id}").json()
+        if body["status"] != "pending" or time.monotonic() > deadline:
+            return body
+        time.sleep(0.01)
+
+
+def test_hedged_returns_mock_at_once_then_upgrades(llm):
+    with TestClient(app) as client:
+        started = time.perf_counter()
+        first = client.post("/review/hedged", json={"prd_markdown": PRD}).json()
+        assert time.perf_counter() - started < llm["delay"]
+        assert first["status"] == "pending"
+        assert first["review"]["decision_trace"]["fallback"] == "mock: LLM review pending"
+
+        final = _poll(client, first["id"])
+        assert final["status"] == "upgraded"
+        assert final["review"]["summary"] == "LLM summary"
+        assert final["review"]["decision_trace"]["fallback"] is None
+
+
+def test_llm_failure_or_slo_breach_keeps_mock(llm, monkeypatch):
+    with TestClient(app) as client:
+        llm["error"] = RuntimeError("boom")
+        failed = _poll(client, client.post("/review/hedged", json={"prd_markdown": PRD}).json()["id"])
+        assert failed["status"] == "fallback"
+        assert failed["error"] == "RuntimeError: boom"
+        assert failed["review"]["decision_trace"]["fallback"] == "mock: LLM review failed"
+
+        llm["error"] = None
+        llm["delay"] = 1.0
+        monkeypatch.setattr(settings, "hedged_llm_slo_seconds", 0.05)
+        slow = _poll(client, client.post("/review/hedged", json={"prd_markdown": PRD + " v2"}).json()["id"])
+        assert slow["status"] == "fallback"
+        assert slow["review"]["decision_trace"]["fallback"] == "mock: LLM exceeded the latency SLO"
+
+        # The LLM review is not cancelled at the SLO; it finishes and is cached.
+        key = _cache_key(ReviewRequest(prd_markdown=PRD + " v2"), use_mock=False)
+        deadline = time.monotonic() + 3
+        while review_cache.get(key) is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert review_cache.get(key).summary == "LLM summary"
+
+
+def test_mock_mode_is_final_immediately():
+    hedged_store.clear()
+    with TestClient(app) as client:
+        body = client.post("/review/hedged", json={"prd_markdown": PRD, "mode": "mock"}).json()
+        assert body["status"] == "mock"
+        assert client.get(f"/review/hedged/{body['id']}").json() == body
+        assert client.get("/review/hedged/does-not-exist").status_code == 404
+
+
+def test_hedged_stream_emits_mock_then_upgrade(llm):
+    with TestClient(app) as client:
+        review_id = client.post("/review/hedged", json={"prd_markdown": PRD}).json()["id"]
+        resp = client.get(f"/review/hedged/{review_id}/stream")
+        events = [json.loads(line) for line in resp.text.splitlines() if line]
+        assert [e["event"] for e in events] == ["review", "review", "done"]
+        assert [e["data"]["status"] for e in events[:2]] == ["pending", "upgraded"]
+        assert events[-1]["data"] == {"status": "upgraded"}
+
+
+def test_review_slo_bounds_latency(llm, monkeypatch):
+    monkeypatch.setattr(settings, "review_response_slo_seconds", 0.02)
+    llm["delay"] = 0.5
+    with TestClient(app) as client:
+        started = time.perf_counter()
+        resp = client.post("/review", json={"prd_markdown": PRD})
+        assert time.perf_counter() - started < 0.4
+        assert resp.json()["decision_trace"]["fallback"] == "mock: LLM review pending"
+        assert _poll(client, resp.headers["x-review-id"])["status"] == "upgraded"
+
+        # Within the SLO the LLM review is returned directly.
+        llm["delay"] = 0.0
+        monkeypatch.setattr(settings, "review_response_slo_seconds", 1.0)
+        resp = client.post("/review", json={"prd_markdown": PRD + " fast"})
+        assert resp.json()["summary"] == "LLM summary"
+
+
+def test_hedged_mock_review_runs_off_the_event_loop(llm, monkeypatch):
+    threads = []
+    review = hedged.review_prd
+
+    def tracking_review(request):
+        threads.append(threading.current_thread())
+        return review(request)
+
+    monkeypatch.setattr(hedged, "review_prd", tracking_review)
+
+    async def main():
+        entry = await hedged.start_hedged_review(ReviewRequest(prd_markdown=PRD + " off-loop"))
+        await hedged.cancel_upgrades()
+        return entry
+
+    entry = asyncio.run(main())
+    assert entry.state.status == "pending"
+    assert threads and threading.main_thread() not in threads
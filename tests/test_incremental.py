@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+import pytest
+
+from app.models.schemas import ReviewRequest
+from app.services import incremental, llm_openai, reviewer
+from app.services.reviewer import _mock_review, count_keyword_hits, review_prd, review_prd_async
+from app.services.sections import SectionHitCache, split_sections
+
+PRD = (
+    "# Checkout Revamp\n\n"
+    "## Problem\nUsers struggle with a slow checkout flow.\n\n"
+    "## Metrics\nKPI conversion target 4%, baseline 3%.\n\n"
+    "## Rollout\nA/B experiment behind a feature flag.\n\n"
+    "## Notes\nOwned by the payments squad.\n"
+)
+
+
+pytestmark = pytest.mark.usefixtures("llm_mode")
+
+
+def _request(markdown: str, document_id: str | None = "doc-1") -> ReviewRequest:
+    return ReviewRequest(prd_markdown=markdown, mode="auto", document_id=document_id)
+
+
+# ── Sections ─────────────────────────────────────────────────────────────────
+
+
+def test_sections_roundtrip_and_counts_are_additive():
+    sections = split_sections("Preamble about users.\n" + PRD)
+    assert "".join(s.text for s in sections) == "Preamble about users.\n" + PRD
+    assert [s.heading for s in sections][:3] == ["", "# Checkout Revamp", "## Problem"]
+
+    per_section = [count_keyword_hits(s.text) for s in sections]
+    assert [sum(col) for col in zip(*per_section)] == count_keyword_hits("Preamble about users.\n" + PRD)
+
+
+def test_section_cache_rescans_only_edited_sections():
+    scanned: list[str] = []
+    cache = SectionHitCache(16, lambda text: scanned.append(text) or count_keyword_hits(text))
+    cache.total(split_sections(PRD))
+    scanned.clear()
+
+    edited = PRD.replace("squad.", "squad and a risk register.")
+    assert cache.total(split_sections(edited)) == count_keyword_hits(edited)
+    assert scanned == ["## Notes\nOwned by the payments squad and a risk register.\n"]
+
+
+def test_mock_scores_unchanged_by_section_cache():
+    request = ReviewRequest(prd_markdown=PRD, mode="mock")
+    reviewer.section_hits.clear()
+    first = _mock_review(request)
+    assert _mock_review(request) == first
+
+
+# ── Incremental LLM re-review ────────────────────────────────────────────────
+
+
+def test_edit_rescores_only_affected_criteria(fake_llm):
+    first = review_prd(_request(PRD))
+
+    edited = PRD.replace("A/B experiment", "canary pilot")
+    second = review_prd(_request(edited))
+
+    assert fake_llm.kinds == ["full", "criteria"]
+    _, excerpt, criteria = fake_llm.calls[1]
+    assert criteria == ["Rollout & Experimentation"]
+    assert "canary pilot" in excerpt
+    assert "KPI conversion" not in excerpt
+
+    rubric = {i.criterion: i for i in second.decision_trace.scoring_rubric}
+    assert rubric["Rollout & Experimentation"].score == 1
+    assert rubric["Rollout & Experimentation"].weight == 10
+    assert second.overall_score == sum(i.score for i in rubric.values())
+    assert second.decision_trace.impact_profile.measurement_maturity == "low"
+    assert rubric["Problem Clarity"] == first.decision_trace.scoring_rubric[0]
+
+
+def test_edit_without_rubric_keywords_reuses_prior_review(fake_llm):
+    first = review_prd(_request(PRD))
+    second = review_prd(_request(PRD.replace("payments squad", "checkout squad")))
+    assert fake_llm.kinds == ["full"]
+    assert second == first
+
+
+def test_large_edits_and_unknown_documents_get_full_review(fake_llm):
+    review_prd(_request(PRD, document_id=None))
+    review_prd(_request(PRD + "\n## Extra\nrisk\n", document_id=None))
+    assert fake_llm.kinds == ["full", "full"]
+
+    review_prd(_request(PRD + "\nDraft.\n"))  # not in the review cache yet
+    rewrite = "# New\nproblem user scope metric risk solution rollout\n"
+    review_prd(_request(rewrite))
+    assert fake_llm.kinds == ["full", "full", "full", "full"]
+
+
+def test_untracked_requests_skip_the_section_scan(fake_llm, monkeypatch):
+    scanned: list[str] = []
+    monkeypatch.setattr(incremental, "split_sections", lambda text: scanned.append(text) or split_sections(text))
+    review_prd(_request(PRD, document_id=None))
+    assert scanned == [] and fake_llm.kinds == ["full"]
+
+    tracked = PRD + "\nDraft.\n"
+    review_prd(_request(tracked))
+    assert scanned == [tracked]
+
+
+def test_parse_criteria_forces_weights_and_requires_every_criterion():
+    raw = json.dumps({"scoring_rubric": [{"criterion": "Success Metrics", "weight": 99, "score": 5, "notes": "n"}]})
+    assert llm_openai._parse_criteria(raw, ["Success Metrics"])[0]["weight"] == 15
+    with pytest.raises(RuntimeError, match="Risks & Dependencies"):
+        llm_openai._parse_criteria(raw, ["Success Metrics", "Risks & Dependencies"])
+
+
+def test_async_path_uses_criteria_call(fake_llm):
+    fake_llm.criteria_score = 2
+
+    async def run():
+        await review_prd_async(_request(PRD))
+        return await review_prd_async(_request(PRD.replace("KPI conversion", "KPI retention")))
+
+    review = asyncio.run(run())
+    assert fake_llm.kinds == ["full", "criteria"]
+    assert review.decision_trace.scoring_rubric[3].score == 2
@@ -0,0 +1,252 @@
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest
+from app.services import jobs
+from app.services.jobs import JobStore, JobWorkers, idempotency_key
+from app.services.reviewer import review_prd
+
+ROOT = Path(__file__).resolve().parents[1]
+PRD = "# Jobs PRD\n\nUsers struggle; KPI target and rollout plan."
+
+
+@pytest.fixture
+def job_db(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.sqlite3"
+    monkeypatch.setattr(settings, "jobs_db_path", str(path))
+    monkeypatch.setattr(settings, "jobs_poll_interval_seconds", 0.05)
+    jobs.close_job_store()
+    yield path
+    jobs.close_job_store()
+
+
+def _poll(client: TestClient, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(f"/reviews/{job_id}").json()
+        if body["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            return body
+        time.sleep(0.02)
+
+
+def test_enqueue_is_idempotent(job_db):
+    store = JobStore(str(job_db))
+    request = ReviewRequest(prd_markdown=PRD)
+    first, created = store.enqueue(request)
+    again, created_again = store.enqueue(request)
+
+    assert created and not created_again
+    assert again.id == first.id
+    assert first.idempotency_key == idempotency_key(request)
+    assert idempotency_key(ReviewRequest(prd_markdown=PRD + " More.")) != first.idempotency_key
+    store.close()
+
+
+def test_failed_jobs_are_retried_then_requeued_on_enqueue(job_db):
+    store = JobStore(str(job_db))
+    request = ReviewRequest(prd_markdown=PRD)
+    job, _ = store.enqueue(request)
+
+    for attempt in (1, 2):
+        job_id, claimed = store.claim("w", lease_seconds=60)
+        assert job_id == job.id and claimed == request
+        store.fail(job_id, "w", "boom", max_attempts=2)
+    assert store.claim("w", lease_seconds=60) is None
+    failed = store.get(job.id)
+    assert failed.status == "failed" and failed.attempts == 2 and failed.error == "boom"
+
+    requeued, created = store.enqueue(request)
+    assert not created and requeued.status == "queued" and requeued.attempts == 0
+    store.close()
+
+
+def test_expired_lease_is_reclaimed(job_db):
+    store = JobStore(str(job_db))
+    job, _ = store.enqueue(ReviewRequest(prd_markdown=PRD))
+    assert store.claim("crashed", lease_seconds=-1)[0] == job.id
+    assert store.claim("w", lease_seconds=60)[0] == job.id
+    assert store.get(job.id).attempts == 2
+    store.close()
+
+
+def test_stale_worker_cannot_overwrite_result(job_db):
+    store = JobStore(str(job_db))
+    request = ReviewRequest(prd_markdown=PRD)
+    job, _ = store.enqueue(request)
+    store.claim("stale", lease_seconds=-1)
+    store.claim("current", lease_seconds=60)
+    review = review_prd(request)
+
+    assert not store.complete(job.id, "stale", review)
+    assert not store.fail(job.id, "stale", "late error", max_attempts=3)
+    assert store.get(job.id).status == "running"
+    assert store.complete(job.id, "current", review)
+    assert store.get(job.id).status == "succeeded"
+    store.close()
+
+
+def test_expired_lease_on_final_attempt_fails_the_job(job_db):
+    store = JobStore(str(job_db))
+    job, _ = store.enqueue(ReviewRequest(prd_markdown=PRD))
+    for _ in range(2):
+        store.claim("crashed", lease_seconds=-1, max_attempts=2)
+
+    assert store.claim("w", lease_seconds=60, max_attempts=2) is None
+    failed = store.get(job.id)
+    assert (failed.status, failed.attempts) == ("failed", 2)
+    assert "Lease expired" in failed.error
+    store.close()
+
+
+def test_heartbeat_keeps_slow_review_leased(job_db, monkeypatch):
+    async def slow(request):
+        await asyncio.sleep(0.4)
+        return review_prd(request)
+
+    monkeypatch.setattr(jobs, "review_prd_async", slow)
+    monkeypatch.setattr(settings, "jobs_lease_seconds", 0.15)
+    store = JobStore(str(job_db))
+    job, _ = store.enqueue(ReviewRequest(prd_markdown=PRD))
+
+    async def main():
+        drain = asyncio.ensure_future(JobWorkers(store, 1).drain())
+        await asyncio.sleep(0.3)  # past the original lease
+        stolen = store.claim("thief", lease_seconds=60)
+        return stolen, await drain
+
+    stolen, processed = asyncio.run(main())
+    assert stolen is None and processed == 1
+    done = store.get(job.id)
+    assert (done.status, done.attempts) == ("succeeded", 1)
+    store.close()
+
+
+def test_startup_resumes_jobs_only_when_enabled(job_db, monkeypatch):
+    store = JobStore(str(job_db))
+    job, _ = store.enqueue(ReviewRequest(prd_markdown=PRD))
+    with TestClient(app):
+        time.sleep(0.2)
+        assert store.get(job.id).status == "queued"
+
+    monkeypatch.setattr(settings, "jobs_resume_on_startup", True)
+    with TestClient(app) as client:
+        assert _poll(client, job.id)["status"] == "succeeded"
+    store.close()
+
+
+def test_api_round_trip_with_inprocess_workers(job_db):
+    with TestClient(app) as client:
+        response = client.post("/reviews", json={"prd_markdown": PRD})
+        assert response.status_code == 202
+        job = response.json()
+        assert response.headers["location"] == f"/reviews/{job['id']}"
+
+        done = _poll(client, job["id"])
+        assert done["status"] == "succeeded"
+        assert done["review"] == review_prd(ReviewRequest(prd_markdown=PRD)).model_dump()
+
+        repeat = client.post("/reviews", json={"prd_markdown": PRD})
+        assert repeat.status_code == 200 and repeat.json()["id"] == job["id"]
+        assert client.get("/stats").json()["review_jobs"]["succeeded"] == 1
+        assert client.get("/reviews/nope").status_code == 404
+
+
+def test_idempotency_key_header_overrides_derived_key(job_db, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_inprocess_workers", 0)
+    with TestClient(app) as client:
+        first = client.post("/reviews", json={"prd_markdown": PRD}, headers={"Idempotency-Key": "a"})
+        other = client.post("/reviews", json={"prd_markdown": PRD}, headers={"Idempotency-Key": "b"})
+        assert first.json()["idempotency_key"] == "a"
+        assert other.status_code == 202 and other.json()["id"] != first.json()["id"]
+        assert first.json()["status"] == "queued"
+
+
+def test_list_pages_newest_first(job_db, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_inprocess_workers", 0)
+    with TestClient(app) as client:
+        ids = [client.post("/reviews", json={"prd_markdown": f"{PRD} {i}"}).json()["id"] for i in range(3)]
+
+        page = client.get("/reviews", params={"limit": 2}).json()
+        assert [job["id"] for job in page["jobs"]] == ids[::-1][:2]
+        rest = client.get("/reviews", params={"limit": 2, "before": page["next_before"]}).json()
+        assert [job["id"] for job in rest["jobs"]] == ids[:1]
+        assert rest["next_before"] is None
+        assert client.get("/reviews", params={"status": "succeeded"}).json()["jobs"] == []
+
+
+def test_list_pages_jobs_created_in_the_same_instant(job_db, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_inprocess_workers", 0)
+    monkeypatch.setattr(jobs.time, "time", lambda: 1_700_000_000.5)
+    with TestClient(app) as client:
+        ids = {client.post("/reviews", json={"prd_markdown": f"{PRD} {i}"}).json()["id"] for i in range(5)}
+
+        seen, before = [], None
+        while True:
+            params = {"limit": 2} if before is None else {"limit": 2, "before": before}
+            page = client.get("/reviews", params=params).json()
+            seen += [job["id"] for job in page["jobs"]]
+            if (before := page["next_before"]) is None:
+                break
+        assert sorted(seen) == sorted(ids) and len(seen) == 5
+        assert client.get("/reviews", params={"before": "yesterday"}).status_code == 422
+
+
+def test_workers_mark_failures(job_db, monkeypatch):
+    async def broken(request):
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(jobs, "review_prd_async", broken)
+    monkeypatch.setattr(settings, "jobs_max_attempts", 1)
+    store = JobStore(str(job_db))
+    job, _ = store.enqueue(ReviewRequest(prd_markdown=PRD))
+
+    assert asyncio.run(JobWorkers(store, 1).drain()) == 1
+    failed = store.get(job.id)
+    assert failed.status == "failed" and failed.error == "RuntimeError: LLM down"
+    store.close()
+
+
+def test_degraded_reviews_are_retried_not_stored(job_db, monkeypatch):
+    async def degraded(request):
+        review = review_prd(request)
+        trace = review.decision_trace.model_copy(update={"fallback": "mock: LLM queue wait exceeded the deadline"})
+        return review.model_copy(update={"decision_trace": trace})
+
+    monkeypatch.setattr(jobs, "review_prd_async", degraded)
+    monkeypatch.setattr(settings, "jobs_max_attempts", 2)
+    store = JobStore(str(job_db))
+    job, _ = store.enqueue(ReviewRequest(prd_markdown=PRD))
+
+    assert asyncio.run(JobWorkers(store, 1).drain()) == 2
+    failed = store.get(job.id)
+    assert (failed.status, failed.attempts, failed.review) == ("failed", 2, None)
+    assert failed.error == "Degraded review: mock: LLM queue wait exceeded the deadline"
+    _, created = store.enqueue(ReviewRequest(prd_markdown=PRD))
+    assert store.get(job.id).status == "queued" and not created
+    store.close()
+
+
+def test_separate_worker_process_drains_queue(job_db):
+    store = JobStore(str(job_db))
+    queued = [store.enqueue(ReviewRequest(prd_markdown=f"{PRD} {i}"))[0] for i in range(3)]
+
+    result = subprocess.run(
+        [sys.executable, "-m", "app.cli", "worker", "--db", str(job_db), "--once", "--concurrency", "2"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "processed 3 jobs" in result.stderr
+    assert all(store.get(job.id).status == "succeeded" for job in queued)
+    store.close()
@@ -0,0 +1,58 @@
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from app.services.keywords import KeywordScanner, fold_case
+from app.services.reviewer import _PATTERNS, count_keyword_hits
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+FRAGMENTS = [
+    "problem", "PAIN  POINT", "pain\npoint", "end-user", "EndUser", "end user", "out of scope",
+    "out-of-scope", "in scope", "phased", "Phase", "a/b", "A/B", "feature flag", "feature_flag",
+    "north  star", "success criteria", "KPI", "api", "capital", "ſcope", "İssue", "ıssue",
+    "KPI", "depends", "mitigation", "risk", "ROLLOUT", "—", "“quoted”", "x", "\n", "#",
+]
+
+
+def _findall_counts(text: str) -> list[int]:
+    return [len(pattern.findall(text)) for pattern in _PATTERNS]
+
+
+def test_scanner_matches_findall_on_examples():
+    for path in EXAMPLES.glob("*"):
+        text = path.read_text(encoding="utf-8")
+        assert count_keyword_hits(text) == _findall_counts(text), path.name
+
+
+def test_scanner_matches_findall_on_random_text():
+    rng = random.Random(7)
+    separators = ["", " ", "\n", "-", ".", "  "]
+    for _ in range(2000):
+        text = "".join(
+            rng.choice(FRAGMENTS) + rng.choice(separators) for _ in range(rng.randint(0, 40))
+        )
+        assert count_keyword_hits(text) == _findall_counts(text), text
+
+
+def test_fold_case_matches_ignorecase_semantics():
+    assert fold_case("İSSUE ſcope ıd KPI") == "issue scope id kpi"
+    assert fold_case("ASCII Only") == "ascii only"
+
+
+def test_scanner_handles_non_literal_alternatives():
+    patterns = [re.compile(r"(?:ab)+|x", re.I), re.compile(r".b|c", re.I)]
+    scanner = KeywordScanner(patterns)
+    for text in ["ABABx cb", "zb ab", "xxabab", ""]:
+        assert scanner.count(text) == [len(p.findall(text)) for p in patterns]
+
+
+def test_scanner_rejects_unsupported_patterns():
+    with pytest.raises(ValueError):
+        KeywordScanner([re.compile("abc")])
+    with pytest.raises(ValueError):
+        KeywordScanner([re.compile("Abc", re.I)])
+    with pytest.raises(ValueError):
+        KeywordScanner([re.compile("a*", re.I)])
@@ -0,0 +1,124 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services import llm_openai
+from app.services.metrics import REVIEWS, STAGE_SECONDS, TOKENS, Registry
+from app.services.reviewer import _mock_review, review_cache
+
+PRD = "# Metrics PRD\n\nUsers struggle; KPI target and rollout plan."
+
+MOCK_STAGES = ("seed", "keyword_scan", "rubric", "impact_confidence", "validate", "serialize")
+LLM_STAGES = ("prompt_build", "openai_network", "json_parse", "recompute_derived", "validate")
+
+
+def _sample(text: str, name: str, **labels: str) -> float:
+    label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{re.escape(name)}{{{re.escape(label_text)}}} (\S+)$", text, re.M)
+    assert match, f"{name}{{{label_text}}} not found"
+    return float(match.group(1))
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs", ("kind",))
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    registry.collector(lambda: [("depth", "gauge", "Queue depth", [({"q": 'a"b'}, 3)])])
+
+    counter.inc("x")
+    counter.inc("x", amount=2)
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "/r")
+
+    text = registry.render()
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{kind="x"} 3' in text
+    assert 'latency_seconds_bucket{route="/r",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/r",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/r",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/r"} 3' in text
+    assert 'latency_seconds_sum{route="/r"} 5.55' in text
+    assert 'depth{q="a\\"b"} 3' in text
+
+
+def test_mock_review_records_stages_and_cache_hits():
+    review_cache.clear()
+    before = {name: STAGE_SECONDS.count(name, "mock", "none") for name in MOCK_STAGES}
+    computed = REVIEWS.value("mock", "none", "computed")
+    hits = REVIEWS.value("mock", "none", "cache_hit")
+
+    client = TestClient(app)
+    for _ in range(2):
+        assert client.post("/review", json={"prd_markdown": PRD}).status_code == 200
+
+    for name in MOCK_STAGES:
+        assert STAGE_SECONDS.count(name, "mock", "none") > before[name], name
+    assert REVIEWS.value("mock", "none", "computed") == computed + 1
+    assert REVIEWS.value("mock", "none", "cache_hit") == hits + 1
+
+    text = client.get("/metrics").text
+    assert _sample(text, "prd_http_request_duration_seconds_count", method="POST", route="/review", status="200") >= 2
+    assert _sample(text, "prd_review_cache_lookups_total", result="hit") >= 1
+    assert "prd_llm_in_flight 0" in text
+
+
+def test_stage_timing_can_be_switched_off(monkeypatch):
+    review_cache.clear()
+    monkeypatch.setattr(settings, "metrics_stage_timing", False)
+    before = STAGE_SECONDS.count("seed", "mock", "none")
+    TestClient(app).post("/review", json={"prd_markdown": PRD + " off"})
+    assert STAGE_SECONDS.count("seed", "mock", "none") == before
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    review_cache.clear()
+    content = ReviewResponse.model_validate(_mock_review(ReviewRequest(prd_markdown=PRD))).model_dump_json()
+    behaviour = {"error": None}
+
+    async def create(**kwargs):
+        if behaviour["error"]:
+            raise behaviour["error"]
+        return SimpleNamespace(
+            model="gpt-test",
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30),
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        )
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "openai_model", "gpt-test")
+    monkeypatch.setattr(settings, "llm_max_retries", 0)
+    monkeypatch.setattr(llm_openai, "get_async_client", lambda: client)
+    yield behaviour
+    review_cache.clear()
+
+
+def test_llm_review_records_stages_and_tokens(fake_llm):
+    before = {name: STAGE_SECONDS.count(name, "llm", "gpt-test") for name in LLM_STAGES}
+    prompt_tokens = TOKENS.value("gpt-test", "prompt")
+
+    response = TestClient(app).post("/review", json={"prd_markdown": PRD, "document_id": "metrics-llm"})
+
+    assert response.status_code == 200
+    for name in LLM_STAGES:
+        assert STAGE_SECONDS.count(name, "llm", "gpt-test") == before[name] + 1, name
+    assert TOKENS.value("gpt-test", "prompt") == prompt_tokens + 120
+    assert TOKENS.value("gpt-test", "completion") >= 30
+
+
+def test_llm_errors_are_counted_by_type(fake_llm):
+    fake_llm["error"] = ValueError("bad payload")
+    errors = REVIEWS.value("llm", "gpt-test", "error")
+
+    with pytest.raises(ValueError):
+        TestClient(app).post("/review", json={"prd_markdown": PRD + " error"})
+
+    assert REVIEWS.value("llm", "gpt-test", "error") == errors + 1
+    text = TestClient(app).get("/metrics").text
+    assert _sample(text, "prd_review_errors_total", mode="llm", model="gpt-test", error="ValueError") >= 1
@@ -0,0 +1,120 @@
+import pytest
+
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest
+from app.services import incremental
+from app.services.near_duplicates import NearDuplicateIndex, signature, similarity
+from app.services.reviewer import _request_digest, review_prd
+
+PRD = (
+    "# Checkout Revamp for the Web Store\n\n"
+    "## Problem\nUsers struggle with a slow checkout flow and abandon carts at the payment step.\n\n"
+    "## Users\nReturning shoppers on desktop and mobile web, mostly paying by card.\n\n"
+    "## Metrics\nKPI conversion target 4%, baseline 3%, measured weekly on the dashboard.\n\n"
+    "## Rollout\nA/B experiment behind a feature flag, ramping from 5% to 50% of traffic.\n\n"
+    "## Notes\nOwned by the payments squad; design reviewed with the platform team last quarter.\n"
+)
+# A templated copy: same document with the product name swapped.
+COPY = PRD.replace("Web Store", "Mobile Store")
+UNRELATED = "# Internal Wiki Search\n\nEngineers cannot find runbooks; search ranks stale pages first."
+
+
+pytestmark = pytest.mark.usefixtures("llm_mode")
+
+
+def _review(markdown: str):
+    return review_prd(ReviewRequest(prd_markdown=markdown, mode="auto"))
+
+
+# ── Signatures and index ─────────────────────────────────────────────────────
+
+
+def test_signature_similarity_tracks_shared_text():
+    base = signature(PRD)
+    assert similarity(base, signature(PRD)) == 1.0
+    assert similarity(base, signature(COPY)) >= 0.8
+    assert similarity(base, signature(UNRELATED)) < 0.2
+
+
+def test_index_matches_within_namespace_and_threshold():
+    index = NearDuplicateIndex(8, str, str)
+    index.add("prd", "gpt-4o", signature(PRD), "payload")
+
+    match = index.query("gpt-4o", signature(COPY), threshold=0.8)
+    assert match.review_id == "prd" and match.payload == "payload"
+    assert index.query("gpt-4o-mini", signature(COPY), threshold=0.8) is None
+    assert index.query("gpt-4o", signature(COPY), threshold=1.0) is None
+    assert index.query("gpt-4o", signature(UNRELATED), threshold=0.5) is None
+    assert index.stats() == {"size": 1, "lookups": 4, "matches": 1}
+
+
+def test_index_memory_is_bounded_and_persisted(tmp_path):
+    path = str(tmp_path / "near.sqlite3")
+    index = NearDuplicateIndex(2, str, str, path=path)
+    for i in range(3):
+        index.add(f"doc-{i}", "ns", signature(f"{UNRELATED} variant {i} " * (i + 1)), f"payload-{i}")
+    assert len(index) == 2
+    assert index.query("ns", signature(f"{UNRELATED} variant 0 "), threshold=1.0) is None  # evicted
+    assert not any("doc-0" in bucket for bucket in index._buckets.values())
+    index.close()
+
+    reloaded = NearDuplicateIndex(2, str, str, path=path)
+    match = reloaded.query("ns", signature(f"{UNRELATED} variant 2 " * 3), threshold=1.0)
+    assert len(reloaded) == 2 and match.payload == "payload-2"
+    reloaded.close()
+
+
+# ── Review integration ───────────────────────────────────────────────────────
+
+
+def test_off_by_default(monkeypatch, fake_llm):
+    _review(PRD)
+    copy = _review(COPY)
+    assert fake_llm.kinds == ["full", "full"]
+    assert copy.decision_trace.near_duplicate is None
+
+
+def test_reuse_returns_prior_review_without_llm_call(monkeypatch, fake_llm):
+    monkeypatch.setattr(settings, "near_duplicate_mode", "reuse")
+    monkeypatch.setattr(settings, "near_duplicate_threshold", 0.8)
+    original = _review(PRD)
+    copy = _review(COPY)
+
+    assert fake_llm.kinds == ["full"]
+    match = copy.decision_trace.near_duplicate
+    assert match.action == "reuse"
+    assert match.review_id == _request_digest(ReviewRequest(prd_markdown=PRD, mode="auto"))
+    assert settings.near_duplicate_threshold <= match.similarity < 1
+    assert copy.overall_score == original.overall_score and copy.summary == original.summary
+    assert original.decision_trace.near_duplicate is None  # the stored original is not mutated
+
+
+def test_seed_rescores_only_criteria_touched_by_the_edit(monkeypatch, fake_llm):
+    monkeypatch.setattr(settings, "near_duplicate_mode", "seed")
+    monkeypatch.setattr(settings, "near_duplicate_threshold", 0.7)
+    _review(PRD)
+    edited = _review(PRD.replace("## Notes", "## Risks\nVendor dependency on the payment provider.\n\n## Notes"))
+
+    assert fake_llm.kinds == ["full", "criteria"]
+    assert edited.decision_trace.near_duplicate.action == "seed"
+    rescored = [item for item in edited.decision_trace.scoring_rubric if item.notes == "re-scored"]
+    assert [item.criterion for item in rescored] == ["Risks & Dependencies"]
+
+
+def test_seed_without_affected_criteria_is_not_indexed_again(monkeypatch, fake_llm):
+    monkeypatch.setattr(settings, "near_duplicate_mode", "seed")
+    monkeypatch.setattr(settings, "near_duplicate_threshold", 0.7)
+    _review(PRD)
+    copy = _review(COPY)
+
+    assert fake_llm.kinds == ["full"]
+    assert copy.decision_trace.near_duplicate.action == "seed"
+    assert len(incremental.near_duplicate_index) == 1
+
+
+def test_unrelated_prd_gets_a_full_review(monkeypatch, fake_llm):
+    monkeypatch.setattr(settings, "near_duplicate_mode", "reuse")
+    _review(PRD)
+    unrelated = _review(UNRELATED)
+    assert fake_llm.kinds == ["full", "full"]
+    assert unrelated.decision_trace.near_duplicate is None
@@ -0,0 +1,142 @@
+import asyncio
+import json
+
+import pytest
+
+from app.cli import main
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest
+from app.services import jobs, llm_openai, offline_batch
+from app.services.jobs import JobStore
+from benchmarks.fake_openai import FakeOpenAI
+
+PRDS = [f"# Portfolio PRD {i}\n\nUsers struggle with reporting; KPI target {i}0%." for i in range(3)]
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    with FakeOpenAI() as server:
+        monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+        monkeypatch.setattr(settings, "openai_base_url", server.base_url)
+        asyncio.run(llm_openai.close_clients())
+        yield server
+        asyncio.run(llm_openai.close_clients())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    yield store
+    store.close()
+
+
+def _hold(store: JobStore) -> list[str]:
+    held = offline_batch.enqueue(store, [ReviewRequest(prd_markdown=prd, mode="auto") for prd in PRDS])
+    return [job.id for job, _ in held]
+
+
+def _custom_ids(fake: FakeOpenAI, batch_id: str) -> dict[str, str]:
+    lines = [json.loads(line) for line in fake.files[fake.batches[batch_id]["input_file_id"]].splitlines()]
+    return {line["custom_id"].split(":")[0]: line["custom_id"] for line in lines}
+
+
+def test_batched_jobs_are_invisible_to_workers(fake, store):
+    _hold(store)
+    assert store.claim("worker", lease_seconds=60) is None
+    assert store.counts()["batched"] == 3
+
+
+def test_submit_packages_prompts_into_one_batch_file(fake, store):
+    job_ids = _hold(store)
+    batch_id = offline_batch.submit(store)
+
+    batch = fake.batches[batch_id]
+    assert (batch["endpoint"], batch["completion_window"]) == (offline_batch.ENDPOINT, "24h")
+    lines = [json.loads(line) for line in fake.files[batch["input_file_id"]].splitlines()]
+    assert sorted(_custom_ids(fake, batch_id)) == sorted(job_ids)
+    stats = llm_openai._prompt(PRDS[0], None).stats()
+    assert _custom_ids(fake, batch_id)[job_ids[0]] == ":".join([job_ids[0], *map(str, stats.values())])
+    assert lines[0]["body"]["messages"][0]["content"] == llm_openai.SYSTEM_PROMPT
+    assert offline_batch.open_batches(store) == [batch_id]
+    assert offline_batch.submit(store) is None  # nothing left to hold
+
+
+def test_batches_are_split_by_input_size(fake, store, monkeypatch):
+    job_ids = _hold(store)
+    line = len(offline_batch.request_line(job_ids[0], ReviewRequest(prd_markdown=PRDS[0], mode="auto"))) + 1
+    monkeypatch.setattr(settings, "offline_batch_max_bytes", line * 2 + 10)
+
+    batch_ids = offline_batch.submit_all(store)
+    sizes = [len(fake.files[fake.batches[batch_id]["input_file_id"]].splitlines()) for batch_id in batch_ids]
+    assert sizes == [2, 1]
+    assert all(store.get(job_id).attempts == 1 for job_id in job_ids)
+
+
+def test_abandoned_submission_claims_are_recovered(fake, store, monkeypatch):
+    job_ids = _hold(store)
+    store.claim_batch(offline_batch._PENDING + "dead", 10)  # submitter died before the provider answered
+    assert offline_batch.submit(store) is None
+
+    monkeypatch.setattr(settings, "offline_batch_claim_timeout_seconds", 0)
+    (batch_id,) = offline_batch.submit_all(store)
+    assert len(fake.files[fake.batches[batch_id]["input_file_id"]].splitlines()) == len(job_ids)
+    assert offline_batch.open_batches(store) == [batch_id]
+
+
+def test_poll_waits_for_completion_then_stores_validated_reviews(fake, store, monkeypatch):
+    fake.batch_delay = 60.0
+    job_ids = _hold(store)
+    batch_id = offline_batch.submit(store)
+    monkeypatch.setattr(offline_batch, "_prompt", None)  # results carry their stats; no recompaction
+
+    assert [outcome.status for outcome in offline_batch.poll(store)] == ["in_progress"]
+    fake.batches[batch_id]["_ready_at"] = 0
+    (outcome,) = offline_batch.poll(store)
+
+    assert (outcome.status, outcome.succeeded, outcome.errors) == ("completed", 3, 0)
+    assert offline_batch.open_batches(store) == []
+    for job_id in job_ids:
+        job = store.get(job_id)
+        assert job.status == "succeeded" and job.attempts == 1
+        assert job.review.summary == fake.review["summary"]
+        assert job.review.decision_trace.prompt_stats is not None
+
+
+def test_failed_lines_and_expired_batches_are_resubmitted(fake, store, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_max_attempts", 2)
+    job_ids = _hold(store)
+    batch_id = offline_batch.submit(store)
+    fake.batch_failures = {_custom_ids(fake, batch_id)[job_ids[0]]}
+    (outcome,) = offline_batch.poll(store)
+    assert (outcome.succeeded, outcome.errors) == (2, 1)
+    assert store.get(job_ids[0]).status == "batched"
+    assert "server had an error" in store.get(job_ids[0]).error
+
+    fake.batch_status = "expired"
+    offline_batch.submit(store)
+    (outcome,) = offline_batch.poll(store)
+    failed = store.get(job_ids[0])
+    assert (outcome.status, outcome.errors, failed.status, failed.attempts) == ("expired", 1, "failed", 2)
+    assert "expired without a result" in failed.error
+
+
+def test_mock_requests_are_rejected(store):
+    with pytest.raises(ValueError, match="LLM path"):
+        offline_batch.enqueue(store, [ReviewRequest(prd_markdown=PRDS[0], mode="mock")])
+
+
+def test_cli_runs_corpus_to_completion(fake, tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_db_path", settings.jobs_db_path)  # the CLI overrides it
+    for i, prd in enumerate(PRDS):
+        (tmp_path / f"prd_{i}.md").write_text(prd, encoding="utf-8")
+    db = str(tmp_path / "cli.sqlite3")
+
+    assert main(["batch", str(tmp_path), "--db", db, "--interval", "0.01", "--limit", "2"]) == 0
+    out, err = capsys.readouterr()
+    assert len(out.splitlines()) == 3
+    assert "collected 2 batches, 3 reviews" in err
+
+    store = JobStore(db)
+    assert store.counts()["succeeded"] == 3
+    store.close()
+    jobs.close_job_store()
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.settings import settings
+from app.services import llm_openai
+from app.models.schemas import ReviewRequest
+from app.services.reviewer import RUBRIC, _compute_impact_profile, _compute_readiness_level, _mock_review
+
+PRD = "# Checkout\n\n## Problem\nUsers struggle with checkout.\n\n## Metrics\nKPI conversion 4%.\n"
+DELAY = 0.1
+
+NARRATIVE = {
+    "summary": "Solid problem framing; measurement plan needs work.",
+    "strengths": ["Clear problem"],
+    "gaps": [{"area": "Metrics", "why": "No baseline", "suggested_fix": "Add baseline"}],
+    "risks": [{"risk": "PSP outage", "impact": "Lost revenue", "mitigation": "Fallback PSP"}],
+    "questions": ["What is the launch date?"],
+    "metrics": [{"metric": "Conversion", "definition": "Orders / sessions"}],
+    "suggested_experiments": [],
+    "assumptions": ["Traffic stays flat"],
+}
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: list[dict] = []
+        self.peak = 0
+        self.active = 0
+
+    def enter(self, kwargs: dict) -> None:
+        with self.lock:
+            self.calls.append(kwargs)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def leave(self) -> None:
+        with self.lock:
+            self.active -= 1
+
+
+def _answer(kwargs: dict) -> SimpleNamespace:
+    system, user = (m["content"] for m in kwargs["messages"])
+    if system == llm_openai.SYSTEM_PROMPT:
+        content = json.dumps(_mock_review(ReviewRequest(prd_markdown=PRD)))
+    elif system == llm_openai.NARRATIVE_SYSTEM_PROMPT:
+        content = json.dumps(NARRATIVE)
+    else:
+        criterion = re.search(r"^- (.+) \(max \d+ pts\)$", user, re.M).group(1)
+        weight = next(r["weight"] for r in RUBRIC if r["criterion"] == criterion)
+        item = {"criterion": criterion, "weight": weight, "score": weight // 2, "notes": "ok"}
+        content = json.dumps({"scoring_rubric": [item]})
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = _Recorder()
+
+    def create(**kwargs):
+        recorder.enter(kwargs)
+        time.sleep(DELAY)
+        recorder.leave()
+        return _answer(kwargs)
+
+    async def create_async(**kwargs):
+        recorder.enter(kwargs)
+        await asyncio.sleep(DELAY)
+        recorder.leave()
+        return _answer(kwargs)
+
+    def client(fn):
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=fn)))
+
+    monkeypatch.setattr(llm_openai, "get_client", lambda: client(create))
+    monkeypatch.setattr(llm_openai, "get_async_client", lambda: client(create_async))
+    monkeypatch.setattr(settings, "openai_parallel_criteria", True)
+    return recorder
+
+
+def _check_assembled(review) -> None:
+    rubric = [item.model_dump() for item in review.decision_trace.scoring_rubric]
+    assert [item["criterion"] for item in rubric] == [r["criterion"] for r in RUBRIC]
+    assert review.overall_score == sum(item["score"] for item in rubric)
+    assert review.decision_trace.readiness_level == _compute_readiness_level(review.overall_score)
+    assert review.decision_trace.impact_profile.model_dump() == _compute_impact_profile(rubric)
+    assert review.summary == NARRATIVE["summary"]
+    assert review.decision_trace.assumptions == NARRATIVE["assumptions"]
+    assert review.decision_trace.prompt_stats is not None
+
+
+def test_async_fan_out_runs_all_calls_concurrently(recorder):
+    started = time.perf_counter()
+    review = asyncio.run(llm_openai.call_openai_async(PRD, None, None))
+    elapsed = time.perf_counter() - started
+
+    _check_assembled(review)
+    assert len(recorder.calls) == len(RUBRIC) + 1
+    assert recorder.peak == len(RUBRIC) + 1
+    assert elapsed < DELAY * 3  # serial would be 8 * DELAY
+    assert {c["max_tokens"] for c in recorder.calls} == {
+        settings.openai_criteria_max_tokens,
+        settings.openai_narrative_max_tokens,
+    }
+
+
+def test_sync_fan_out_uses_threads(recorder):
+    started = time.perf_counter()
+    review = llm_openai.call_openai(PRD, {"domain": "retail"}, "execs")
+    elapsed = time.perf_counter() - started
+
+    _check_assembled(review)
+    assert recorder.peak == len(RUBRIC) + 1
+    assert elapsed < DELAY * 3
+
+
+def test_monolithic_call_is_default(recorder, monkeypatch):
+    monkeypatch.setattr(settings, "openai_parallel_criteria", False)
+    llm_openai.call_openai(PRD, None, None)
+    assert len(recorder.calls) == 1
+    assert recorder.calls[0]["messages"][0]["content"] == llm_openai.SYSTEM_PROMPT
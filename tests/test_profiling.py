@@ -0,0 +1,73 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest
+from app.services.profiling import StackProfiler
+from app.services.reviewer import review_prd
+
+PRD = "# Profiled PRD\n\nUsers struggle; KPI target and rollout plan.\n\n## Risks\n\nVendor dependency."
+
+
+@pytest.fixture
+def debug(monkeypatch):
+    monkeypatch.setattr(settings, "debug", True)
+
+
+def test_profiling_is_debug_only(monkeypatch):
+    monkeypatch.setattr(settings, "debug", False)
+    response = TestClient(app).post("/review?profile=summary", json={"prd_markdown": PRD})
+    assert response.status_code == 403
+
+
+def test_summary_returns_review_stages_and_hot_functions(debug):
+    response = TestClient(app).post("/review?profile=summary", json={"prd_markdown": PRD})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["review"] == review_prd(ReviewRequest(prd_markdown=PRD)).model_dump()
+    profile = body["profile"]
+    stages = {item["stage"] for item in profile["stages"]}
+    assert {"seed", "keyword_scan", "rubric", "impact_confidence", "validate"} <= stages
+    functions = {item["function"]: item for item in profile["hot_functions"]}
+    assert len(functions) <= settings.profile_top_functions
+    assert any(name.startswith("app.services.") for name in functions)
+    assert all(item["cumulative_seconds"] >= item["self_seconds"] for item in functions.values())
+    assert profile["collapsed_path"] is None
+
+
+def test_collapsed_stacks_are_folded_lines(debug):
+    response = TestClient(app).post("/review?profile=collapsed", json={"prd_markdown": PRD})
+
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert lines and all(re.fullmatch(r"\S.* \d+", line) for line in lines)
+    assert any("app.services.reviewer:_mock_review;" in line for line in lines)
+
+
+def test_collapsed_stacks_are_dumped_to_directory(debug, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profile_dump_dir", str(tmp_path))
+    body = TestClient(app).post("/review?profile=summary", json={"prd_markdown": PRD}).json()
+
+    path = body["profile"]["collapsed_path"]
+    assert path.startswith(str(tmp_path)) and path.endswith(".collapsed")
+    assert "_score_rubric_mock" in open(path, encoding="utf-8").read()
+
+
+def test_stack_profiler_attributes_self_time_per_stack():
+    def leaf():
+        return sum(range(2000))
+
+    def branch():
+        return leaf() + leaf()
+
+    profiler = StackProfiler()
+    assert profiler.run(branch) == 2 * sum(range(2000))
+
+    hot = {item.function.rsplit(".", 1)[-1]: item for item in profiler.hot_functions(10)}
+    assert hot["leaf"].calls == 2
+    assert hot["branch"].cumulative_seconds >= hot["leaf"].cumulative_seconds
+    assert any(line.count(";") >= 1 and "leaf" in line for line in profiler.collapsed().splitlines())
@@ -100,6 +100,18 @@ def test_schema_endpoint():
     schema = resp.json()
     assert "properties" in schema
     assert "overall_score" in schema["properties"]
+    assert schema == ReviewResponse.model_json_schema()
+
+
+def test_schema_endpoint_is_cacheable():
+    resp = client.get("/schema")
+    etag = resp.headers["etag"]
+    assert resp.headers["cache-control"].startswith("public, max-age=")
+    assert client.get("/schema").headers["etag"] == etag
+
+    assert client.get("/schema", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/schema", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get("/schema", headers={"If-None-Match": '"stale"'}).status_code == 200
 
 
 # ── Rubric structure tests ───────────────────────────────────────────────────
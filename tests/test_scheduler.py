@@ -0,0 +1,276 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest
+from app.services import llm_openai, reviewer, scheduler as scheduler_module
+from app.services.reviewer import review_cache, review_prd_async
+from app.services.scheduler import (
+    LLMScheduler,
+    Overloaded,
+    Priority,
+    RateBudget,
+    call_with_retries,
+    parse_reset,
+)
+
+PRD = "# Scheduler PRD\n\nUsers struggle; KPI target and rollout plan."
+
+
+class _APIError(Exception):
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def _scheduler(concurrency: int = 1, queue: int = 100) -> LLMScheduler:
+    return LLMScheduler(max_concurrency=concurrency, max_queue_depth=queue, budget=RateBudget())
+
+
+# ── Budget ───────────────────────────────────────────────────────────────────
+
+
+def test_parse_reset_durations():
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("1s") == 1.0
+    assert parse_reset("6m0s") == 360.0
+    assert parse_reset("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_reset("2.5") == 2.5
+    assert parse_reset("soon") is None
+
+
+def test_budget_waits_for_header_reset_and_configured_tpm():
+    budget = RateBudget()
+    assert budget.delay_for(1000) == 0
+    budget.update_from_headers(
+        {
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "500ms",
+            "x-ratelimit-remaining-tokens": "90000",
+            "x-ratelimit-reset-tokens": "1s",
+        }
+    )
+    assert 0.4 < budget.delay_for(10) <= 0.5
+
+    budget = RateBudget(tpm=1000)
+    budget.consume(600)
+    assert budget.delay_for(300) == 0
+    assert 59 < budget.delay_for(500) <= 60
+    assert budget.stats()["tokens_last_minute"] == 600
+
+
+def test_budget_counts_every_call_of_a_fan_out():
+    budget = RateBudget(rpm=10)
+    budget.consume(900, requests=9)
+    assert (budget.stats()["requests_last_minute"], budget.stats()["tokens_last_minute"]) == (9, 900)
+    assert budget.delay_for(0) == 0
+    assert 59 < budget.delay_for(0, requests=9) <= 60
+
+    budget = RateBudget()
+    budget.update_from_headers({"x-ratelimit-remaining-requests": "5", "x-ratelimit-reset-requests": "1s"})
+    assert budget.delay_for(0, requests=5) == 0
+    assert 0.9 < budget.delay_for(0, requests=9) <= 1.0
+
+
+def test_malformed_rate_limit_headers_are_ignored():
+    budget = RateBudget()
+    budget.update_from_headers({"x-ratelimit-remaining-requests": "n/a", "x-ratelimit-limit-tokens": "90000"})
+    stats = budget.stats()
+    assert (stats["remaining_requests"], stats["tpm_limit"]) == (None, 90000)
+
+
+# ── Admission ────────────────────────────────────────────────────────────────
+
+
+def test_interactive_requests_jump_ahead_of_batch():
+    scheduler = _scheduler(concurrency=1)
+    order: list[str] = []
+
+    async def job(name: str, priority: Priority) -> None:
+        await scheduler.acquire(priority, 0, time.monotonic() + 5)
+        order.append(name)
+        await asyncio.sleep(0.01)
+        scheduler.release("ok")
+
+    async def main():
+        await scheduler.acquire(Priority.INTERACTIVE, 0, time.monotonic() + 5)
+        tasks = [asyncio.ensure_future(job(f"batch-{i}", Priority.BATCH)) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(job("interactive", Priority.INTERACTIVE)))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queue_depth"] == {"interactive": 1, "batch": 3}
+        scheduler.release("ok")
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == ["interactive", "batch-0", "batch-1", "batch-2"]
+
+
+def test_queue_deadline_and_depth_shed_load():
+    scheduler = _scheduler(concurrency=1, queue=1)
+
+    async def main():
+        await scheduler.acquire(Priority.INTERACTIVE, 0, time.monotonic() + 5)
+        waiter = asyncio.ensure_future(scheduler.acquire(Priority.BATCH, 0, time.monotonic() + 0.05))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded, match="queue is full"):
+            await scheduler.acquire(Priority.INTERACTIVE, 0, time.monotonic() + 5)
+        with pytest.raises(Overloaded, match="deadline"):
+            await waiter
+
+    asyncio.run(main())
+    stats = scheduler.stats()
+    assert (stats["shed"], stats["timeouts"], stats["in_flight"]) == (1, 1, 1)
+
+
+@pytest.mark.parametrize("error", [asyncio.CancelledError, asyncio.TimeoutError])
+def test_waiter_interrupted_after_grant_releases_its_slot(monkeypatch, error):
+    scheduler = _scheduler(concurrency=1)
+
+    async def granted_then_interrupted(future, timeout):
+        # Python 3.12's wait_for can raise even though the slot was granted.
+        await future
+        raise error
+
+    async def main():
+        await scheduler.acquire(Priority.INTERACTIVE, 0, time.monotonic() + 5)
+        with monkeypatch.context() as patch:
+            patch.setattr(asyncio, "wait_for", granted_then_interrupted)
+            waiter = asyncio.ensure_future(scheduler.acquire(Priority.BATCH, 0, time.monotonic() + 5))
+            await asyncio.sleep(0)
+            scheduler.release("ok")
+            with pytest.raises((asyncio.CancelledError, Overloaded)):
+                await waiter
+        assert scheduler.in_flight == 0
+        await scheduler.acquire(Priority.INTERACTIVE, 0, time.monotonic() + 0.05)
+
+    asyncio.run(main())
+
+
+def test_run_retries_429_and_halves_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "llm_backoff_base_seconds", 0.001)
+    scheduler = _scheduler(concurrency=8)
+    attempts = []
+
+    async def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise _APIError(429, {"retry-after-ms": "10"})
+        return "ok"
+
+    assert asyncio.run(scheduler.run(flaky, tokens=10, priority=Priority.INTERACTIVE)) == "ok"
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.01
+    stats = scheduler.stats()
+    assert (stats["retries"], stats["rate_limited"], stats["in_flight"]) == (2, 2, 0)
+    assert stats["concurrency_limit"] == 2  # 8 -> 4 -> 2, then +1/limit
+
+    async def broken():
+        raise _APIError(400)
+
+    with pytest.raises(_APIError):
+        asyncio.run(scheduler.run(broken, tokens=10))
+    assert scheduler.stats()["retries"] == 2
+
+
+def test_sync_retries_use_jittered_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "llm_backoff_base_seconds", 0.001)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _APIError(503)
+        return "ok"
+
+    assert call_with_retries(flaky) == "ok"
+
+    monkeypatch.setattr(settings, "llm_max_retries", 1)
+    calls.clear()
+
+    def always_down():
+        calls.append(1)
+        raise _APIError(503)
+
+    with pytest.raises(_APIError):
+        call_with_retries(always_down)
+    assert len(calls) == 2
+
+
+def test_sync_calls_wait_for_the_rate_budget(monkeypatch):
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=1, budget=RateBudget(rpm=2))
+    monkeypatch.setattr(scheduler_module, "llm_scheduler", scheduler)
+    monkeypatch.setattr(settings, "llm_queue_deadline_seconds", 0.01)
+    calls = []
+
+    assert call_with_retries(lambda: calls.append(1) or "ok", tokens=50) == "ok"
+    with pytest.raises(Overloaded, match="rate limit budget"):
+        call_with_retries(lambda: calls.append(1), requests=2)
+    assert calls == [1]
+    assert scheduler.budget.stats()["tokens_last_minute"] == 50
+
+
+def test_parallel_criteria_review_is_budgeted_per_call(monkeypatch):
+    review_cache.clear()
+    scheduler = _scheduler()
+    monkeypatch.setattr(reviewer, "llm_scheduler", scheduler)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "openai_parallel_criteria", True)
+    request = ReviewRequest(prd_markdown=PRD, mode="auto")
+
+    async def fake_review(*args, **kwargs):
+        return reviewer._mock_review(request)
+
+    monkeypatch.setattr(llm_openai, "call_openai_async", fake_review)
+    asyncio.run(review_prd_async(request))
+
+    budget = scheduler.budget.stats()
+    assert budget["requests_last_minute"] == 1 + len(reviewer.RUBRIC)
+    assert budget["tokens_last_minute"] == reviewer._estimated_tokens(request)
+    assert reviewer._estimated_tokens(request) > (1 + len(reviewer.RUBRIC)) * settings.openai_criteria_max_tokens
+
+
+# ── Degradation ──────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    review_cache.clear()
+    scheduler = _scheduler(concurrency=1)
+    scheduler.in_flight = 1  # the only slot is taken
+    monkeypatch.setattr(reviewer, "llm_scheduler", scheduler)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "llm_queue_deadline_seconds", 0.01)
+
+    async def never_called(*args):
+        raise AssertionError("LLM called while saturated")
+
+    monkeypatch.setattr(llm_openai, "call_openai_async", never_called)
+    return scheduler
+
+
+def test_overloaded_llm_path_degrades_to_uncached_mock(saturated):
+    review = asyncio.run(review_prd_async(ReviewRequest(prd_markdown=PRD, mode="auto")))
+    assert review.decision_trace.fallback == "mock: LLM queue wait exceeded the deadline"
+    assert review_cache.stats()["size"] == 0
+    assert saturated.stats()["timeouts"] == 1
+
+
+def test_overloaded_without_degradation_returns_503(saturated, monkeypatch):
+    monkeypatch.setattr(settings, "llm_degrade_to_mock", False)
+    resp = TestClient(app).post("/review", json={"prd_markdown": PRD, "mode": "auto"})
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+
+
+def test_stats_endpoint_reports_queue_metrics():
+    body = TestClient(app).get("/stats").json()
+    assert set(body["llm_scheduler"]["queue_depth"]) == {"interactive", "batch"}
+    assert {"p50", "p95", "max"} == set(body["llm_scheduler"]["queue_wait_seconds"])
+    assert "hits" in body["review_cache"]
@@ -0,0 +1,82 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.main import app
+from app.models.schemas import ReviewRequest, ReviewResponse
+from app.services.llm_openai import _parse_review, _recompute_derived_fields
+from app.services.reviewer import _mock_review
+
+client = TestClient(app)
+
+PRD = (
+    "# Checkout Revamp\n\n## Problem\nUsers struggle with checkout.\n\n"
+    "## Metrics\nKPI conversion target 4%, baseline 3%.\n\n## Rollout\nPhased A/B experiment.\n"
+)
+_ADAPTER = TypeAdapter(ReviewResponse)
+
+
+def _legacy_fastapi_serialize(review: ReviewResponse) -> bytes:
+    # What response_model did per request: dump, re-validate, serialize, json.dumps.
+    value = _ADAPTER.validate_python(review.model_dump())
+    content = _ADAPTER.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _legacy_mock(data: dict) -> bytes:
+    return _legacy_fastapi_serialize(ReviewResponse.model_validate(data))
+
+
+def _fast_mock(data: dict) -> bytes:
+    return ReviewResponse.model_validate(data).model_dump_json().encode()
+
+
+def _legacy_llm(raw: str) -> bytes:
+    data = json.loads(raw)
+    _recompute_derived_fields(data)
+    ReviewResponse.model_validate(data)  # inside call_openai
+    review = ReviewResponse.model_validate(data)  # again in review_prd
+    return _legacy_fastapi_serialize(review)
+
+
+def _fast_llm(raw: str) -> bytes:
+    return _parse_review(raw).model_dump_json().encode()
+
+
+def _best_of(fn, arg, iterations=200, rounds=5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations
+
+
+def test_fast_path_output_is_identical_to_legacy():
+    data = _mock_review(ReviewRequest(prd_markdown=PRD))
+    assert json.loads(_fast_mock(data)) == json.loads(_legacy_mock(data))
+    raw = json.dumps(data)
+    assert json.loads(_fast_llm(raw)) == json.loads(_legacy_llm(raw))
+
+
+def test_review_route_returns_validated_json_bytes():
+    resp = client.post("/review", json={"prd_markdown": PRD, "mode": "mock"})
+    assert resp.headers["content-type"] == "application/json"
+    expected = ReviewResponse.model_validate(_mock_review(ReviewRequest(prd_markdown=PRD)))
+    assert resp.json() == expected.model_dump(mode="json")
+
+
+def test_benchmark_single_validation_saves_cpu():
+    data = _mock_review(ReviewRequest(prd_markdown=PRD))
+    raw = json.dumps(data)
+
+    timings = {
+        "mock": (_best_of(_legacy_mock, data), _best_of(_fast_mock, data)),
+        "llm": (_best_of(_legacy_llm, raw), _best_of(_fast_llm, raw)),
+    }
+    for shape, (legacy, fast) in timings.items():
+        # About 2-3x locally; the margin leaves room for noisy CI machines.
+        assert legacy / fast > 1.3, f"{shape}: legacy {legacy * 1e6:.1f}us, fast {fast * 1e6:.1f}us"
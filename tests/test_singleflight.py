@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.settings import settings
+from app.models.schemas import ReviewRequest
+from app.services import llm_openai
+from app.services.reviewer import _mock_review, review_cache, review_flights, review_prd
+from app.services.singleflight import SingleFlight
+
+
+def test_sync_callers_share_one_execution():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flights.do, "k", slow)
+        started.wait(5)
+        followers = [pool.submit(flights.do, "k", slow) for _ in range(7)]
+        while flights.stats()["collapsed"] < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "executions": 1, "collapsed": 7}
+
+
+def test_sync_error_propagates_to_waiters():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def boom():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("upstream failed")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "k", boom)
+        started.wait(5)
+        follower = pool.submit(flights.do, "k", boom)
+        while flights.stats()["collapsed"] < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="upstream failed"):
+                future.result()
+    assert flights.in_flight() == 0
+
+
+def test_async_callers_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("k", slow) for _ in range(10)))
+
+    assert asyncio.run(main()) == ["result"] * 10
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "executions": 1, "collapsed": 9}
+
+
+def test_cancelled_async_leader_does_not_fail_followers():
+    flights = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        leader = asyncio.create_task(flights.do_async("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do_async("k", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "result"
+    assert len(calls) == 1
+    assert flights.in_flight() == 0
+
+
+def test_async_call_is_cancelled_once_every_caller_is_gone():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        callers = [asyncio.create_task(flights.do_async("k", hang)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [1]
+    assert flights.in_flight() == 0
+
+
+def test_concurrent_identical_llm_reviews_call_openai_once(monkeypatch):
+    review_cache.clear()
+    calls = []
+    release = threading.Event()
+
+    def fake_call_openai(prd_markdown, product_context, audience):
+        calls.append(prd_markdown)
+        release.wait(5)
+        return _mock_review(ReviewRequest(prd_markdown=prd_markdown))
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "call_openai", fake_call_openai)
+    request = ReviewRequest(prd_markdown="# Shared PRD\n\nEveryone opens this link.", mode="auto")
+    before = review_flights.stats()["collapsed"]
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        futures = [pool.submit(review_prd, request) for _ in range(12)]
+        while review_flights.stats()["collapsed"] - before < 11:
+            time.sleep(0.001)
+        release.set()
+        reviews = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is reviews[0] for r in reviews)
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.services import warmup
+from benchmarks.startup import first_request, import_times
+
+# Generous enough for a loaded CI runner; locally import is ~1 s and the first
+# review a few milliseconds.
+IMPORT_BUDGET_S = 5.0
+FIRST_REQUEST_BUDGET_S = 0.5
+
+
+def _wait_ready(client: TestClient, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while (response := client.get("/ready")).status_code != 200 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return response
+
+
+def test_ready_flips_only_after_warmup(monkeypatch):
+    release = threading.Event()
+    synthetic_review = warmup._synthetic_review
+
+    def blocked() -> None:
+        release.wait(5)
+        synthetic_review()
+
+    monkeypatch.setattr(warmup, "_synthetic_review", blocked)
+    with TestClient(app) as client:
+        warming = client.get("/ready")
+        assert warming.status_code == 503
+        assert warming.json()["status"] == "warming"
+        assert warming.headers["retry-after"] == "1"
+        assert client.get("/health").status_code == 200  # liveness is unaffected
+
+        release.set()
+        ready = _wait_ready(client)
+        assert ready.status_code == 200
+        body = ready.json()
+        assert body["status"] == "ready" and body["error"] is None
+        assert {"openapi", "mock_review", "http_stack"} <= set(body["steps"])
+        assert body["warmup_seconds"] >= sum(body["steps"].values())
+
+
+def test_warmup_disabled_is_ready_immediately(monkeypatch):
+    monkeypatch.setattr(settings, "warmup_enabled", False)
+    with TestClient(app) as client:
+        response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["steps"] == {}
+
+
+def test_failed_warmup_still_becomes_ready(monkeypatch):
+    def broken() -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(warmup, "_synthetic_review", broken)
+    with TestClient(app) as client:
+        body = _wait_ready(client).json()
+    assert body["status"] == "ready"
+    assert body["error"] == "RuntimeError: boom"
+
+
+def test_import_time_report_lists_app_modules():
+    rows = {row.module: row for row in import_times("app.core.settings")}
+    assert rows["app.core.settings"].cumulative_s >= rows["app.core.settings"].self_s > 0
+
+
+def test_cold_import_and_first_request_within_budget():
+    timings = first_request()
+    assert timings["import_s"] < IMPORT_BUDGET_S
+    assert timings["first_request_s"] < FIRST_REQUEST_BUDGET_S
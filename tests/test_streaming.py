@@ -0,0 +1,188 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api.streaming import encode_event, with_heartbeats
+from app.core.settings import settings
+from app.main import app
+from app.models.schemas import ReviewRequest
+from app.services import llm_openai
+from app.services.json_stream import ArrayItemParser
+from app.services.metrics import TOKENS
+from app.services.reviewer import _mock_review, review_cache, review_prd_events
+
+client = TestClient(app)
+
+PRD = "# Stream PRD {i}\n\nUsers struggle; KPI target and rollout plan."
+
+
+def _ndjson(resp) -> list[dict]:
+    return [json.loads(line) for line in resp.text.splitlines() if line]
+
+
+def test_review_stream_ndjson_emits_progress_result_done():
+    payload = {"prd_markdown": PRD.format(i=0), "mode": "mock"}
+    resp = client.post("/review/stream", json=payload)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = _ndjson(resp)
+    assert [e["event"] for e in events] == ["progress", "result", "done"]
+    assert events[1]["data"]["review"] == client.post("/review", json=payload).json()
+
+
+def test_review_stream_sse_when_requested():
+    payload = {"prd_markdown": PRD.format(i=0), "mode": "mock"}
+    resp = client.post("/review/stream", json=payload, headers={"Accept": "text/event-stream"})
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    frames = [f for f in resp.text.split("\n\n") if f]
+    assert frames[1].startswith("event: result\ndata: ")
+    data = json.loads(frames[1].split("data: ", 1)[1])
+    assert data["status"] == "ok"
+
+
+def test_batch_stream_emits_every_item():
+    items = [{"prd_markdown": PRD.format(i=i), "mode": "mock"} for i in range(20)]
+    events = _ndjson(client.post("/review/batch/stream", json={"items": items}))
+    results = [e["data"] for e in events if e["event"] == "result"]
+    assert sorted(r["index"] for r in results) == list(range(20))
+    assert events[-1] == {"event": "done", "data": {"completed": 20, "total": 20}}
+
+
+def test_batch_stream_delivers_fastest_llm_item_first(monkeypatch):
+    review_cache.clear()
+
+    async def fake_call_openai_async(prd_markdown, product_context, audience):
+        await asyncio.sleep(0.2 if "PRD 0\n" in prd_markdown else 0.0)
+        return _mock_review(ReviewRequest(prd_markdown=prd_markdown))
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "call_openai_async", fake_call_openai_async)
+    items = [{"prd_markdown": PRD.format(i=i), "mode": "auto"} for i in range(3)]
+    events = _ndjson(client.post("/review/batch/stream", json={"items": items}))
+    order = [e["data"]["index"] for e in events if e["event"] == "result"]
+    assert order[-1] == 0
+
+
+def test_heartbeats_fill_silence():
+    async def slow():
+        await asyncio.sleep(0.05)
+        yield encode_event("result", "{}", "ndjson")
+
+    async def collect():
+        return [chunk async for chunk in with_heartbeats(slow(), "ndjson", interval=0.01)]
+
+    chunks = asyncio.run(collect())
+    assert chunks[-1] == '{"event":"result","data":{}}\n'
+    assert any('"heartbeat"' in chunk for chunk in chunks[:-1])
+
+
+# ── Streamed LLM completions ─────────────────────────────────────────────────
+
+
+def _llm_stream_client(content: str, chunk_size: int = 16, delay: float = 0.002):
+    calls: list[dict] = []
+
+    async def chunks():
+        for start in range(0, len(content), chunk_size):
+            await asyncio.sleep(delay)
+            delta = SimpleNamespace(content=content[start : start + chunk_size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        # Trailing usage chunk, sent because of stream_options.include_usage.
+        yield SimpleNamespace(
+            model="gpt-stream", choices=[], usage=SimpleNamespace(prompt_tokens=len(content) // 4, completion_tokens=42)
+        )
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        return chunks()
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))), calls
+
+
+def _rubric_first_review(prd: str) -> str:
+    data = _mock_review(ReviewRequest(prd_markdown=prd))
+    return json.dumps({"decision_trace": data.pop("decision_trace"), **data})
+
+
+def test_array_item_parser_handles_arbitrary_chunking():
+    data = _mock_review(ReviewRequest(prd_markdown='# P\n"quoted" {braces} [brackets] \\ users'))
+    data["decision_trace"]["assumptions"] = ['{"scoring_rubric": [{}]}']
+    data["summary"] = {"scoring_rubric": [{"nested": "ignored"}]}
+    raw = json.dumps(data, indent=2)
+    for size in (1, 3, 64, len(raw)):
+        parser = ArrayItemParser(("decision_trace", "scoring_rubric"))
+        items = [item for i in range(0, len(raw), size) for item in parser.feed(raw[i : i + size])]
+        assert items == data["decision_trace"]["scoring_rubric"]
+        assert parser.text == raw
+
+
+def test_llm_stream_yields_rubric_items_before_final_review(monkeypatch):
+    review_cache.clear()
+    prd = PRD.format(i="llm-stream")
+    content = _rubric_first_review(prd)
+    fake, calls = _llm_stream_client(content)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "get_async_client", lambda: fake)
+    completion_tokens = TOKENS.value("gpt-stream", "completion")
+
+    async def collect():
+        started = time.perf_counter()
+        events = review_prd_events(ReviewRequest(prd_markdown=prd))
+        return [(kind, value, time.perf_counter() - started) async for kind, value in events]
+
+    events = asyncio.run(collect())
+    kinds = [kind for kind, _, _ in events]
+    assert kinds == ["rubric"] * 7 + ["review"]
+    assert calls[0]["stream"] is True
+    assert calls[0]["stream_options"] == {"include_usage": True}
+    assert TOKENS.value("gpt-stream", "completion") == completion_tokens + 42
+
+    first_rubric, final = events[0][2], events[-1][2]
+    assert first_rubric < final / 3
+    review = events[-1][1]
+    assert [v for k, v, _ in events[:-1]] == [i.model_dump() for i in review.decision_trace.scoring_rubric]
+    assert review.decision_trace.prompt_stats is not None
+
+    # The final review was cached: a repeat skips the stream entirely.
+    assert [k for k, _ in asyncio.run(_drain(ReviewRequest(prd_markdown=prd)))] == ["review"]
+    assert len(calls) == 1
+
+
+async def _drain(request: ReviewRequest) -> list[tuple]:
+    return [event async for event in review_prd_events(request)]
+
+
+def test_concurrent_identical_streams_share_one_llm_call(monkeypatch):
+    review_cache.clear()
+    prd = PRD.format(i="shared-stream")
+    fake, calls = _llm_stream_client(_rubric_first_review(prd))
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "get_async_client", lambda: fake)
+    misses = review_cache.stats()["misses"]
+
+    async def both():
+        return await asyncio.gather(*(_drain(ReviewRequest(prd_markdown=prd)) for _ in range(2)))
+
+    leader, follower = asyncio.run(both())
+    assert len(calls) == 1
+    assert [k for k, _ in leader] == ["rubric"] * 7 + ["review"]
+    assert [k for k, _ in follower] == ["review"]
+    assert leader[-1][1] == follower[-1][1]
+    assert review_cache.stats()["misses"] == misses + 2  # one cache check per request
+
+
+def test_review_stream_route_forwards_partial_rubric(monkeypatch):
+    review_cache.clear()
+    prd = PRD.format(i="route-stream")
+    fake, _ = _llm_stream_client(_rubric_first_review(prd), chunk_size=256, delay=0)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_openai, "get_async_client", lambda: fake)
+
+    events = _ndjson(client.post("/review/stream", json={"prd_markdown": prd}))
+    names = [e["event"] for e in events]
+    assert names == ["progress"] + ["rubric"] * 7 + ["result", "done"]
+    assert events[1]["data"]["criterion"] == "Problem Clarity"
+    assert events[-2]["data"]["status"] == "ok"
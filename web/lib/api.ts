@@ -1,4 +1,10 @@
-import type { ReviewRequest, ReviewResponse } from "./types";
+import type {
+  HedgedReview,
+  ReviewJob,
+  ReviewRequest,
+  ReviewResponse,
+  ReviewStreamEvent,
+} from "./types";
 
 export const API_BASE = (
   process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://127.0.0.1:8000"
@@ -26,15 +32,13 @@ export async function checkHealth(): Promise<boolean> {
   }
 }
 
-export async function submitReview(
-  request: ReviewRequest,
-): Promise<ReviewResponse> {
+async function postJson(path: string, payload: unknown): Promise<Response> {
   let res: Response;
   try {
-    res = await fetch(`${API_BASE}/review`, {
+    res = await fetch(`${API_BASE}${path}`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify(request),
+      body: JSON.stringify(payload),
     });
   } catch {
     throw new ApiError(
@@ -54,5 +58,81 @@ export async function submitReview(
     throw new ApiError(res.status, detail);
   }
 
+  return res;
+}
+
+export async function submitReview(
+  request: ReviewRequest,
+): Promise<ReviewResponse> {
+  const res = await postJson("/review", request);
+  return res.json();
+}
+
+async function readNdjson(
+  res: Response,
+  onEvent: (event: ReviewStreamEvent) => void,
+): Promise<void> {
+  if (!res.body) throw new ApiError(res.status, "Response has no body");
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let newline: number;
+    while ((newline = buffer.indexOf("\n")) >= 0) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (line) onEvent(JSON.parse(line) as ReviewStreamEvent);
+    }
+  }
+  if (buffer.trim()) onEvent(JSON.parse(buffer) as ReviewStreamEvent);
+}
+
+/** Streams progress, partial rubric, heartbeat and result events for a single review. */
+export async function streamReview(
+  request: ReviewRequest,
+  onEvent: (event: ReviewStreamEvent) => void,
+): Promise<void> {
+  await readNdjson(await postJson("/review/stream", request), onEvent);
+}
+
+/** Streams each batch item as soon as it completes (out of request order). */
+export async function streamBatchReview(
+  items: ReviewRequest[],
+  onEvent: (event: ReviewStreamEvent) => void,
+): Promise<void> {
+  await readNdjson(await postJson("/review/batch/stream", { items }), onEvent);
+}
+
+/** Returns the mock review immediately; poll `getHedgedReview` for the LLM upgrade. */
+export async function submitHedgedReview(
+  request: ReviewRequest,
+): Promise<HedgedReview> {
+  const res = await postJson("/review/hedged", request);
+  return res.json();
+}
+
+export async function getHedgedReview(id: string): Promise<HedgedReview> {
+  const res = await fetch(`${API_BASE}/review/hedged/${encodeURIComponent(id)}`, {
+    cache: "no-store",
+  });
+  if (!res.ok) throw new ApiError(res.status, `Request failed with status ${res.status}`);
+  return res.json();
+}
+
+/** Queues a review job; poll `getReviewJob` until it succeeds or fails. */
+export async function enqueueReview(request: ReviewRequest): Promise<ReviewJob> {
+  const res = await postJson("/reviews", request);
+  return res.json();
+}
+
+export async function getReviewJob(id: string): Promise<ReviewJob> {
+  const res = await fetch(`${API_BASE}/reviews/${encodeURIComponent(id)}`, {
+    cache: "no-store",
+  });
+  if (!res.ok) throw new ApiError(res.status, `Request failed with status ${res.status}`);
   return res.json();
 }
@@ -43,12 +43,38 @@ export type ReadinessLevel =
   | "Build Ready"
   | "Board Ready";
 
+export interface PromptStats {
+  original_tokens: number;
+  sent_tokens: number;
+  sections_dropped: number;
+}
+
+export interface CascadeInfo {
+  tier: "mock" | "small" | "large";
+  model: string;
+  escalated: boolean;
+  reason?: string | null;
+  first_tier_seconds: number;
+  large_tokens_avoided: number;
+  large_seconds_avoided?: number | null;
+}
+
+export interface NearDuplicateMatch {
+  review_id: string;
+  similarity: number;
+  action: "reuse" | "seed";
+}
+
 export interface DecisionTrace {
   scoring_rubric: ScoringRubricItem[];
   assumptions: string[];
   confidence: number;
   impact_profile?: ImpactProfile;
   readiness_level?: ReadinessLevel;
+  prompt_stats?: PromptStats | null;
+  fallback?: string | null;
+  near_duplicate?: NearDuplicateMatch | null;
+  cascade?: CascadeInfo | null;
 }
 
 export interface ReviewResponse {
@@ -68,4 +94,43 @@ export interface ReviewRequest {
   product_context?: Record<string, unknown>;
   audience?: string;
   mode?: "auto" | "mock";
+  document_id?: string;
+}
+
+export interface BatchReviewItem {
+  index: number;
+  status: "ok" | "error";
+  review: ReviewResponse | null;
+  error: string | null;
+}
+
+export interface StreamProgress {
+  completed: number;
+  total: number;
+  unique_items?: number;
+}
+
+export type ReviewStreamEvent =
+  | { event: "progress"; data: StreamProgress }
+  | { event: "rubric"; data: ScoringRubricItem }
+  | { event: "result"; data: BatchReviewItem }
+  | { event: "heartbeat"; data: Record<string, never> }
+  | { event: "done"; data: StreamProgress };
+
+export interface HedgedReview {
+  id: string;
+  status: "pending" | "upgraded" | "fallback" | "mock";
+  review: ReviewResponse;
+  error?: string | null;
+}
+
+export interface ReviewJob {
+  id: string;
+  idempotency_key: string;
+  status: "queued" | "batched" | "running" | "succeeded" | "failed";
+  attempts: number;
+  created_at: number;
+  updated_at: number;
+  review?: ReviewResponse | null;
+  error?: string | null;
 }